@@ -0,0 +1,96 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+"""Micro-benchmark of repeated `Molecule.mass` and `Molecule.charge`
+access for molecules containing large fragments, both with and without
+invalidation of the cached values between each access.
+
+Run using ``python benchmarks/bench_molecule_mass.py``
+"""
+
+import argparse
+import itertools
+import timeit
+
+from force_gromacs.chemicals.gromacs_fragment import GromacsFragment
+from force_gromacs.chemicals.molecule import Molecule
+from force_gromacs.chemicals.particle_table import ParticleTable
+
+
+def create_table(n_particles, mass):
+    """Return a ParticleTable for a polymer with `n_particles`
+    beads of the given `mass`, with a single charged bead"""
+    return ParticleTable.from_records(
+        (index + 1, f'B{index % 4}', 'C', mass, -1.0 * (index == 0))
+        for index in range(n_particles)
+    )
+
+
+def create_molecule(n_particles):
+    """Return a neutral Molecule containing a polymer fragment with
+    `n_particles` beads and a counter ion"""
+    polymer = GromacsFragment(
+        symbol='PS', particle_table=create_table(n_particles, 72.0))
+    ion = GromacsFragment(
+        symbol='NA', particle_table=create_table(1, 23.0))
+
+    return Molecule(fragments=[polymer, ion])
+
+
+def time_access(obj, update, repeat):
+    """Return average time in us to call `update`, followed by
+    accessing the mass and charge of `obj`"""
+
+    def access():
+        update()
+        return obj.mass, obj.charge
+
+    return timeit.timeit(access, number=repeat) / repeat * 1e6
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n-particles', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f'{args.n_particles} particles, {args.repeat} repeats (us)')
+    print(f'{"storage":<18}{"fragment":>12}{"molecule":>12}'
+          f'{"invalidated":>14}')
+
+    # Fragment described by particle table
+    molecule = create_molecule(args.n_particles)
+    polymer = molecule.fragments[0]
+    tables = itertools.cycle([
+        create_table(args.n_particles, 72.0),
+        create_table(args.n_particles, 71.0)
+    ])
+
+    def swap_table():
+        polymer.particle_table = next(tables)
+
+    fragment = time_access(polymer, lambda: None, args.repeat)
+    cached = time_access(molecule, lambda: None, args.repeat)
+    invalidated = time_access(molecule, swap_table, args.repeat)
+    print(f'{"particle table":<18}{fragment:>12.2f}{cached:>12.2f}'
+          f'{invalidated:>14.2f}')
+
+    # Fragment described by particle objects
+    molecule = create_molecule(args.n_particles)
+    polymer = molecule.fragments[0]
+    particle = polymer.particles[0]
+    masses = itertools.cycle([72.0, 71.0])
+
+    def update_particle():
+        particle.mass = next(masses)
+
+    fragment = time_access(polymer, lambda: None, args.repeat)
+    cached = time_access(molecule, lambda: None, args.repeat)
+    invalidated = time_access(molecule, update_particle, args.repeat)
+    print(f'{"particle objects":<18}{fragment:>12.2f}{cached:>12.2f}'
+          f'{invalidated:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
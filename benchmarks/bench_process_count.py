@@ -0,0 +1,64 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+"""Benchmark of the number of processes spawned, and time taken,
+for each run of a pipeline containing commands that require piped
+`user_input` (such as `genion`, `trjconv` and `select`).
+
+Gromacs itself is not required: each step runs `cat` in place of a
+Gromacs executable, which simply returns the piped input.
+
+Run using ``python benchmarks/bench_process_count.py``
+"""
+
+import argparse
+import subprocess
+import time
+from unittest import mock
+
+from force_gromacs.commands.base_gromacs_command import (
+    BaseGromacsCommand
+)
+from force_gromacs.pipelines.gromacs_pipeline import GromacsPipeline
+
+
+def create_pipeline(n_steps):
+    """Return a GromacsPipeline with `n_steps` commands that each
+    require user input"""
+    pipeline = GromacsPipeline(dry_run=False)
+    for index in range(n_steps):
+        pipeline.append((
+            f'step_{index}',
+            BaseGromacsCommand(
+                executable='', name='cat', user_input='SOL 0')
+        ))
+    return pipeline
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n-steps', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = create_pipeline(args.n_steps)
+
+    with mock.patch(
+            'subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            pipeline.run()
+        elapsed = time.perf_counter() - start
+
+    print(
+        f'{args.n_steps} steps, {args.repeat} repeats\n'
+        f'processes per pipeline run: '
+        f'{mock_popen.call_count / args.repeat:.1f}\n'
+        f'time per pipeline run:      '
+        f'{elapsed / args.repeat * 1e3:.2f} ms'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,11 @@
 from .chemicals.base_particle_group import BaseParticleGroup # noqa
 from .chemicals.gromacs_particle import GromacsParticle # noqa
 from .chemicals.gromacs_fragment import GromacsFragment # noqa
+from .chemicals.gromacs_fragment_view import GromacsFragmentView # noqa
 from .chemicals.i_fragment import IFragment # noqa
 from .chemicals.i_particle import IParticle # noqa
 from .chemicals.molecule import Molecule # noqa
+from .chemicals.particle_table import ParticleTable # noqa
 
 from .commands.gromacs_commands import Gromacs_mdrun # noqa
 from .commands.gromacs_commands import Gromacs_genconf # noqa
@@ -18,25 +20,38 @@ from .commands.gromacs_commands import Gromacs_genion # noqa
 from .commands.gromacs_commands import Gromacs_trjconv # noqa
 from .commands.gromacs_commands import Gromacs_select # noqa
 from .commands.base_gromacs_command import BaseGromacsCommand # noqa
+from .commands.stream_capture import StreamCapture, MdrunProgressParser # noqa
+from .commands.convergence_monitor import ConvergenceMonitor # noqa
 
 from .core.base_process import BaseProcess # noqa
 from .core.i_process import IProcess # noqa
 
 from .io.base_file_registry import BaseFileRegistry # noqa
+from .io.configuration_library import ConfigurationLibrary, composition_distance # noqa
 from .io.file_tree_builder import FileTreeBuilder # noqa
 from .io.gromacs_coordinate_reader import GromacsCoordinateReader # noqa
+from .io.gromacs_index_reader import GromacsIndexReader # noqa
+from .io.gromacs_index_writer import GromacsIndexWriter # noqa
 from .io.gromacs_molecule_reader import GromacsMoleculeReader # noqa
+from .io.gromacs_topology_preprocessor import GromacsTopologyPreprocessor # noqa
 from .io.gromacs_topology_writer import GromacsTopologyWriter # noqa
 from .io.gromacs_file_registry import GromacsFileRegistry # noqa
+from .io.parsed_file_cache import ParsedFileCache # noqa
+from .io.simulation_result_cache import SimulationResultCache # noqa
 
 from .notification_listeners.driver_events import SimulationProgressEvent # noqa
 
 from .pipelines.base_pipeline import BasePipeline # noqa
 from .pipelines.gromacs_pipeline import GromacsPipeline # noqa
+from .pipelines.dag_pipeline import DAGPipeline # noqa
+from .pipelines.local_scheduler import LocalScheduler # noqa
+from .pipelines.pipeline_manifest import PipelineManifest # noqa
 
 from .simulation_builders.i_simulation_builder import ISimulationBuilder # noqa
 from .simulation_builders.base_gromacs_simulation_builder import BaseGromacsSimulationBuilder # noqa
 from .simulation_builders.gromacs_topology_data import GromacsTopologyData # noqa
 
+from .tools.convergence import statistical_inefficiency, standard_error, block_average # noqa
+from .tools.bonds import csr_adjacency, connected_components, bond_vectors, bond_lengths # noqa
 from .tools.distances import distance_matrix, batch_distance_matrix # noqa
 from .tools.positions import molecular_positions # noqa
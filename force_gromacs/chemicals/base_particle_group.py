@@ -3,18 +3,25 @@
 
 from traits.api import (
     HasStrictTraits,
+    Array,
     List,
     Int,
     Tuple,
     Property,
     Float,
+    Bool,
+    Instance,
+    cached_property,
     provides
 )
 
 from force_bdss.api import DataValue
 
+from force_gromacs.tools.bonds import csr_adjacency
+
 from .i_particle import IParticle
 from .i_particle_group import IParticleGroup
+from .particle_table import ParticleTable
 
 
 @provides(IParticleGroup)
@@ -23,39 +30,128 @@ class BaseParticleGroup(HasStrictTraits):
     group can be defined as a single atom or collection of
     covalently bonded atoms who therefore behave as a fixed body.
     Therefore we also explicitly include a list of indices referring
-    to bonds between pairs of particles"""
+    to bonds between pairs of particles
+
+    Particle data can be provided either as a list of IParticle
+    instances, or in a compact ParticleTable. Groups created from a
+    ParticleTable only create particle objects when the `particles`
+    attribute is first accessed, after which these objects are used
+    to describe the group.
+    """
 
     # --------------------
     #  Regular Attributes
     # --------------------
 
-    #: Dictionary containing each particle species reference
-    #: index
-    particles = List(IParticle)
-
     #: List of bonded particles, referring to indices in
     #: `particles` attribute
     bonds = List(Tuple(Int, Int))
 
+    #: List of angles between three bonded particles, referring
+    #: to indices in `particles` attribute
+    angles = List(Tuple(Int, Int, Int))
+
+    #: List of dihedral angles between four bonded particles,
+    #: referring to indices in `particles` attribute
+    dihedrals = List(Tuple(Int, Int, Int, Int))
+
+    #: List of particles with fixed separation, referring to
+    #: indices in `particles` attribute
+    constraints = List(Tuple(Int, Int))
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: List of particle objects, if these have been created
+    _particle_list = List(IParticle)
+
+    #: Compact representation of particles, used until particle
+    #: objects are created
+    _table = Instance(ParticleTable, ())
+
+    #: Whether or not `_particle_list` describes the group
+    _materialized = Bool(False)
+
     # --------------------
     #     Properties
     # --------------------
 
-    #: Total mass of group
-    mass = Property(Float, depends_on='particles.mass')
+    #: List of particles in group
+    particles = Property(List(IParticle))
+
+    #: Compact array representation of particles in group
+    particle_table = Property(Instance(ParticleTable))
+
+    #: Number of particles in group
+    n_particles = Property(
+        Int, depends_on='_particle_list[],_table,_materialized')
+
+    #: Adjacency of bond graph in compressed sparse row format,
+    #: as (indptr, indices) arrays of 0-based particle indices. Cached
+    #: values are invalidated whenever bonds or particles change
+    adjacency = Property(
+        Tuple(Array, Array), depends_on='bonds[],n_particles')
+
+    #: Total mass of group. Cached values are invalidated whenever
+    #: particles are added, removed or have their mass changed
+    mass = Property(
+        Float, depends_on='_particle_list.mass,_table.mass,_materialized')
+
+    #: Total charge of group. Cached values are invalidated whenever
+    #: particles are added, removed or have their charge changed
+    charge = Property(
+        Float,
+        depends_on='_particle_list.charge,_table.charge,_materialized')
+
+    def _get_particles(self):
+        if not self._materialized:
+            self._particle_list = self._table.to_particles()
+            self._materialized = True
+        return self._particle_list
+
+    def _set_particles(self, particles):
+        self._particle_list = particles
+        self._table = ParticleTable()
+        self._materialized = True
+
+    def _get_particle_table(self):
+        if self._materialized:
+            return ParticleTable.from_particles(self._particle_list)
+        return self._table
+
+    def _set_particle_table(self, particle_table):
+        self._table = particle_table
+        self._particle_list = []
+        self._materialized = False
+
+    def _get_n_particles(self):
+        if self._materialized:
+            return len(self._particle_list)
+        return len(self._table)
 
-    #: Total charge of group
-    charge = Property(Float, depends_on='particles.charge')
+    @cached_property
+    def _get_adjacency(self):
+        # Bonds may be defined before particles have been added
+        n_particles = max(
+            [self.n_particles] + [max(bond) for bond in self.bonds])
+        return csr_adjacency(self.bonds, n_particles)
 
+    @cached_property
     def _get_mass(self):
-        return sum([
-            particle.mass
-            for particle in self.particles])
+        if self._materialized:
+            return sum([
+                particle.mass
+                for particle in self._particle_list])
+        return float(self._table.mass.sum())
 
+    @cached_property
     def _get_charge(self):
-        return sum([
-            particle.charge
-            for particle in self.particles])
+        if self._materialized:
+            return sum([
+                particle.charge
+                for particle in self._particle_list])
+        return float(self._table.charge.sum())
 
     def get_data_values(self):
         """Return a list containing all DataValues stored in class"""
@@ -45,10 +45,13 @@ class GromacsFragment(BaseParticleGroup):
     # --------------------
 
     #: List of atoms in Gromacs topology '.itp' file
-    atoms = Property(List(Str), depends_on='particles.id')
+    atoms = Property(
+        List(Str), depends_on='_particle_list.id,_table,_materialized')
 
     def _get_atoms(self):
-        return [particle.id for particle in self.particles]
+        if self._materialized:
+            return [particle.id for particle in self._particle_list]
+        return self._table.ids.tolist()
 
     # --------------------
     #   Public Methods
@@ -56,7 +59,9 @@ class GromacsFragment(BaseParticleGroup):
 
     def get_masses(self):
         """Return list of atomic masses"""
-        return [particle.mass for particle in self.particles]
+        if self._materialized:
+            return [particle.mass for particle in self._particle_list]
+        return self._table.mass.tolist()
 
     def get_data_values(self):
         """Return a list containing all DataValues stored in class"""
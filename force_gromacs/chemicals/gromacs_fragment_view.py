@@ -0,0 +1,167 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from traits.api import (
+    Array, HasStrictTraits, Instance, Int, List, Property, PrototypedFrom,
+    Float, Str, Tuple, cached_property, provides
+)
+
+from force_bdss.api import DataValue
+
+from .i_fragment import IFragment
+from .i_particle import IParticle
+from .particle_table import ParticleTable
+
+
+@provides(IFragment)
+class GromacsFragmentView(HasStrictTraits):
+    """Copy-on-write view of a `GromacsFragment`. Attributes that
+    describe how a fragment is used (name, stoichiometry, symbol and
+    input files) are read from the source fragment until they are
+    assigned locally, after which the local value is used. Particle and
+    bond data are read from the source fragment without modifying it:
+    the `particle_table` shares the read-only arrays of the source,
+    whereas particle objects and bond lists are copied once per view on
+    first access, so that changes made through a view are local to it.
+
+    Views are cheap to create, since no particle data is copied, and
+    therefore can be used to make evaluation-specific copies of a
+    fragment that is shared between several evaluations.
+    """
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Fragment providing all data that is not overridden locally
+    source = Instance(IFragment, allow_none=False)
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Symbol referring to fragment in Gromacs input files
+    symbol = PrototypedFrom('source')
+
+    #: Gromacs topology '.itp' file
+    topology = PrototypedFrom('source')
+
+    #: Gromacs coordinate '.gro' file
+    coordinate = PrototypedFrom('source')
+
+    #: Human readable name for reference
+    name = PrototypedFrom('source')
+
+    #: Stoichiometric number of fragments in molecule
+    stoichiometry = PrototypedFrom('source')
+
+    # --------------------
+    #     Properties
+    # --------------------
+
+    #: List of particles in group, created from `particle_table` on
+    #: first access
+    particles = Property(List(IParticle), depends_on='source')
+
+    #: Compact array representation of particles in `source`, sharing
+    #: its read-only arrays
+    particle_table = Property(Instance(ParticleTable))
+
+    #: List of bonded particles, copied from `source`
+    bonds = Property(
+        List(Tuple(Int, Int)), depends_on='source.bonds[]')
+
+    #: List of angles between three bonded particles, copied
+    #: from `source`
+    angles = Property(
+        List(Tuple(Int, Int, Int)), depends_on='source.angles[]')
+
+    #: List of dihedral angles between four bonded particles, copied
+    #: from `source`
+    dihedrals = Property(
+        List(Tuple(Int, Int, Int, Int)), depends_on='source.dihedrals[]')
+
+    #: List of particles with fixed separation, copied from `source`
+    constraints = Property(
+        List(Tuple(Int, Int)), depends_on='source.constraints[]')
+
+    #: Number of particles in group
+    n_particles = Property(Int, depends_on='source.n_particles')
+
+    #: Adjacency of bond graph in compressed sparse row format,
+    #: as read-only views of the arrays of `source`
+    adjacency = Property(
+        Tuple(Array, Array), depends_on='source.adjacency')
+
+    #: List of atoms in Gromacs topology '.itp' file
+    atoms = Property(List(Str), depends_on='source.atoms')
+
+    #: Total mass of group
+    mass = Property(Float, depends_on='source.mass')
+
+    #: Total charge of group
+    charge = Property(Float, depends_on='source.charge')
+
+    @cached_property
+    def _get_particles(self):
+        return self.particle_table.to_particles()
+
+    def _get_particle_table(self):
+        return self.source.particle_table.copy()
+
+    @cached_property
+    def _get_bonds(self):
+        return list(self.source.bonds)
+
+    @cached_property
+    def _get_angles(self):
+        return list(self.source.angles)
+
+    @cached_property
+    def _get_dihedrals(self):
+        return list(self.source.dihedrals)
+
+    @cached_property
+    def _get_constraints(self):
+        return list(self.source.constraints)
+
+    def _get_n_particles(self):
+        return self.source.n_particles
+
+    def _get_adjacency(self):
+        adjacency = []
+        for array in self.source.adjacency:
+            view = array.view()
+            view.flags.writeable = False
+            adjacency.append(view)
+        return tuple(adjacency)
+
+    def _get_atoms(self):
+        return self.source.atoms
+
+    def _get_mass(self):
+        return self.source.mass
+
+    def _get_charge(self):
+        return self.source.charge
+
+    # --------------------
+    #   Public Methods
+    # --------------------
+
+    def get_masses(self):
+        """Return list of atomic masses"""
+        return self.source.get_masses()
+
+    def get_data_values(self):
+        """Return a list containing all DataValues stored in class"""
+
+        return [
+            DataValue(type="NAME", value=self.name),
+            DataValue(type="SYMBOL", value=self.symbol),
+            DataValue(type="ATOMS", value=self.atoms),
+            DataValue(type="MASS", value=self.mass),
+            DataValue(type="CHARGE", value=self.charge),
+            DataValue(type="TOPOLOGY", value=self.topology),
+            DataValue(type="COORDINATE", value=self.coordinate)
+        ]
@@ -1,9 +1,10 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import List
+from traits.api import List, Instance
 
 from .i_particle import IParticle
+from .particle_table import ParticleTable
 
 
 class IParticleGroup(IParticle):
@@ -16,3 +17,6 @@ class IParticleGroup(IParticle):
 
     #: List of particles in group
     particles = List(IParticle)
+
+    #: Compact array representation of particles in group
+    particle_table = Instance(ParticleTable)
@@ -0,0 +1,158 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+from traits.api import HasStrictTraits, Array, Property, on_trait_change
+
+from .gromacs_particle import GromacsParticle
+
+
+class ParticleTable(HasStrictTraits):
+    """Compact storage of particle data for a particle group, using
+    a single array for each particle attribute rather than a separate
+    object for each particle. Reference ids and elemental symbols are
+    stored as categorical codes, indexing arrays of unique names.
+
+    All arrays are read-only, so that values derived from them (such as
+    the total mass of a particle group) remain valid. Writeable arrays
+    are copied when assigned, and tables should be modified by assigning
+    new arrays rather than by writing to them in place.
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Index of each particle in molecular .itp file
+    index = Array(dtype=np.int32, shape=(None,), value=np.empty(0))
+
+    #: Particle mass of each particle in g / mol
+    mass = Array(dtype=np.float64, shape=(None,), value=np.empty(0))
+
+    #: Particle charge of each particle
+    charge = Array(dtype=np.float64, shape=(None,), value=np.empty(0))
+
+    #: Code referring to reference id of each particle in `id_names`
+    id_code = Array(dtype=np.int32, shape=(None,), value=np.empty(0))
+
+    #: Unique reference ids of particles
+    id_names = Array(shape=(None,), value=np.empty(0, dtype=str))
+
+    #: Code referring to elemental symbol of each particle in
+    #: `element_names`
+    element_code = Array(dtype=np.int32, shape=(None,), value=np.empty(0))
+
+    #: Unique elemental symbols of particles
+    element_names = Array(shape=(None,), value=np.empty(0, dtype=str))
+
+    # --------------------
+    #     Properties
+    # --------------------
+
+    #: Reference id of each particle
+    ids = Property(Array, depends_on='id_code,id_names')
+
+    #: Elemental symbol of each particle
+    elements = Property(Array, depends_on='element_code,element_names')
+
+    def _get_ids(self):
+        return self.id_names[self.id_code]
+
+    def _get_elements(self):
+        return self.element_names[self.element_code]
+
+    # --------------------
+    #      Listeners
+    # --------------------
+
+    @on_trait_change('index,mass,charge,id_code,id_names,element_code,'
+                     'element_names')
+    def _make_read_only(self, name, new):
+        """Replace writeable arrays with read-only copies"""
+        if new.flags.writeable:
+            new = new.copy()
+            new.flags.writeable = False
+            setattr(self, name, new)
+
+    # --------------------
+    #  Protected Methods
+    # --------------------
+
+    def __len__(self):
+        """Returns the number of particles in the table"""
+        return self.index.shape[0]
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    @classmethod
+    def from_records(cls, records):
+        """Create a new ParticleTable from a sequence of
+        (index, id, element, mass, charge) tuples"""
+
+        records = list(records)
+        if len(records) == 0:
+            return cls()
+
+        index, ids, elements, mass, charge = zip(*records)
+        id_names, id_code = np.unique(ids, return_inverse=True)
+        element_names, element_code = np.unique(
+            elements, return_inverse=True)
+
+        return cls(
+            index=np.array(index, dtype=np.int32),
+            mass=np.array(mass, dtype=np.float64),
+            charge=np.array(charge, dtype=np.float64),
+            id_code=id_code.astype(np.int32),
+            id_names=id_names,
+            element_code=element_code.astype(np.int32),
+            element_names=element_names
+        )
+
+    @classmethod
+    def from_particles(cls, particles):
+        """Create a new ParticleTable from a list of IParticle
+        instances. Attributes not provided by the IParticle
+        interface are left empty if they are not present."""
+
+        return cls.from_records(
+            (getattr(particle, 'index', 0),
+             getattr(particle, 'id', ''),
+             getattr(particle, 'element', ''),
+             particle.mass,
+             particle.charge)
+            for particle in particles
+        )
+
+    def copy(self):
+        """Return a new ParticleTable containing the same particles.
+        Since all arrays are read-only, these are shared rather than
+        copied"""
+
+        return ParticleTable(
+            index=self.index,
+            mass=self.mass,
+            charge=self.charge,
+            id_code=self.id_code,
+            id_names=self.id_names,
+            element_code=self.element_code,
+            element_names=self.element_names
+        )
+
+    def to_particles(self):
+        """Return a list of GromacsParticle instances representing
+        each particle in the table"""
+
+        return [
+            GromacsParticle(
+                index=int(index),
+                id=str(id),
+                element=str(element),
+                mass=float(mass),
+                charge=float(charge))
+            for index, id, element, mass, charge in zip(
+                self.index, self.ids, self.elements,
+                self.mass, self.charge)
+        ]
@@ -3,7 +3,10 @@
 
 from unittest import TestCase
 
+from numpy.testing import assert_array_equal
+
 from force_gromacs.chemicals.base_particle_group import BaseParticleGroup
+from force_gromacs.chemicals.particle_table import ParticleTable
 from force_gromacs.tests.probe_classes.chemicals import ProbeParticle
 
 
@@ -33,3 +36,91 @@ class TestBaseParticleGroup(TestCase):
 
         self.assertEqual(20, self.group.mass)
         self.assertEqual(0, self.group.charge)
+
+    def test_particle_table(self):
+
+        self.group.particle_table = ParticleTable.from_records(
+            [(1, 'PI', 'PI', 23, 1), (2, 'NI', 'NI', 35, -1)])
+
+        # Particle objects are not created until requested
+        self.assertFalse(self.group._materialized)
+        self.assertEqual(58, self.group.mass)
+        self.assertEqual(0, self.group.charge)
+        self.assertFalse(self.group._materialized)
+
+        particles = self.group.particles
+        self.assertTrue(self.group._materialized)
+        self.assertEqual(2, len(particles))
+        self.assertIs(particles, self.group.particles)
+
+        # Particle objects describe the group once created
+        particles[0].mass = 30
+        self.assertEqual(65, self.group.mass)
+        assert_array_equal([30, 35], self.group.particle_table.mass)
+
+        self.group.particles = [ProbeParticle(mass=10, charge=-1)]
+        self.assertEqual(10, self.group.mass)
+        self.assertEqual(-1, self.group.charge)
+
+    def test_mass_charge_cache(self):
+
+        particle = ProbeParticle(mass=10, charge=-1)
+        self.group.particles = [particle]
+
+        self.assertEqual(10, self.group.mass)
+        self.assertEqual(-1, self.group.charge)
+
+        # Cached values are returned if no notifications are fired
+        particle.trait_setq(mass=15, charge=0)
+        self.assertEqual(10, self.group.mass)
+        self.assertEqual(-1, self.group.charge)
+
+        # Item level changes invalidate the cache
+        particle.mass = 20
+        particle.charge = 1
+        self.assertEqual(20, self.group.mass)
+        self.assertEqual(1, self.group.charge)
+
+        self.group.particles.append(ProbeParticle(mass=5, charge=-1))
+        self.assertEqual(25, self.group.mass)
+        self.assertEqual(0, self.group.charge)
+
+        self.group.particles.pop(0)
+        self.assertEqual(5, self.group.mass)
+        self.assertEqual(-1, self.group.charge)
+
+        # Changes to particle table also invalidate the cache
+        self.group.particle_table = ParticleTable.from_records(
+            [(1, 'PI', 'PI', 23, 1)])
+        self.assertEqual(23, self.group.mass)
+        self.group.particle_table.mass = [30]
+        self.assertEqual(30, self.group.mass)
+
+        # Particle table arrays cannot be modified in place
+        with self.assertRaises(ValueError):
+            self.group.particle_table.mass[0] = 40
+        self.assertEqual(30, self.group.mass)
+
+    def test_adjacency(self):
+
+        indptr, indices = self.group.adjacency
+        assert_array_equal([0], indptr)
+
+        self.group.particle_table = ParticleTable.from_records(
+            [(index, 'C', 'C', 12, 0) for index in range(1, 5)])
+        self.group.bonds = [(1, 2), (2, 3)]
+
+        indptr, indices = self.group.adjacency
+        assert_array_equal([0, 1, 3, 4, 4], indptr)
+        assert_array_equal([1, 0, 2, 1], indices)
+        self.assertIs(indptr, self.group.adjacency[0])
+        self.assertFalse(self.group._materialized)
+
+        # Cached values are invalidated when bonds change
+        self.group.bonds.append((3, 4))
+        indptr, indices = self.group.adjacency
+        assert_array_equal([0, 1, 3, 5, 6], indptr)
+
+        self.group.particles.append(ProbeParticle())
+        indptr, indices = self.group.adjacency
+        assert_array_equal([0, 1, 3, 5, 6, 6], indptr)
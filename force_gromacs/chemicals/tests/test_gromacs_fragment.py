@@ -3,6 +3,7 @@
 
 from unittest import TestCase
 
+from force_gromacs.chemicals.gromacs_fragment import GromacsFragment
 from force_gromacs.tests.probe_classes.chemicals import ProbeGromacsFragment
 
 
@@ -27,6 +28,19 @@ class TestGromacsFragment(TestCase):
         masses = self.fragment.get_masses()
         self.assertListEqual([16, 1, 1], masses)
 
+    def test_particle_table(self):
+
+        fragment = GromacsFragment(
+            particle_table=self.fragment.particle_table)
+
+        self.assertEqual(["O", "H1", "H2"], fragment.atoms)
+        self.assertListEqual([16, 1, 1], fragment.get_masses())
+        self.assertEqual(18.0, fragment.mass)
+        self.assertFalse(fragment._materialized)
+
+        fragment.particles[1].id = "H3"
+        self.assertEqual(["O", "H3", "H2"], fragment.atoms)
+
     def test_get_data_values(self):
 
         data = self.fragment.get_data_values()
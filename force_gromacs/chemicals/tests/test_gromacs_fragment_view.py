@@ -0,0 +1,143 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+from numpy.testing import assert_array_equal
+from traits.api import TraitError
+
+from force_gromacs.chemicals.gromacs_fragment import GromacsFragment
+from force_gromacs.chemicals.gromacs_fragment_view import (
+    GromacsFragmentView
+)
+from force_gromacs.chemicals.molecule import Molecule
+from force_gromacs.tests.probe_classes.chemicals import ProbeGromacsFragment
+
+
+class TestGromacsFragmentView(TestCase):
+
+    def setUp(self):
+
+        self.fragment = ProbeGromacsFragment()
+        self.view = GromacsFragmentView(source=self.fragment)
+
+    def test___init__(self):
+
+        self.assertEqual("Water", self.view.name)
+        self.assertEqual("W", self.view.symbol)
+        self.assertEqual(["O", "H1", "H2"], self.view.atoms)
+        self.assertEqual(18.0, self.view.mass)
+        self.assertEqual(0, self.view.charge)
+        self.assertEqual(1, self.view.stoichiometry)
+        self.assertEqual("test_top.itp", self.view.topology)
+        self.assertEqual("test_coord.gro", self.view.coordinate)
+        self.assertListEqual([16, 1, 1], self.view.get_masses())
+
+    def test_shared_data(self):
+
+        self.assertEqual(
+            [16, 1, 1],
+            [particle.mass for particle in self.view.particles])
+        self.assertListEqual(self.fragment.bonds, self.view.bonds)
+        for array, expected in zip(
+                self.view.adjacency, self.fragment.adjacency):
+            assert_array_equal(expected, array)
+        assert_array_equal(
+            self.fragment.particle_table.mass,
+            self.view.particle_table.mass)
+        self.assertEqual(3, self.view.n_particles)
+
+        # Particles and bonds are only copied once per view
+        self.assertIs(self.view.particles[0], self.view.particles[0])
+        self.assertIs(self.view.bonds, self.view.bonds)
+
+        with self.assertRaises(TraitError):
+            self.view.particles = []
+        with self.assertRaises(TraitError):
+            self.view.bonds = []
+
+        self.fragment.particles[0].mass = 20
+        self.assertEqual(22, self.view.mass)
+
+        # Changes to source bonds are followed
+        self.fragment.bonds.append((1, 3))
+        self.assertListEqual(self.fragment.bonds, self.view.bonds)
+
+    def test_unloaded_source(self):
+
+        fragment = GromacsFragment(
+            particle_table=self.fragment.particle_table,
+            bonds=self.fragment.bonds)
+        view = GromacsFragmentView(source=fragment)
+
+        self.assertEqual(
+            [16, 1, 1], [particle.mass for particle in view.particles])
+        self.assertIs(fragment.particle_table.mass, view.particle_table.mass)
+
+        # Reading a view does not create particles in the source
+        self.assertFalse(fragment._materialized)
+
+    def test_local_copies(self):
+
+        bonds = list(self.fragment.bonds)
+
+        self.view.particles[0].mass = 20
+        self.view.bonds.append((1, 3))
+        with self.assertRaises(ValueError):
+            self.view.adjacency[1][0] = 2
+        self.view.particle_table.mass = [20, 1, 1]
+
+        # Changes are kept by the view, but the source is unchanged
+        self.assertEqual(20, self.view.particles[0].mass)
+        self.assertIn((1, 3), self.view.bonds)
+        self.assertEqual(16, self.fragment.particles[0].mass)
+        self.assertEqual(18, self.fragment.mass)
+        self.assertEqual(18, self.view.mass)
+        self.assertListEqual(bonds, self.fragment.bonds)
+        assert_array_equal(
+            [16, 1, 1], self.fragment.particle_table.mass)
+
+    def test_local_overrides(self):
+
+        other_view = GromacsFragmentView(source=self.fragment)
+
+        self.view.name = "Heavy Water"
+        self.view.stoichiometry = 2
+
+        self.assertEqual("Heavy Water", self.view.name)
+        self.assertEqual(2, self.view.stoichiometry)
+        self.assertEqual("Water", self.fragment.name)
+        self.assertEqual(1, self.fragment.stoichiometry)
+        self.assertEqual("Water", other_view.name)
+        self.assertEqual(1, other_view.stoichiometry)
+
+        # Attributes that are not overridden follow the source
+        self.fragment.symbol = "SOL"
+        self.assertEqual("SOL", self.view.symbol)
+        self.fragment.name = "Solvent"
+        self.assertEqual("Heavy Water", self.view.name)
+        self.assertEqual("Solvent", other_view.name)
+
+    def test_molecule(self):
+
+        self.view.stoichiometry = 2
+        molecule = Molecule(fragments=[self.view])
+        self.assertEqual(36, molecule.mass)
+
+        # Changes to source particles are propagated to molecule
+        self.fragment.particles[0].mass = 20
+        self.assertEqual(44, molecule.mass)
+
+    def test_get_data_values(self):
+
+        self.view.name = "Heavy Water"
+        data = self.view.get_data_values()
+
+        self.assertEqual(
+            ["NAME", "SYMBOL", "ATOMS", "MASS",
+             "CHARGE", "TOPOLOGY", "COORDINATE"],
+            [data_value.type for data_value in data]
+        )
+        self.assertEqual("Heavy Water", data[0].value)
+        self.assertEqual(["O", "H1", "H2"], data[2].value)
+        self.assertEqual(18.0, data[3].value)
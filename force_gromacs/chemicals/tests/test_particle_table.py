@@ -0,0 +1,102 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from force_gromacs.chemicals.particle_table import ParticleTable
+from force_gromacs.tests.probe_classes.chemicals import ProbeParticle
+
+
+class TestParticleTable(TestCase):
+
+    def setUp(self):
+
+        self.records = [
+            (1, 'O', 'O', 16.0, -2.0),
+            (2, 'H1', 'H', 1.0, 1.0),
+            (3, 'H2', 'H', 1.0, 1.0)
+        ]
+        self.table = ParticleTable.from_records(self.records)
+
+    def test__init__(self):
+
+        table = ParticleTable()
+        self.assertEqual(0, len(table))
+        self.assertEqual([], table.to_particles())
+        self.assertEqual(0, len(ParticleTable.from_records([])))
+
+    def test_from_records(self):
+
+        self.assertEqual(3, len(self.table))
+        assert_array_equal([1, 2, 3], self.table.index)
+        assert_array_equal([16, 1, 1], self.table.mass)
+        assert_array_equal([-2, 1, 1], self.table.charge)
+
+        assert_array_equal(['H1', 'H2', 'O'], self.table.id_names)
+        assert_array_equal([2, 0, 1], self.table.id_code)
+        assert_array_equal(['O', 'H1', 'H2'], self.table.ids)
+
+        assert_array_equal(['H', 'O'], self.table.element_names)
+        assert_array_equal([1, 0, 0], self.table.element_code)
+        assert_array_equal(['O', 'H', 'H'], self.table.elements)
+
+    def test_read_only(self):
+
+        for name in ['index', 'mass', 'charge', 'id_code', 'id_names',
+                     'element_code', 'element_names']:
+            self.assertFalse(getattr(self.table, name).flags.writeable)
+
+        with self.assertRaises(ValueError):
+            self.table.mass[0] = 18.0
+
+        # Assigned arrays are copied rather than modified
+        mass = np.array([18.0, 2.0, 2.0])
+        self.table.mass = mass
+        self.assertTrue(mass.flags.writeable)
+        self.assertFalse(self.table.mass.flags.writeable)
+        mass[0] = 16.0
+        assert_array_equal([18, 2, 2], self.table.mass)
+
+    def test_copy(self):
+
+        table = self.table.copy()
+        self.assertIsNot(self.table, table)
+        self.assertIs(self.table.mass, table.mass)
+        assert_array_equal(['O', 'H1', 'H2'], table.ids)
+
+        table.mass = [18.0, 2.0, 2.0]
+        assert_array_equal([16, 1, 1], self.table.mass)
+
+    def test_to_particles(self):
+
+        particles = self.table.to_particles()
+
+        self.assertEqual(3, len(particles))
+        self.assertListEqual(
+            list(self.records),
+            [(particle.index, particle.id, particle.element,
+              particle.mass, particle.charge)
+             for particle in particles]
+        )
+        self.assertIsInstance(particles[0].index, int)
+        self.assertIsInstance(particles[0].id, str)
+
+        table = ParticleTable.from_particles(particles)
+        assert_array_equal(self.table.index, table.index)
+        assert_array_equal(self.table.ids, table.ids)
+        assert_array_equal(self.table.elements, table.elements)
+        assert_array_equal(self.table.mass, table.mass)
+        assert_array_equal(self.table.charge, table.charge)
+
+    def test_from_particles(self):
+
+        table = ParticleTable.from_particles(
+            [ProbeParticle(mass=10, charge=-1)])
+
+        assert_array_equal([0], table.index)
+        assert_array_equal([''], table.ids)
+        assert_array_equal([10], table.mass)
+        assert_array_equal([-1], table.charge)
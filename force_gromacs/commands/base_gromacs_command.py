@@ -1,20 +1,29 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import asyncio
 import subprocess
 import os
+import signal
+import threading
+import time
 
 from traits.api import (
     Unicode,
     Enum,
+    Float,
     Set,
     Dict,
+    Instance,
     List,
     Property,
     on_trait_change
 )
 
 from force_gromacs.core.base_process import BaseProcess
+from force_gromacs.core.resource_usage import wait_process
+
+from .stream_capture import STREAMS, StreamCapture
 
 
 class BaseGromacsCommand(BaseProcess):
@@ -26,12 +35,26 @@ class BaseGromacsCommand(BaseProcess):
     and their corresponding objects as key : item pairs needs to be
     previously assigned as the `command_option` attribute. If arguments
     need to be piped in during the run, the `user_input` attribute can
-    be assigned as a string containing the information required.
+    be assigned as a string containing the information required. This
+    is written directly to the stdin of the Gromacs process.
 
     Upon calling the `run` method, the full command is generated and
-    called locally using the `subprocess` library. A bash script to perform
+    called locally using the `subprocess` library. Alternatively, the
+    `run_async` coroutine can be awaited to run the command without
+    blocking an `asyncio` event loop. A bash script to perform
     the equivalent operation can be returned using the `bash_script`
-    method."""
+    method.
+
+    For long running commands, a `StreamCapture` instance can be
+    assigned as the `stream_capture` attribute. Output is then read
+    line by line while `run` or `run_async` is called, with only a
+    bounded tail retained in memory.
+
+    A `timeout` in seconds can be assigned to stop commands that run for
+    too long. The process is sent SIGTERM, followed by SIGKILL if it has
+    not exited after `kill_timeout` seconds. The wall clock time, CPU time
+    and memory used by each command can be returned using the
+    `recall_resource_usage` method."""
 
     # --------------------
     #  Required Attributes
@@ -46,6 +69,12 @@ class BaseGromacsCommand(BaseProcess):
     #: List of accepted flags for command line options
     flags = List()
 
+    #: List of flags in `flags` whose arguments are input files
+    input_flags = List()
+
+    #: List of flags in `flags` whose arguments are output files
+    output_flags = List()
+
     # --------------------
     #  Regular Attributes
     # --------------------
@@ -58,6 +87,18 @@ class BaseGromacsCommand(BaseProcess):
     #: command
     user_input = Unicode()
 
+    #: Optional capture of output streamed from the Gromacs command
+    #: during `run`. If not provided, all output is retained in memory
+    stream_capture = Instance(StreamCapture)
+
+    #: Maximum wall clock time in seconds that the Gromacs command is
+    #: allowed to run for. No timeout is applied if zero
+    timeout = Float(0)
+
+    #: Time in seconds to wait after sending SIGTERM to a command that
+    #: has timed out, before sending SIGKILL
+    kill_timeout = Float(10)
+
     # ------------------
     #     Properties
     # ------------------
@@ -89,37 +130,159 @@ class BaseGromacsCommand(BaseProcess):
     # ------------------
 
     def _build_process(self, command):
-        """Creates process to run Gromacs command on. Also sets up piping
-        in of any arguments in `user_input` if required."""
+        """Creates process to run Gromacs command on. Any arguments in
+        `user_input` must be piped in via stdin when communicating
+        with the process (see `_build_input`)."""
+
+        process = subprocess.Popen(
+            command.split(),
+            env=os.environ,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        return process
+
+    def _build_input(self):
+        """Returns bytes to be piped into the Gromacs command via
+        stdin, equivalent to the output of `echo` called with the
+        arguments in `user_input`"""
 
         if self.user_input != '':
+            return (' '.join(self.user_input.split()) + '\n').encode()
+        return b''
+
+    def _terminate(self, proc):
+        """Send SIGTERM to process, followed by SIGKILL if it has not
+        exited after `kill_timeout` seconds. Returns the resources used
+        by the process (see `wait_process`)."""
+
+        proc.send_signal(signal.SIGTERM)
+        try:
+            return wait_process(proc, timeout=self.kill_timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            return wait_process(proc)
+
+    def _read_output(self, proc):
+        """Start reading all output of the process in separate threads.
+        Returns the threads and a dictionary that the output of each
+        stream is stored in."""
+
+        output = dict.fromkeys(STREAMS, b'')
+
+        def read(name):
+            stream = getattr(proc, name)
+            output[name] = stream.read()
+            stream.close()
+
+        threads = [
+            threading.Thread(target=read, args=(name,), daemon=True)
+            for name in STREAMS
+        ]
+        for thread in threads:
+            thread.start()
+
+        return threads, output
+
+    def _communicate(self, proc):
+        """Send any user input to the process and wait for it to
+        finish, returning the stdout and stderr retained and whether
+        the process exceeded `timeout`. The resources used by the
+        process are stored in `_resource_usage`."""
+
+        if self.stream_capture is None:
+            threads, output = self._read_output(proc)
+        else:
+            self.stream_capture.start(proc)
+
+        try:
+            proc.stdin.write(self._build_input())
+            proc.stdin.close()
+        except BrokenPipeError:
+            # Process has already exited without reading input
+            pass
+
+        try:
+            usage = wait_process(proc, timeout=self.timeout or None)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            usage = self._terminate(proc)
+            timed_out = True
+        self._resource_usage = usage
+
+        if self.stream_capture is None:
+            for thread in threads:
+                thread.join()
+            return output['stdout'], output['stderr'], timed_out
+
+        self.stream_capture.join()
+        return (
+            self.stream_capture.tail('stdout'),
+            self.stream_capture.tail('stderr'),
+            timed_out
+        )
+
+    def _execute(self, command):
+        """Run `command` in a subprocess and wait for it to finish,
+        storing its output, return code and resource usage
 
-            input_proc = subprocess.Popen(
-                ['echo'] + self.user_input.split(),
-                stdout=subprocess.PIPE
-            )
+        Returns
+        -------
+        timed_out: bool
+            Whether the command exceeded `timeout`
+        """
 
-            process = subprocess.Popen(
-                command.split(),
-                env=os.environ,
-                stdin=input_proc.stdout,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+        start = time.monotonic()
+        self._resource_usage = {}
+        try:
+            proc = self._build_process(command)
+        except FileNotFoundError:
+            raise self._not_found_error()
+
+        self._stdout, self._stderr, timed_out = self._communicate(proc)
+        self._returncode = proc.returncode
+        self._resource_usage['wall_time'] = time.monotonic() - start
+
+        return timed_out
+
+    def _not_found_error(self):
+        """Returns exception raised when Gromacs executable cannot
+        be found"""
+        return RuntimeError(
+            f"Gromacs executable '{self.name}' was "
+            "not found. Check Gromacs installation")
+
+    def _timeout_error(self, command):
+        """Returns exception raised when Gromacs command exceeds
+        `timeout`"""
+        return RuntimeError(
+            f"Gromacs command '{command}' did not complete within "
+            f"{self.timeout} s timeout and was terminated. "
+            f"Error code: {self._returncode}")
+
+    def _check_returncode(self, command):
+        """Raise exception if Gromacs command did not run correctly,
+        including any stderr in the message
 
-            input_proc.stdout.close()
-            input_proc.poll()
+        Raises
+        ------
+        RuntimeError
+            if Gromacs did not run correctly
+        """
 
-        else:
-            process = subprocess.Popen(
-                command.split(),
-                env=os.environ,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+        if self._returncode != 0:
 
-        return process
+            msg = (
+                f"Gromacs command '{command}' did not run correctly. "
+                f"Error code: {self._returncode}")
+
+            if self._stderr:
+                msg += (
+                    f", '{self._stderr.decode('unicode_escape').strip()}'")
+
+            raise RuntimeError(msg)
 
     def _build_command(self):
         """Generate terminal command from input data"""
@@ -142,6 +305,24 @@ class BaseGromacsCommand(BaseProcess):
     #   Public Methods
     # ------------------
 
+    def input_files(self):
+        """Returns list of input files required by the command,
+        as referenced in `command_options` by any `input_flags`"""
+        return [
+            str(self.command_options[flag])
+            for flag in self.input_flags
+            if isinstance(self.command_options.get(flag), str)
+        ]
+
+    def output_files(self):
+        """Returns list of output files produced by the command,
+        as referenced in `command_options` by any `output_flags`"""
+        return [
+            str(self.command_options[flag])
+            for flag in self.output_flags
+            if isinstance(self.command_options.get(flag), str)
+        ]
+
     def bash_script(self):
         """Output terminal command as a bash script"""
 
@@ -160,7 +341,7 @@ class BaseGromacsCommand(BaseProcess):
         Raises
         ------
         RuntimeError
-            if Gromacs did not run correctly
+            if Gromacs did not run correctly or exceeded `timeout`
 
         Returns
         -------
@@ -174,28 +355,50 @@ class BaseGromacsCommand(BaseProcess):
             self._stdout, self._stderr, self._returncode = (
                 b'', b'', 0
             )
+            self._resource_usage = {}
 
         else:
-            try:
-                proc = self._build_process(command)
-            except FileNotFoundError:
-                raise RuntimeError(
-                    f"Gromacs executable '{self.name}' was "
-                    "not found. Check Gromacs installation")
+            timed_out = self._execute(command)
+            if timed_out:
+                raise self._timeout_error(command)
+            self._check_returncode(command)
 
-            self._stdout, self._stderr = proc.communicate()
-            self._returncode = proc.returncode
+        return self._returncode
 
-            if self._returncode != 0:
+    async def run_async(self):
+        """Run command on terminal without blocking an `asyncio` event
+        loop, so that several commands can be run concurrently from a
+        single event loop. The subprocess is waited for in the loop's
+        default executor. Each concurrent call requires a separate
+        instance, since results are stored on the instance as for `run`.
 
-                msg = (
-                    f"Gromacs command '{command}' did not run correctly. "
-                    f"Error code: {self._returncode}")
+        Raises
+        ------
+        RuntimeError
+            if Gromacs did not run correctly or exceeded `timeout`
 
-                if self._stderr:
-                    msg += (
-                        f", '{self._stderr.decode('unicode_escape').strip()}'")
+        Returns
+        -------
+        returncode: int
+            Return code from subprocess running Gromacs command
+        """
 
-                raise RuntimeError(msg)
+        command = self._build_command()
+
+        if self.dry_run:
+            self._stdout, self._stderr, self._returncode = (
+                b'', b'', 0
+            )
+            self._resource_usage = {}
+
+        else:
+            # The process is run from a separate thread, so that it can
+            # be reaped with its own resource usage
+            loop = asyncio.get_running_loop()
+            timed_out = await loop.run_in_executor(
+                None, self._execute, command)
+            if timed_out:
+                raise self._timeout_error(command)
+            self._check_returncode(command)
 
         return self._returncode
@@ -0,0 +1,260 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+import signal
+import threading
+
+from traits.api import (
+    HasStrictTraits, Any, Bool, Enum, File, Float, Int, Str
+)
+
+from force_gromacs.tools.convergence import block_average, standard_error
+
+log = logging.getLogger(__name__)
+
+#: Width of each column in the energy tables of a Gromacs log file
+_COLUMN_WIDTH = 15
+
+
+def parse_log_energies(lines):
+    """Parse the energy tables written periodically to a Gromacs mdrun
+    log file. Tables that have not been completely written are ignored,
+    as are the averages reported at the end of a simulation.
+
+    Parameters
+    ----------
+    lines: iterable of str
+        Lines of Gromacs log file
+
+    Returns
+    -------
+    energies: dict of str: list of float
+        Values of each energy term, in the order they were logged
+    """
+
+    energies = {}
+    table = None
+    names = None
+
+    for line in lines:
+        if 'A V E R A G E S' in line:
+            break
+
+        if table is None:
+            if line.strip().startswith('Energies ('):
+                table = {}
+                names = None
+            continue
+
+        if not line.strip():
+            # End of table, which is only complete if every row of
+            # names was followed by a row of values
+            if table and names is None:
+                for name, value in table.items():
+                    energies.setdefault(name, []).append(value)
+            table = None
+        elif names is None:
+            names = [
+                line[index:index + _COLUMN_WIDTH].strip()
+                for index in range(0, len(line.rstrip()), _COLUMN_WIDTH)
+            ]
+        else:
+            try:
+                values = [float(value) for value in line.split()]
+            except ValueError:
+                values = []
+            if len(values) != len(names):
+                # Discard corrupted table
+                table = None
+                continue
+            table.update(zip(names, values))
+            names = None
+
+    return energies
+
+
+class ConvergenceMonitor(HasStrictTraits):
+    """Monitors the convergence of an energy term reported in the log
+    file of a running Gromacs mdrun simulation. The log is read every
+    `interval` seconds, and the standard error of the mean of the
+    `observable` is estimated, either from its statistical inefficiency
+    or by block averaging. Once the error falls below `target_error`,
+    mdrun is sent a SIGTERM signal, causing it to stop at the next
+    neighbour search step after writing a checkpoint and its final
+    configuration.
+
+    Note that samples are recorded at the frequency that energies are
+    written to the log (the `nstlog` parameter).
+
+    Example
+    -------
+    Stopping a simulation once the mean potential energy is known to
+    within 5 kJ/mol:
+        monitor = ConvergenceMonitor(
+            log_file='md.log', observable='Potential', target_error=5)
+        md_run = Gromacs_mdrun(convergence_monitor=monitor)
+    """
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Name of energy term in log file, e.g. 'Potential' or
+    #: 'Pressure (bar)'
+    observable = Str('Potential')
+
+    #: Standard error of the mean of `observable` at which the
+    #: simulation is considered to be converged
+    target_error = Float()
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Log file of simulation. If not provided, it is set by the
+    #: `Gromacs_mdrun` command that is being monitored
+    log_file = File()
+
+    #: Method used to estimate the standard error
+    method = Enum('statistical_inefficiency', 'block_average')
+
+    #: Number of blocks used by 'block_average' method
+    n_blocks = Int(10)
+
+    #: Fraction of initial samples discarded as equilibration
+    discard_fraction = Float(0.0)
+
+    #: Minimum number of samples (after discarding) required
+    #: before the simulation can be stopped
+    min_samples = Int(20)
+
+    #: Time in seconds between each check of the log file
+    interval = Float(30.0)
+
+    # --------------------
+    #     Results
+    # --------------------
+
+    #: Whether the simulation was stopped after converging
+    converged = Bool(False)
+
+    #: Latest estimate of the mean of `observable`
+    mean = Float()
+
+    #: Latest estimate of the standard error of `observable`
+    error = Float()
+
+    #: Number of samples used for latest estimate
+    n_samples = Int()
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Thread periodically checking the log file
+    _thread = Any()
+
+    #: Event signalling the thread to stop
+    _stop_event = Any()
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _monitor(self, process):
+        """Check for convergence every `interval` seconds until
+        stopped, terminating `process` once converged"""
+
+        while not self._stop_event.wait(self.interval):
+            try:
+                converged = self.check()
+            except Exception:
+                log.exception(
+                    f'Unable to check convergence from {self.log_file}')
+                continue
+            if converged:
+                self.converged = True
+                process.send_signal(signal.SIGTERM)
+                return
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def read_samples(self):
+        """Returns list of values of `observable` in the log file,
+        excluding the discarded equilibration samples"""
+
+        try:
+            with open(self.log_file, 'r', errors='replace') as infile:
+                energies = parse_log_energies(infile)
+        except FileNotFoundError:
+            return []
+
+        samples = energies.get(self.observable, [])
+        n_discard = int(len(samples) * self.discard_fraction)
+        return samples[n_discard:]
+
+    def check(self):
+        """Update estimates of the mean and standard error of
+        `observable` from the log file
+
+        Returns
+        -------
+        converged: bool
+            Whether the standard error is within `target_error`
+        """
+
+        samples = self.read_samples()
+        self.n_samples = len(samples)
+
+        if self.method == 'block_average':
+            if self.n_samples < max(self.min_samples, self.n_blocks):
+                return False
+            self.mean, self.error = block_average(
+                samples, n_blocks=self.n_blocks)
+        else:
+            if self.n_samples < max(self.min_samples, 2):
+                return False
+            self.mean, self.error, _ = standard_error(samples)
+
+        return self.error <= self.target_error
+
+    def start(self, process):
+        """Begin monitoring the log file of a running mdrun
+        `subprocess.Popen` instance, discarding previous results"""
+
+        self.converged = False
+        self.mean = self.error = 0.0
+        self.n_samples = 0
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._monitor, args=(process,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop monitoring, and update estimates using the complete
+        log file"""
+
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+        try:
+            self.check()
+        except Exception:
+            log.exception(
+                f'Unable to check convergence from {self.log_file}')
+
+    def report(self):
+        """Returns dictionary of latest convergence results"""
+        return {
+            'observable': self.observable,
+            'mean': self.mean,
+            'error': self.error,
+            'n_samples': self.n_samples,
+            'converged': self.converged
+        }
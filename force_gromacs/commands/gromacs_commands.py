@@ -22,9 +22,13 @@ Note - all objects have been tested on both Gromacs versions 4.6.7 and 2019.4
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import Unicode, ReadOnly, Property, Bool, Int
+import os
+import re
+
+from traits.api import Unicode, ReadOnly, Property, Bool, Int, Instance
 
 from force_gromacs.commands.base_gromacs_command import BaseGromacsCommand
+from force_gromacs.commands.convergence_monitor import ConvergenceMonitor
 
 
 class Gromacs_genconf(BaseGromacsCommand):
@@ -37,6 +41,12 @@ class Gromacs_genconf(BaseGromacsCommand):
     #: List of accepted flags for Gromacs genbox command
     flags = ReadOnly(['-f', '-o', '-trj', '-nbox'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-f', '-trj'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
+
 
 #: NOTE: as of Gromacs 5.0, this tool has been split to gmx solvate
 #: and gmx insert-molecules.
@@ -54,6 +64,12 @@ class Gromacs_genbox(BaseGromacsCommand):
     flags = ReadOnly(['-cp', '-cs', '-ci', '-maxsol',
                       '-o', '-box', '-try', '-nmol'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-cp', '-cs', '-ci'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
+
 
 class Gromacs_solvate(BaseGromacsCommand):
     """Wrapper around Gromacs solvate command
@@ -67,6 +83,12 @@ class Gromacs_solvate(BaseGromacsCommand):
                       '-o', '-box', '-radius', '-scale',
                       '-shell', '-vel'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-cp', '-cs', '-p'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
+
 
 class Gromacs_insert_molecules(BaseGromacsCommand):
     """Wrapper around Gromacs insert-molecules command
@@ -82,6 +104,12 @@ class Gromacs_insert_molecules(BaseGromacsCommand):
                       '-box', '-nmol', '-try', '-seed',
                       '-radius', '-scale', '-dr', '-rot'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-f', '-ci', '-ip', '-n'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
+
 
 class Gromacs_grompp(BaseGromacsCommand):
     """Wrapper around Gromacs grompp command
@@ -95,6 +123,12 @@ class Gromacs_grompp(BaseGromacsCommand):
                       '-t', '-e', '-ref', '-po', '-pp',
                       '-o', '-idm', '-time', '-maxwarn'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-f', '-c', '-r', '-rb', '-n', '-p', '-t', '-e'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o', '-po', '-pp'])
+
 
 class Gromacs_genion(BaseGromacsCommand):
     """Wrapper around Gromacs genion command
@@ -108,6 +142,12 @@ class Gromacs_genion(BaseGromacsCommand):
                       '-pq', '-nn', '-nname', '-nq', '-rmin',
                       '-seed', '-conc'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-s', '-n', '-p'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
+
 
 class Gromacs_mdrun(BaseGromacsCommand):
     """Wrapper around Gromacs mdrun command
@@ -117,12 +157,31 @@ class Gromacs_mdrun(BaseGromacsCommand):
     simulation using MPI parallel processing (default is `False`). The number
     of cores can also be set using the `n_proc` attribute (default is `1`).
 
+    If `restart` is `True`, a simulation is resumed from its checkpoint
+    file (the `-cpi` option, otherwise the `-cpo` option or `state.cpt`)
+    if it already exists, appending to any existing output files. The
+    generated bash script performs the same check when it is run. If
+    `expected_steps` is set, the final step recorded in the log file is
+    also checked after each run.
+
+    If the `-noappend` option is given, mdrun writes each run to new
+    output files numbered by part, e.g. `md.part0002.log`. In this case,
+    `log_file` refers to the newest part that exists, and a convergence
+    monitor follows the new part written by each run.
+
+    If a `convergence_monitor` is provided, the simulation is stopped
+    early once its observable has converged, in which case the number
+    of steps is not checked. Convergence is monitored by both `run`
+    and `run_async`.
+
     Example
     ------
     Calling simulation run in series:
         md_run = Gromacs_mdrun()
     Calling a MPI run on 2 cores:
         mpi_mdrun = Gromacs_mdrun(mpi_run=True, n_proc=2)
+    Calling a simulation that resumes from a checkpoint if present:
+        md_run = Gromacs_mdrun(restart=True, expected_steps=10000)
     """
 
     #: Whether or not to perform an MPI run
@@ -131,15 +190,40 @@ class Gromacs_mdrun(BaseGromacsCommand):
     #: Number of processors for MPI run
     n_proc = Int(1)
 
+    #: Whether or not to resume the simulation from an existing
+    #: checkpoint file
+    restart = Bool(False)
+
+    #: Number of time steps that a completed simulation should reach.
+    #: Not checked if zero
+    expected_steps = Int(0)
+
+    #: Optional monitor stopping the simulation once converged
+    convergence_monitor = Instance(ConvergenceMonitor)
+
     #: Name of Gromacs mdrun command
     name = Property(Unicode, depends_on='mpi_run')
 
+    #: Checkpoint file used to resume a simulation
+    checkpoint_file = Property(Unicode, depends_on='command_options')
+
+    #: Log file written by the simulation
+    log_file = Property(Unicode, depends_on='command_options')
+
     #: List of accepted flags for Gromacs mdrun command
     flags = ReadOnly(['-s', '-g', '-e', '-o', '-x', '-c',
                       '-cpo', '-cpi', '-rerun', '-ei',
                       '-awh', '-mp', '-mn', '-cpnum',
                       '-nocpnum', '-multidir', '-nsteps',
-                      '-maxh', '-nt'])
+                      '-maxh', '-nt', '-ntmpi', '-ntomp', '-pin',
+                      '-pinoffset', '-pinstride', '-append',
+                      '-noappend'])
+
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-s', '-cpi', '-rerun', '-ei', '-awh'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-g', '-e', '-o', '-x', '-c', '-cpo'])
 
     def _get_name(self):
         """Returns correct name syntax, depending on MPI run
@@ -148,14 +232,197 @@ class Gromacs_mdrun(BaseGromacsCommand):
             return "mdrun_mpi"
         return "mdrun"
 
-    def _build_command(self):
+    def _get_checkpoint_file(self):
+        return str(self.command_options.get(
+            '-cpi', self.command_options.get('-cpo', 'state.cpt')))
+
+    def _get_log_file(self):
+        log_file = str(self.command_options.get('-g', 'md.log'))
+        if '-noappend' in self.command_options:
+            part = self._last_part()
+            if part:
+                return self._part_file(log_file, part)
+        return log_file
+
+    def _part_file(self, file_path, part):
+        """Returns name of output file written by mdrun for simulation
+        `part` when the `-noappend` option is used"""
+        stem, ext = os.path.splitext(file_path)
+        return f"{stem}.part{part:04d}{ext}"
+
+    def _last_part(self):
+        """Returns number of the newest part log file written using the
+        `-noappend` option, or 0 if none exist"""
+        log_file = str(self.command_options.get('-g', 'md.log'))
+        stem, ext = os.path.splitext(os.path.basename(log_file))
+        pattern = re.compile(
+            rf'^{re.escape(stem)}\.part(\d{{4}}){re.escape(ext)}$')
+
+        try:
+            file_names = os.listdir(os.path.dirname(log_file) or os.curdir)
+        except FileNotFoundError:
+            return 0
+        parts = [
+            int(match.group(1)) for match in map(pattern.match, file_names)
+            if match is not None
+        ]
+        return max(parts, default=0)
+
+    def _current_log_file(self):
+        """Returns log file that a starting simulation will write to.
+        Using the `-noappend` option, this is a new part, numbered one
+        higher than the part being resumed from"""
+        if '-noappend' not in self.command_options:
+            return self.log_file
+
+        resume = os.path.exists(self.checkpoint_file) and (
+            self.restart or '-cpi' in self.command_options)
+        part = self._last_part() + 1 if resume else 1
+        return self._part_file(
+            str(self.command_options.get('-g', 'md.log')), part)
+
+    def _build_command(self, resume=None):
         """Overloads build_command option to include shell mpirun
-        command with processor count if running in parallel"""
+        command with processor count if running in parallel, and
+        checkpoint options if resuming a simulation.
+
+        Parameters
+        ----------
+        resume: bool, optional
+            Whether to resume from `checkpoint_file`. By default, only
+            resume if `restart` is True and the checkpoint file exists
+        """
         command = super()._build_command()
+
+        if resume is None:
+            resume = self.restart and os.path.exists(self.checkpoint_file)
+        if resume:
+            if '-cpi' not in self.command_options:
+                command += f" -cpi {self.checkpoint_file}"
+            if '-noappend' not in self.command_options:
+                command += " -append"
+
         if self.mpi_run:
             command = f"mpirun -np {self.n_proc} {command}"
         return command
 
+    def _check_completed_steps(self):
+        """Raise exception if the simulation did not reach
+        `expected_steps`
+
+        Raises
+        ------
+        RuntimeError
+            if the final step in the log file differs from
+            `expected_steps`
+        """
+        if self.dry_run or not self.expected_steps:
+            return
+        if (self.convergence_monitor is not None
+                and self.convergence_monitor.converged):
+            return
+
+        completed_steps = self.completed_steps()
+        if completed_steps != self.expected_steps:
+            raise RuntimeError(
+                f"Gromacs simulation completed {completed_steps} steps, "
+                f"but {self.expected_steps} were expected. "
+                f"Check log file '{self.log_file}'")
+
+    def _execute(self, command):
+        """Overloads execute method to identify the log file followed
+        by any convergence monitor before the simulation starts"""
+
+        if (self.convergence_monitor is not None
+                and '-noappend' in self.command_options):
+            # Identify the new part log before mdrun creates it
+            self.convergence_monitor.log_file = self._current_log_file()
+
+        return super()._execute(command)
+
+    def _communicate(self, proc):
+        """Overloads communicate method to monitor the convergence
+        of the simulation while it is running"""
+
+        monitor = self.convergence_monitor
+        if monitor is None:
+            return super()._communicate(proc)
+
+        if not monitor.log_file:
+            monitor.log_file = self.log_file
+        monitor.start(proc)
+        try:
+            return super()._communicate(proc)
+        finally:
+            monitor.stop()
+
+    def recall_convergence(self):
+        """Returns dictionary of convergence results from the most
+        recent run, or an empty dictionary if not monitored"""
+        if self.convergence_monitor is None:
+            return {}
+        return self.convergence_monitor.report()
+
+    def completed_steps(self):
+        """Returns the final time step recorded in the log file,
+        or None if no steps have been recorded"""
+
+        try:
+            with open(self.log_file, 'r', errors='replace') as infile:
+                log = infile.read()
+        except FileNotFoundError:
+            return None
+
+        # Energies are always logged on the final step, under a
+        # header containing 'Step' and 'Time' columns
+        steps = re.findall(
+            r'^\s+Step\s+Time\s*\n\s*(\d+)\s', log, re.MULTILINE)
+        if not steps:
+            return None
+        return int(steps[-1])
+
+    def bash_script(self):
+        """Output terminal command as a bash script. If `restart` is
+        True, the script resumes from the checkpoint file if it exists
+        when the script is run"""
+
+        if not self.restart:
+            return super().bash_script()
+
+        return (
+            f"if [ -f {self.checkpoint_file} ]; then\n"
+            f"{self._build_command(resume=True)}\n"
+            "else\n"
+            f"{self._build_command(resume=False)}\n"
+            "fi"
+        )
+
+    def run(self):
+        """Run command on terminal using subprocess, resuming from
+        a checkpoint if required
+
+        Raises
+        ------
+        RuntimeError
+            if Gromacs did not run correctly or did not complete
+            `expected_steps`
+
+        Returns
+        -------
+        returncode: int
+            Return code from subprocess running Gromacs command
+        """
+        returncode = super().run()
+        self._check_completed_steps()
+        return returncode
+
+    async def run_async(self):
+        """Run command on terminal without blocking an `asyncio`
+        event loop, resuming from a checkpoint if required. See `run`"""
+        returncode = await super().run_async()
+        self._check_completed_steps()
+        return returncode
+
 
 class Gromacs_select(BaseGromacsCommand):
     """Wrapper around Gromacs select (or g_select) command
@@ -173,6 +440,13 @@ class Gromacs_select(BaseGromacsCommand):
                       '-nonorm', '-resnr', '-pdbatoms', '-cumlt',
                       '-nocumlt'])
 
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-f', '-s', '-n', '-sf'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-os', '-oc', '-oi', '-on', '-om', '-of',
+                             '-ofpdb', '-olt'])
+
     def _get_name(self):
         """Returns correct name syntax, depending on installation
         version"""
@@ -199,3 +473,9 @@ class Gromacs_trjconv(BaseGromacsCommand):
                       '-trunc', '-exec', '-split', '-sep', '-nosep',
                       '-nzero', '-dropunder', '-dropover', '-conect',
                       '-noconect'])
+
+    #: List of flags whose arguments are input files
+    input_flags = ReadOnly(['-f', '-s', '-n', '-fr', '-sub', '-drop'])
+
+    #: List of flags whose arguments are output files
+    output_flags = ReadOnly(['-o'])
@@ -0,0 +1,210 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import deque
+import logging
+from logging.handlers import RotatingFileHandler
+import re
+import threading
+
+from traits.api import (
+    HasStrictTraits, Any, Callable, Dict, File, Float, Instance,
+    Int, List, Str
+)
+
+log = logging.getLogger(__name__)
+
+#: Names of each stream captured from a subprocess
+STREAMS = ('stdout', 'stderr')
+
+#: Size of each chunk read from a stream
+_CHUNK_SIZE = 8192
+
+#: Maximum length of an incomplete line retained while waiting for its
+#: terminator. Longer lines are processed in pieces of this length
+_MAX_LINE_LENGTH = 64 * 1024
+
+#: Splits a chunk of output after each line terminator. Carriage returns
+#: are included, since progress lines are often overwritten in place,
+#: but '\r\n' is treated as a single terminator
+_LINE_REGEX = re.compile(rb'(?<=\n)|(?<=\r)(?!\n)')
+
+
+class StreamCapture(HasStrictTraits):
+    """Captures the stdout and stderr of a running subprocess line by
+    line, using a separate reader thread for each stream. Only the last
+    `max_lines` lines of each stream are retained in memory, though all
+    output can be written to a rotating `log_file` as it is received.
+    Each line is also passed to any `callbacks`, which can be used to
+    report progress of long running commands.
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Maximum number of lines of each stream retained in memory
+    max_lines = Int(1000)
+
+    #: Optional file that all output is written to as it is received
+    log_file = File()
+
+    #: Maximum size of `log_file` in bytes before it is rotated
+    max_bytes = Int(10 * 1024 ** 2)
+
+    #: Number of rotated log files retained
+    backup_count = Int(5)
+
+    #: Callables that are invoked with the name of the stream
+    #: ('stdout' or 'stderr') and the contents of each line
+    callbacks = List(Callable)
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Retained lines of each stream
+    _tails = Dict(Str, Instance(deque))
+
+    #: Reader thread for each stream
+    _threads = List(Instance(threading.Thread))
+
+    #: Handler used to write to `log_file`
+    _handler = Any()
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _create_handler(self):
+        """Returns handler that writes each line to `log_file`
+        without any formatting"""
+        handler = RotatingFileHandler(
+            self.log_file,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count
+        )
+        handler.terminator = ''
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        return handler
+
+    def _process_line(self, name, line):
+        """Retain `line` from stream `name`, write it to the log file
+        and pass it to each callback"""
+
+        self._tails[name].append(line)
+
+        text = line.decode('utf-8', errors='replace')
+
+        if self._handler is not None:
+            self._handler.handle(logging.makeLogRecord({'msg': text}))
+
+        text = text.strip()
+        if not text:
+            return
+
+        for callback in self.callbacks:
+            try:
+                callback(name, text)
+            except Exception:
+                log.exception(
+                    f'Callback {callback} failed for line: {text}')
+
+    def _read_stream(self, name, stream):
+        """Read all output from `stream` in chunks, processing each
+        complete line as it is received"""
+
+        buffer = b''
+        for chunk in iter(lambda: stream.read1(_CHUNK_SIZE), b''):
+            lines = _LINE_REGEX.split(buffer + chunk)
+            # Last element is an incomplete line (or empty)
+            buffer = lines.pop()
+            # A trailing carriage return may be followed by a newline
+            # in the next chunk
+            if not buffer and lines and lines[-1].endswith(b'\r'):
+                buffer = lines.pop()
+            for line in lines:
+                self._process_line(name, line)
+            # Avoid retaining an unbounded line in memory
+            while len(buffer) > _MAX_LINE_LENGTH:
+                self._process_line(name, buffer[:_MAX_LINE_LENGTH])
+                buffer = buffer[_MAX_LINE_LENGTH:]
+
+        if buffer:
+            self._process_line(name, buffer)
+
+        stream.close()
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def start(self, process):
+        """Begin capturing the stdout and stderr of a `subprocess.Popen`
+        instance, discarding any previously captured output"""
+
+        self._tails = {
+            name: deque(maxlen=self.max_lines) for name in STREAMS
+        }
+
+        if self.log_file and self._handler is None:
+            self._handler = self._create_handler()
+
+        self._threads = [
+            threading.Thread(
+                target=self._read_stream,
+                args=(name, getattr(process, name)),
+                daemon=True
+            )
+            for name in STREAMS
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def join(self):
+        """Wait until all output has been captured"""
+
+        for thread in self._threads:
+            thread.join()
+
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+    def tail(self, name):
+        """Returns retained lines from stream `name` as bytes"""
+        return b''.join(self._tails.get(name, ()))
+
+
+class MdrunProgressParser(HasStrictTraits):
+    """Line callback for a `StreamCapture` that parses the progress
+    of a Gromacs mdrun simulation from its output. Progress lines are
+    reported by mdrun when the `-v` flag is used."""
+
+    #: Latest simulation step reported
+    step = Int(0)
+
+    #: Simulation performance in ns / day, reported at the end
+    #: of the run
+    performance = Float()
+
+    #: Latest estimate of the remaining or finishing time
+    estimate = Str()
+
+    #: Matches progress lines, i.e. 'step 100, will finish ...' or
+    #: 'imb F  2% step 100, remaining wall clock time: 5 s'
+    _step_regex = Any(re.compile(r'\bstep\s+(\d+),\s*(.*)$'))
+
+    #: Matches performance summary, i.e. 'Performance:  54.8  0.438'
+    _performance_regex = Any(re.compile(r'^Performance:\s+([\d.]+)'))
+
+    def __call__(self, name, line):
+        match = self._step_regex.search(line)
+        if match is not None:
+            self.step = int(match.group(1))
+            self.estimate = match.group(2).strip()
+            return
+
+        match = self._performance_regex.match(line)
+        if match is not None:
+            self.performance = float(match.group(1))
@@ -1,13 +1,20 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from unittest import TestCase
+import asyncio
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+from unittest import TestCase, mock
 
 from traits.trait_errors import TraitError
 
 from force_gromacs.commands.base_gromacs_command import (
     BaseGromacsCommand
 )
+from force_gromacs.commands.stream_capture import StreamCapture
 
 
 class TestBaseGromacsCommand(TestCase):
@@ -78,7 +85,8 @@ class TestBaseGromacsCommand(TestCase):
 
         proc = self.gromacs_command._build_process(command)
 
-        stdout, stderr = proc.communicate()
+        stdout, stderr = proc.communicate(
+            input=self.gromacs_command._build_input())
         returncode = proc.returncode
 
         self.assertEqual(0, returncode)
@@ -104,6 +112,22 @@ class TestBaseGromacsCommand(TestCase):
         self.assertIn(' -flag', command)
         self.assertNotIn('True', command)
 
+    def test_output_files(self):
+
+        self.gromacs_command.output_flags = ['-o', '-flag']
+        self.assertListEqual([], self.gromacs_command.output_files())
+
+        self.gromacs_command.command_options = {
+            '-c': 'coordinate',
+            '-o': 'output',
+            '-flag': True
+        }
+        self.assertListEqual(['output'], self.gromacs_command.output_files())
+
+        self.gromacs_command.input_flags = ['-c']
+        self.assertListEqual(
+            ['coordinate'], self.gromacs_command.input_files())
+
     def test_bash_script(self):
 
         bash_script = self.gromacs_command.bash_script()
@@ -172,3 +196,208 @@ class TestBaseGromacsCommand(TestCase):
         self.assertEqual('', self.gromacs_command.recall_stdout())
         self.assertEqual('uniq: Hello: No such file or directory\n',
                          self.gromacs_command.recall_stderr())
+
+    def test_run_processes(self):
+
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+        self.gromacs_command.name = 'uniq'
+        self.gromacs_command.user_input = 'Hello World'
+
+        # User input is piped in without spawning any extra processes
+        with mock.patch(
+                'subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+            self.assertEqual(0, self.gromacs_command.run())
+
+        self.assertEqual(1, mock_popen.call_count)
+        self.assertEqual(
+            'Hello World\n', self.gromacs_command.recall_stdout())
+
+    def test_run_stream_capture(self):
+
+        lines = []
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+        self.gromacs_command.stream_capture = StreamCapture(
+            max_lines=2,
+            callbacks=[lambda name, line: lines.append(line)]
+        )
+
+        self.gromacs_command.name = 'seq 1 1000'
+        self.assertEqual(0, self.gromacs_command.run())
+        self.assertEqual('999\n1000\n', self.gromacs_command.recall_stdout())
+        self.assertEqual(1000, len(lines))
+
+        # Output is streamed when running asynchronously
+        lines.clear()
+        self.assertEqual(0, asyncio.run(self.gromacs_command.run_async()))
+        self.assertEqual('999\n1000\n', self.gromacs_command.recall_stdout())
+        self.assertEqual(1000, len(lines))
+
+        # Test user input
+        self.gromacs_command.name = 'uniq'
+        self.gromacs_command.user_input = 'Hello World'
+        self.assertEqual(0, self.gromacs_command.run())
+        self.assertEqual('Hello World\n', self.gromacs_command.recall_stdout())
+
+        # Test retained stderr is reported in errors
+        self.gromacs_command.name = 'uniq Hello World'
+        with self.assertRaisesRegex(
+                RuntimeError,
+                "'uniq: Hello: No such file or directory'"):
+            self.gromacs_command.run()
+
+    def test_run_timeout(self):
+
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+        self.gromacs_command.name = 'sleep 10'
+        self.gromacs_command.timeout = 0.5
+
+        # Process is terminated by SIGTERM
+        start = time.monotonic()
+        with self.assertRaisesRegex(
+                RuntimeError,
+                "Gromacs command 'sleep 10' did not complete within "
+                "0.5 s timeout and was terminated. Error code: -15"):
+            self.gromacs_command.run()
+        self.assertLess(time.monotonic() - start, 5)
+
+        # Same behaviour when output is streamed
+        self.gromacs_command.stream_capture = StreamCapture()
+        with self.assertRaisesRegex(RuntimeError, 'Error code: -15'):
+            self.gromacs_command.run()
+
+        # Process that ignores SIGTERM is killed by SIGKILL
+        with TemporaryDirectory() as directory:
+            script = os.path.join(directory, 'ignore_term.sh')
+            with open(script, 'w') as outfile:
+                outfile.write("trap '' TERM\nexec sleep 10\n")
+
+            self.gromacs_command.name = f'sh {script}'
+            self.gromacs_command.kill_timeout = 0.5
+            for stream_capture in [None, StreamCapture()]:
+                self.gromacs_command.stream_capture = stream_capture
+                start = time.monotonic()
+                with self.assertRaisesRegex(
+                        RuntimeError, 'Error code: -9'):
+                    self.gromacs_command.run()
+                self.assertLess(time.monotonic() - start, 5)
+
+    def test_run_resource_usage(self):
+
+        self.assertEqual(0, self.gromacs_command.run())
+        self.assertEqual({}, self.gromacs_command.recall_resource_usage())
+
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+        self.gromacs_command.name = 'sleep 0.2'
+        self.assertEqual(0, self.gromacs_command.run())
+
+        usage = self.gromacs_command.recall_resource_usage()
+        self.assertEqual(
+            {'wall_time', 'user_time', 'system_time', 'max_rss'},
+            set(usage))
+        self.assertGreaterEqual(usage['wall_time'], 0.2)
+        self.assertGreaterEqual(usage['user_time'], 0)
+        self.assertGreaterEqual(usage['system_time'], 0)
+        self.assertGreater(usage['max_rss'], 0)
+
+        # Usage only includes the command itself, rather than other
+        # child processes that have already terminated
+        subprocess.run(
+            [sys.executable, '-c', 'data = bytearray(200 * 1024 ** 2)'],
+            check=True)
+        self.gromacs_command.name = 'true'
+        self.assertEqual(0, self.gromacs_command.run())
+        usage = self.gromacs_command.recall_resource_usage()
+        self.assertLess(usage['max_rss'], 100 * 1024)
+
+        # Usage is recorded when running asynchronously
+        self.assertEqual(0, asyncio.run(self.gromacs_command.run_async()))
+        usage = self.gromacs_command.recall_resource_usage()
+        self.assertLess(usage['max_rss'], 100 * 1024)
+        self.assertIn('user_time', usage)
+
+    def test__build_input(self):
+
+        self.assertEqual(b'', self.gromacs_command._build_input())
+
+        self.gromacs_command.user_input = ' 2  3\n'
+        self.assertEqual(b'2 3\n', self.gromacs_command._build_input())
+
+    def test_run_async(self):
+
+        # Test dry run
+        self.assertEqual(0, asyncio.run(self.gromacs_command.run_async()))
+        self.assertEqual('', self.gromacs_command.recall_stdout())
+
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+
+        # Test simple bash command
+        self.gromacs_command.name = 'echo Hello World'
+        self.assertEqual(0, asyncio.run(self.gromacs_command.run_async()))
+        self.assertEqual('Hello World\n', self.gromacs_command.recall_stdout())
+        self.assertEqual('', self.gromacs_command.recall_stderr())
+
+        # Test user input
+        self.gromacs_command.name = 'uniq'
+        self.gromacs_command.user_input = 'Hello World'
+
+        self.assertEqual(0, asyncio.run(self.gromacs_command.run_async()))
+        self.assertEqual('Hello World\n', self.gromacs_command.recall_stdout())
+
+    def test_run_async_concurrent(self):
+
+        commands = [
+            BaseGromacsCommand(
+                executable='', name='sleep 0.5', dry_run=False)
+            for _ in range(4)
+        ]
+
+        async def run_all():
+            return await asyncio.gather(
+                *[command.run_async() for command in commands])
+
+        start = time.monotonic()
+        self.assertEqual([0] * 4, asyncio.run(run_all()))
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_run_async_timeout(self):
+
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+        self.gromacs_command.name = 'sleep 10'
+        self.gromacs_command.timeout = 0.5
+
+        start = time.monotonic()
+        with self.assertRaisesRegex(
+                RuntimeError,
+                "Gromacs command 'sleep 10' did not complete within "
+                "0.5 s timeout and was terminated. Error code: -15"):
+            asyncio.run(self.gromacs_command.run_async())
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertIn(
+            'wall_time', self.gromacs_command.recall_resource_usage())
+
+    def test_run_async_command_error(self):
+        self.gromacs_command.dry_run = False
+        self.gromacs_command.executable = ''
+
+        self.gromacs_command.name = 'not_a_command'
+        with self.assertRaisesRegex(
+                RuntimeError,
+                "Gromacs executable 'not_a_command' was not found."
+                " Check Gromacs installation"):
+            asyncio.run(self.gromacs_command.run_async())
+
+        self.gromacs_command.name = 'uniq Hello World'
+        with self.assertRaisesRegex(
+                RuntimeError,
+                "Gromacs command 'uniq Hello World' did not run correctly."
+                " Error code: 1,"
+                " 'uniq: Hello: No such file or directory'"):
+            asyncio.run(self.gromacs_command.run_async())
+
+        self.assertEqual(1, self.gromacs_command._returncode)
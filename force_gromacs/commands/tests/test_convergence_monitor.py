@@ -0,0 +1,145 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+import signal
+import subprocess
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from force_gromacs.commands.convergence_monitor import (
+    ConvergenceMonitor, parse_log_energies
+)
+
+ENERGY_TABLE = (
+    "           Step           Time\n"
+    "              {step}        0.00000\n"
+    "\n"
+    "   Energies (kJ/mol)\n"
+    "        LJ (SR)   Coulomb (SR)      Potential    Kinetic En.\n"
+    "   -4.00000e+03    0.00000e+00{potential:15.5e}    8.00000e+02\n"
+    "  Conserved En.    Temperature Pressure (bar)\n"
+    "   -3.20000e+03    3.00000e+02   -3.00000e+01\n"
+    "\n"
+)
+
+AVERAGES = (
+    "\t<======  ###############  ==>\n"
+    "\t<====  A V E R A G E S  ====>\n"
+    "\t<==  ###############  ======>\n"
+    "\n"
+    "   Energies (kJ/mol)\n"
+    "        LJ (SR)   Coulomb (SR)      Potential    Kinetic En.\n"
+    "   -4.00000e+03    0.00000e+00   -1.00000e+05    8.00000e+02\n"
+    "\n"
+)
+
+
+def write_log(log_file, potentials, averages=False, incomplete=False):
+    """Write Gromacs log file containing an energy table for each
+    potential energy value"""
+    with open(log_file, 'w') as outfile:
+        outfile.write("Started mdrun\n\n")
+        for step, potential in enumerate(potentials):
+            outfile.write(
+                ENERGY_TABLE.format(step=step, potential=potential))
+        if incomplete:
+            outfile.write(ENERGY_TABLE[:-40])
+        if averages:
+            outfile.write(AVERAGES)
+
+
+class TestConvergenceMonitor(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.log_file = os.path.join(self.directory.name, 'md.log')
+        self.potentials = [-3000.0 + (-1) ** index for index in range(40)]
+        self.monitor = ConvergenceMonitor(
+            log_file=self.log_file,
+            target_error=0.5,
+            interval=0.01
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_log_energies(self):
+        write_log(
+            self.log_file, [-3000.0, -3001.0],
+            averages=True, incomplete=True)
+
+        with open(self.log_file, 'r') as infile:
+            energies = parse_log_energies(infile)
+
+        self.assertListEqual([-3000.0, -3001.0], energies['Potential'])
+        self.assertListEqual([-30.0, -30.0], energies['Pressure (bar)'])
+        self.assertListEqual([300.0, 300.0], energies['Temperature'])
+        self.assertEqual(7, len(energies))
+
+        # Corrupted tables are ignored
+        lines = ENERGY_TABLE.format(step=0, potential=-1).splitlines(True)
+        lines[5] = '   -4.00000e+03    0.00000e+00\n'
+        self.assertDictEqual({}, parse_log_energies(lines))
+
+    def test_read_samples(self):
+        self.assertListEqual([], self.monitor.read_samples())
+
+        write_log(self.log_file, self.potentials)
+        self.assertListEqual(self.potentials, self.monitor.read_samples())
+
+        self.monitor.discard_fraction = 0.25
+        self.assertListEqual(
+            self.potentials[10:], self.monitor.read_samples())
+
+        self.monitor.observable = 'Not present'
+        self.assertListEqual([], self.monitor.read_samples())
+
+    def test_check(self):
+        write_log(self.log_file, self.potentials[:10])
+        self.assertFalse(self.monitor.check())
+        self.assertEqual(10, self.monitor.n_samples)
+
+        write_log(self.log_file, self.potentials)
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(40, self.monitor.n_samples)
+        self.assertAlmostEqual(-3000, self.monitor.mean)
+        self.assertLess(self.monitor.error, 0.5)
+
+        self.monitor.target_error = 1e-6
+        self.assertFalse(self.monitor.check())
+
+        self.monitor.method = 'block_average'
+        self.monitor.n_blocks = 4
+        self.monitor.target_error = 0.5
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(0, self.monitor.error)
+
+        self.monitor.n_blocks = 100
+        self.assertFalse(self.monitor.check())
+
+    def test_start_stop(self):
+        write_log(self.log_file, self.potentials)
+
+        proc = subprocess.Popen(['sleep', '30'])
+        self.monitor.start(proc)
+        self.assertEqual(-signal.SIGTERM, proc.wait(timeout=10))
+        self.monitor.stop()
+
+        self.assertTrue(self.monitor.converged)
+        self.assertDictEqual(
+            {'observable': 'Potential',
+             'mean': self.monitor.mean,
+             'error': self.monitor.error,
+             'n_samples': 40,
+             'converged': True},
+            self.monitor.report())
+
+        # Simulations that do not converge are not stopped
+        self.monitor.target_error = 1e-6
+        proc = subprocess.Popen(['sleep', '0.2'])
+        self.monitor.start(proc)
+        self.assertEqual(0, proc.wait(timeout=10))
+        self.monitor.stop()
+        self.assertFalse(self.monitor.converged)
+        self.assertEqual(40, self.monitor.n_samples)
@@ -1,10 +1,16 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from unittest import TestCase
+import asyncio
+import os
+import signal
+import subprocess
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
 
 from traits.trait_errors import TraitError
 
+from force_gromacs.commands.convergence_monitor import ConvergenceMonitor
 from force_gromacs.commands.gromacs_commands import (
     Gromacs_genbox, Gromacs_grompp, Gromacs_genion,
     Gromacs_mdrun, Gromacs_genconf, Gromacs_trjconv,
@@ -34,6 +40,28 @@ class TestGromacsCommands(TestCase):
         with self.assertRaises(TraitError):
             self.genbox.flags = []
 
+        with self.assertRaises(TraitError):
+            self.genbox.output_flags = []
+
+    def test_file_flags(self):
+
+        for command in [self.genconf, self.genbox, self.solvate,
+                        self.insert_molecules, self.grompp, self.genion,
+                        self.mdrun, self.select, self.trjconv]:
+            self.assertTrue(set(command.input_flags) <= set(command.flags))
+            self.assertTrue(set(command.output_flags) <= set(command.flags))
+
+        self.mdrun.command_options = {
+            '-s': 'test_topol.tpr',
+            '-c': 'test_output.gro',
+            '-x': 'test_traj.xtc',
+            '-nsteps': 100
+        }
+        self.assertListEqual(['test_topol.tpr'], self.mdrun.input_files())
+        self.assertListEqual(
+            ['test_traj.xtc', 'test_output.gro'],
+            self.mdrun.output_files())
+
     def test_genconf(self):
 
         input_options = {
@@ -213,6 +241,191 @@ class TestGromacsCommands(TestCase):
         command = self.mdrun_mpi.bash_script()
         self.assertIn('mdrun_mpi', command)
 
+    def test_mdrun_restart(self):
+
+        mdrun = Gromacs_mdrun(restart=True)
+
+        with TemporaryDirectory() as directory:
+            checkpoint_file = os.path.join(directory, 'test_state.cpt')
+            mdrun.command_options = {
+                '-s': 'test_top.trp',
+                '-cpo': checkpoint_file}
+            self.assertEqual(checkpoint_file, mdrun.checkpoint_file)
+
+            # No checkpoint yet, so start from the beginning
+            command = mdrun._build_command()
+            self.assertNotIn(' -cpi', command)
+            self.assertNotIn(' -append', command)
+
+            with open(checkpoint_file, 'w'):
+                pass
+            command = mdrun._build_command()
+            self.assertIn(f' -cpi {checkpoint_file} -append', command)
+
+            mdrun.restart = False
+            self.assertNotIn(' -cpi', mdrun._build_command())
+
+        mdrun.restart = True
+        mdrun.command_options = {
+            '-s': 'test_top.trp',
+            '-cpi': 'test_state.cpt',
+            '-noappend': True}
+        self.assertEqual('test_state.cpt', mdrun.checkpoint_file)
+        command = mdrun._build_command(resume=True)
+        self.assertEqual(1, command.count(' -cpi'))
+        self.assertNotIn(' -append', command)
+
+        mdrun.command_options = {'-s': 'test_top.trp'}
+        self.assertEqual('state.cpt', mdrun.checkpoint_file)
+        self.assertEqual(
+            "if [ -f state.cpt ]; then\n"
+            "gmx mdrun -s test_top.trp -cpi state.cpt -append\n"
+            "else\n"
+            "gmx mdrun -s test_top.trp\n"
+            "fi",
+            mdrun.bash_script())
+
+        mdrun.mpi_run = True
+        self.assertIn(
+            "mpirun -np 1 gmx mdrun -s test_top.trp -cpi state.cpt",
+            mdrun.bash_script())
+
+    def test_mdrun_completed_steps(self):
+
+        log = (
+            "Started mdrun\n"
+            "           Step           Time\n"
+            "              0        0.00000\n"
+            "\n"
+            "           Step           Time\n"
+            "            500        1.00000\n"
+            "\n"
+            "Writing checkpoint, step 500\n"
+        )
+
+        with TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'test_md.log')
+            mdrun = Gromacs_mdrun(
+                command_options={'-g': log_file},
+                expected_steps=1000)
+            self.assertEqual(log_file, mdrun.log_file)
+            self.assertIsNone(mdrun.completed_steps())
+
+            with open(log_file, 'w') as outfile:
+                outfile.write(log)
+            self.assertEqual(500, mdrun.completed_steps())
+
+            # Steps are only checked for real runs
+            mdrun._check_completed_steps()
+            mdrun.dry_run = False
+            with self.assertRaisesRegex(
+                    RuntimeError,
+                    'Gromacs simulation completed 500 steps, '
+                    'but 1000 were expected'):
+                mdrun._check_completed_steps()
+
+            mdrun.expected_steps = 500
+            mdrun._check_completed_steps()
+
+            mdrun.expected_steps = 0
+            with open(log_file, 'w'):
+                pass
+            mdrun._check_completed_steps()
+
+    def test_mdrun_noappend(self):
+
+        with TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'test_md.log')
+            checkpoint_file = os.path.join(directory, 'test_state.cpt')
+            mdrun = Gromacs_mdrun(
+                command_options={
+                    '-g': log_file, '-cpo': checkpoint_file,
+                    '-noappend': True},
+                restart=True)
+            self.assertEqual(log_file, mdrun.log_file)
+            self.assertEqual(
+                os.path.join(directory, 'test_md.part0001.log'),
+                mdrun._current_log_file())
+
+            # The newest part log is used
+            for part in ['0001', '0002', '0010']:
+                with open(os.path.join(
+                        directory, f'test_md.part{part}.log'), 'w'):
+                    pass
+            with open(os.path.join(directory, 'test_md.part01.log'), 'w'):
+                pass
+            self.assertEqual(
+                os.path.join(directory, 'test_md.part0010.log'),
+                mdrun.log_file)
+
+            # New parts are only created when resuming a simulation
+            self.assertEqual(
+                os.path.join(directory, 'test_md.part0001.log'),
+                mdrun._current_log_file())
+            with open(checkpoint_file, 'w'):
+                pass
+            self.assertEqual(
+                os.path.join(directory, 'test_md.part0011.log'),
+                mdrun._current_log_file())
+
+            mdrun.command_options.pop('-noappend')
+            self.assertEqual(log_file, mdrun.log_file)
+            self.assertEqual(log_file, mdrun._current_log_file())
+
+    def test_mdrun_convergence(self):
+
+        mdrun = Gromacs_mdrun(dry_run=False, expected_steps=1000)
+        self.assertDictEqual({}, mdrun.recall_convergence())
+
+        monitor = ConvergenceMonitor(target_error=0.5, interval=0.01)
+        mdrun.command_options = {'-g': 'test_md.log'}
+        mdrun.convergence_monitor = monitor
+
+        # Monitor stops a running process once converged
+        proc = subprocess.Popen(
+            ['sleep', '30'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE)
+        with mock.patch.object(
+                ConvergenceMonitor, 'check', return_value=True):
+            mdrun._communicate(proc)
+        self.assertEqual(-signal.SIGTERM, proc.returncode)
+
+        self.assertEqual('test_md.log', monitor.log_file)
+        self.assertTrue(mdrun.recall_convergence()['converged'])
+
+        # Steps are not checked after stopping early
+        mdrun._check_completed_steps()
+        monitor.converged = False
+        with self.assertRaises(RuntimeError):
+            mdrun._check_completed_steps()
+
+    def test_mdrun_run_async(self):
+
+        with TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'test_md.log')
+            monitor = ConvergenceMonitor(target_error=0.5)
+            mdrun = Gromacs_mdrun(
+                command_options={'-g': log_file, '-noappend': True},
+                convergence_monitor=monitor,
+                expected_steps=1000,
+                dry_run=False)
+
+            # Convergence is monitored, following the new part log
+            with mock.patch.object(
+                    Gromacs_mdrun, '_build_command', return_value='true'):
+                with mock.patch.object(
+                        ConvergenceMonitor, 'start') as mock_start:
+                    with self.assertRaisesRegex(
+                            RuntimeError, 'but 1000 were expected'):
+                        asyncio.run(mdrun.run_async())
+
+            self.assertEqual(1, mock_start.call_count)
+            self.assertEqual(
+                os.path.join(directory, 'test_md.part0001.log'),
+                monitor.log_file)
+
     def test_trjconv(self):
         command_options = {
             '-f': 'test_traj.xtc',
@@ -0,0 +1,183 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import io
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from force_gromacs.commands.stream_capture import (
+    StreamCapture, MdrunProgressParser, _MAX_LINE_LENGTH
+)
+
+mdrun_stderr = (
+    b"starting mdrun 'Water'\n"
+    b"500 steps,      1.0 ps.\n"
+    b"step 100, will finish Wed Jan  8 10:49:53 2020\r"
+    b"imb F  2% step 200, remaining wall clock time:     5 s\r\n"
+    b"\n"
+    b"               Core t (s)   Wall t (s)        (%)\n"
+    b"Performance:       54.812        0.438\n"
+)
+
+
+class DummyProcess:
+    """Provides streams with the same interface as
+    `subprocess.Popen` instances"""
+
+    def __init__(self, stdout=b'', stderr=b''):
+        self.stdout = io.BufferedReader(io.BytesIO(stdout))
+        self.stderr = io.BufferedReader(io.BytesIO(stderr))
+
+
+class ChunkedStream:
+    """Provides the output of a stream in the chunks given"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read1(self, size):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def close(self):
+        pass
+
+
+class TestStreamCapture(TestCase):
+
+    def setUp(self):
+        self.lines = []
+        self.stream_capture = StreamCapture(
+            callbacks=[
+                lambda name, line: self.lines.append((name, line))
+            ]
+        )
+
+    def test_capture(self):
+
+        process = DummyProcess(
+            stdout=b'Hello\nWorld', stderr=mdrun_stderr)
+        self.stream_capture.start(process)
+        self.stream_capture.join()
+
+        self.assertEqual(b'Hello\nWorld', self.stream_capture.tail('stdout'))
+        self.assertEqual(mdrun_stderr, self.stream_capture.tail('stderr'))
+
+        # Empty lines are not passed to callbacks
+        self.assertListEqual(
+            [('stdout', 'Hello'), ('stdout', 'World')],
+            [line for line in self.lines if line[0] == 'stdout'])
+        self.assertIn(
+            ('stderr', 'step 100, will finish Wed Jan  8 10:49:53 2020'),
+            self.lines)
+        self.assertEqual(8, len(self.lines))
+
+        # Output is discarded on restart
+        self.stream_capture.start(DummyProcess())
+        self.stream_capture.join()
+        self.assertEqual(b'', self.stream_capture.tail('stdout'))
+
+    def test_line_terminators(self):
+
+        process = DummyProcess()
+        process.stdout = ChunkedStream(
+            [b'Hello\r', b'\nWorld\r\n', b'step 1\rstep 2\r', b'Done'])
+        self.stream_capture.start(process)
+        self.stream_capture.join()
+
+        # Carriage return and newline pairs are single terminators,
+        # even when split between chunks
+        self.assertListEqual(
+            [b'Hello\r\n', b'World\r\n', b'step 1\r', b'step 2\r',
+             b'Done'],
+            list(self.stream_capture._tails['stdout']))
+        self.assertListEqual(
+            ['Hello', 'World', 'step 1', 'step 2', 'Done'],
+            [line for _, line in self.lines])
+
+    def test_max_line_length(self):
+
+        process = DummyProcess()
+        process.stdout = ChunkedStream(
+            [b'x' * _MAX_LINE_LENGTH] * 3 + [b'\n'])
+        self.stream_capture.max_lines = 2
+        self.stream_capture.start(process)
+        self.stream_capture.join()
+
+        # Incomplete lines are processed once they exceed the maximum
+        # length, so that only the tail is retained
+        self.assertEqual(
+            [_MAX_LINE_LENGTH, _MAX_LINE_LENGTH + 1],
+            [len(line) for line in self.stream_capture._tails['stdout']])
+        self.assertEqual(3, len(self.lines))
+
+    def test_max_lines(self):
+
+        output = ''.join(f'{index}\n' for index in range(20000))
+
+        self.stream_capture.max_lines = 5
+        self.stream_capture.start(DummyProcess(stdout=output.encode()))
+        self.stream_capture.join()
+
+        self.assertEqual(
+            b'19995\n19996\n19997\n19998\n19999\n',
+            self.stream_capture.tail('stdout'))
+        self.assertEqual(20000, len(self.lines))
+
+    def test_log_file(self):
+
+        with TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'md.out')
+            self.stream_capture.log_file = log_file
+            self.stream_capture.max_lines = 1
+            self.stream_capture.start(
+                DummyProcess(stdout=b'Hello\nWorld\n'))
+            self.stream_capture.join()
+
+            with open(log_file) as infile:
+                self.assertEqual('Hello\nWorld\n', infile.read())
+
+            # Log files are rotated once they reach max_bytes
+            self.stream_capture.max_bytes = 100
+            self.stream_capture.backup_count = 2
+            self.stream_capture.start(
+                DummyProcess(stdout=b'0123456789\n' * 50))
+            self.stream_capture.join()
+
+            self.assertListEqual(
+                ['md.out', 'md.out.1', 'md.out.2'],
+                sorted(os.listdir(directory)))
+            for file_name in os.listdir(directory):
+                self.assertLessEqual(
+                    os.path.getsize(os.path.join(directory, file_name)),
+                    100)
+
+    def test_callback_error(self):
+
+        def callback(name, line):
+            raise ValueError
+
+        self.stream_capture.callbacks.append(callback)
+        with self.assertLogs(
+                'force_gromacs.commands.stream_capture', 'ERROR'):
+            self.stream_capture.start(DummyProcess(stdout=b'Hello\n'))
+            self.stream_capture.join()
+
+        # Remaining callbacks and output are unaffected
+        self.assertListEqual([('stdout', 'Hello')], self.lines)
+        self.assertEqual(b'Hello\n', self.stream_capture.tail('stdout'))
+
+
+class TestMdrunProgressParser(TestCase):
+
+    def test___call__(self):
+
+        parser = MdrunProgressParser()
+        stream_capture = StreamCapture(callbacks=[parser])
+        stream_capture.start(DummyProcess(stderr=mdrun_stderr))
+        stream_capture.join()
+
+        self.assertEqual(200, parser.step)
+        self.assertEqual(
+            'remaining wall clock time:     5 s', parser.estimate)
+        self.assertAlmostEqual(54.812, parser.performance)
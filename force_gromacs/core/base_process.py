@@ -1,7 +1,9 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import HasStrictTraits, Bool, Int, Bytes, provides
+from traits.api import (
+    HasStrictTraits, Bool, Int, Bytes, Dict, Float, Str, provides
+)
 
 from .i_process import IProcess
 
@@ -26,6 +28,9 @@ class BaseProcess(HasStrictTraits):
     #: Stdout from subprocess command
     _stdout = Bytes()
 
+    #: Wall clock time, CPU time and memory used by subprocess command
+    _resource_usage = Dict(Str, Float)
+
     def recall_stderr(self):
         """Returns latest stderr message as unicode"""
         return self._stderr.decode('unicode_escape')
@@ -34,6 +39,12 @@ class BaseProcess(HasStrictTraits):
         """Returns latest stdout message as unicode"""
         return self._stdout.decode('unicode_escape')
 
+    def recall_resource_usage(self):
+        """Returns resources used by latest subprocess command as a
+        dictionary, containing 'wall_time', 'user_time' and
+        'system_time' in seconds and 'max_rss' in kB"""
+        return dict(self._resource_usage)
+
     def bash_script(self):
         """Method to be implemented that returns a string containing
         the equivalent bash command to invoke the `run` method directly
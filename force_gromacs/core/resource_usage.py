@@ -0,0 +1,80 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+import subprocess
+import sys
+import time
+
+#: Resources that accumulate over the lifetime of a process, and
+#: therefore can be summed over several processes
+CUMULATIVE_RESOURCES = ('wall_time', 'user_time', 'system_time')
+
+
+def _max_rss(usage):
+    """Returns the maximum resident set size in `usage` in kB"""
+    # ru_maxrss is reported in bytes rather than kB on macOS
+    if sys.platform == 'darwin':
+        return usage.ru_maxrss / 1024
+    return float(usage.ru_maxrss)
+
+
+def _returncode(status):
+    """Returns the return code of a process from its wait status,
+    following the convention of `subprocess.Popen.returncode`"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def wait_process(process, timeout=None):
+    """Waits for a `subprocess.Popen` instance to terminate, and
+    returns the resources used by that process alone. The process is
+    reaped using `os.wait4`, and its `returncode` is set.
+
+    Parameters
+    ----------
+    process: subprocess.Popen
+        Running process to wait for
+    timeout: float, optional
+        Maximum time in seconds to wait
+
+    Returns
+    -------
+    usage: dict
+        Contains 'user_time' and 'system_time' in seconds and
+        'max_rss', the largest resident set size of the process in kB.
+        Empty if the process has already been reaped elsewhere
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        if the process has not terminated after `timeout` seconds
+    """
+
+    end = None if timeout is None else time.monotonic() + timeout
+    delay = 0.0005
+
+    while True:
+        flags = 0 if end is None else os.WNOHANG
+        try:
+            pid, status, usage = os.wait4(process.pid, flags)
+        except ChildProcessError:
+            # Process was reaped by the subprocess module, for
+            # instance by `Popen.send_signal`
+            process.wait()
+            return {}
+
+        if pid == process.pid:
+            process.returncode = _returncode(status)
+            return {
+                'user_time': usage.ru_utime,
+                'system_time': usage.ru_stime,
+                'max_rss': _max_rss(usage)
+            }
+
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        delay = min(delay * 2, remaining, 0.05)
+        time.sleep(delay)
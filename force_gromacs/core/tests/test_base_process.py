@@ -17,6 +17,7 @@ class TestBaseProcess(TestCase):
     def test___init__(self):
         self.assertTrue(self.process.dry_run)
         self.assertEqual(0, self.process._returncode)
+        self.assertEqual({}, self.process.recall_resource_usage())
 
     def test__not_implemented(self):
 
@@ -37,3 +38,14 @@ class TestBaseProcess(TestCase):
         self.assertEqual(
             'error', self.process.recall_stderr()
         )
+
+    def test_recall_resource_usage(self):
+
+        self.process._resource_usage = {'wall_time': 1.0}
+        usage = self.process.recall_resource_usage()
+        self.assertEqual({'wall_time': 1.0}, usage)
+
+        # Returned dictionary is a copy
+        usage['wall_time'] = 2.0
+        self.assertEqual(
+            1.0, self.process.recall_resource_usage()['wall_time'])
@@ -26,17 +26,12 @@ class FragmentDataSource(BaseDataSource):
         of additional `DataSource` objects can perform this in the next
         `ExecutionLayer`"""
 
-        # Obtain all fragments present in topology file
-        fragments = self._reader.read(model.topology)
-
-        # Search for fragment with symbol referenced in model
-        indices = [
-            index for index, fragment in enumerate(fragments)
-            if fragment.symbol == model.symbol
-        ]
+        # Obtain only the fragment with symbol referenced in model
+        # from the topology file
         try:
-            fragment = fragments[indices[0]]
-        except IndexError as e:
+            fragment = self._reader.read_symbol(
+                model.topology, model.symbol)
+        except KeyError as e:
             raise MissingFragmentException(
                 f'Fragment with symbol {model.symbol} has not'
                 f'been found in Gromacs topology file {model.topology}'
@@ -6,6 +6,8 @@ from traits.api import Unicode, File
 from force_bdss.api import BaseDataSourceModel
 from force_bdss.core.verifier import VerifierError
 
+from force_gromacs.io.base_file_reader import COMPRESSION_OPENERS
+
 
 class FragmentDataSourceModel(BaseDataSourceModel):
     """Class containing all input parameters for a single molecular
@@ -50,7 +52,8 @@ class FragmentDataSourceModel(BaseDataSourceModel):
         file_path: str
             File path for Gromacs input file
         ext: str, optional
-            Expected extension of Gromacs input file
+            Expected extension of Gromacs input file. Files with an
+            additional compressed extension are also accepted
         """
 
         errors = []
@@ -66,7 +69,10 @@ class FragmentDataSourceModel(BaseDataSourceModel):
             )
 
         if ext is not None:
-            if not file_path.endswith('.{}'.format(ext)):
+            extensions = tuple(
+                [f'.{ext}'] + [f'.{ext}.{compression}'
+                               for compression in COMPRESSION_OPENERS])
+            if not file_path.endswith(extensions):
                 errors.append(
                     VerifierError(
                         subject=self,
@@ -81,6 +81,16 @@ class TestFragmentDataSource(TestCase):
             messages
         )
 
+        errors = self.model._file_check(
+            'some_compressed_file.ext.gz', 'ext'
+        )
+        self.assertEqual(0, len(errors))
+
+        errors = self.model._file_check(
+            'some_compressed_file.gz', 'ext'
+        )
+        self.assertEqual(1, len(errors))
+
     def test_model_verify(self):
 
         self.model = self.factory.create_model()
@@ -5,6 +5,10 @@ import copy
 
 from force_bdss.api import BaseDataSource, DataValue, Slot
 
+from force_gromacs.chemicals.gromacs_fragment_view import (
+    GromacsFragmentView
+)
+from force_gromacs.chemicals.i_fragment import IFragment
 from force_gromacs.chemicals.molecule import Molecule
 
 
@@ -15,9 +19,15 @@ class MoleculeDataSource(BaseDataSource):
 
     def _make_local_parameter_copy(self, parameters):
         """Makes a local copy of any `parameter.value` attributes being
-         passed into the DataSource."""
+         passed into the DataSource. `IFragment` instances are wrapped
+         in a `GromacsFragmentView`, which shares all particle data
+         with the original fragment."""
         for parameter in parameters:
-            parameter.value = copy.copy(parameter.value)
+            if isinstance(parameter.value, IFragment):
+                parameter.value = GromacsFragmentView(
+                    source=parameter.value)
+            else:
+                parameter.value = copy.copy(parameter.value)
 
     def _assign_stoichiometry(self, model, fragments):
         """Assign stoichiometric number to a list of IFragment
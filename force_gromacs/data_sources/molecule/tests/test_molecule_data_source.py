@@ -1,10 +1,14 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, mock
 
 from force_bdss.api import DataValue
 
+from force_gromacs.chemicals.gromacs_fragment_view import (
+    GromacsFragmentView
+)
 from force_gromacs.gromacs_plugin import GromacsPlugin
 from force_gromacs.tests.probe_classes.chemicals import (
     ProbeGromacsFragment, data
@@ -74,6 +78,42 @@ class TestMoleculeDataSource(TestCase):
             parameters[1].value, self.input_values[1]
         )
 
+        # Fragments are copied as views of the input fragments
+        self.assertIsInstance(parameters[0].value, GromacsFragmentView)
+        self.assertIs(self.input_values[0], parameters[0].value.source)
+        self.assertEqual(
+            self.input_values[0].get_masses(),
+            [particle.mass for particle in parameters[0].value.particles])
+
+    def test_concurrent_evaluations(self):
+
+        def evaluate(fragment_numbers):
+            model = self.factory.create_model()
+            model.n_fragments = 2
+            model.fragment_numbers = fragment_numbers
+            data_values = [
+                DataValue(type='FRAGMENT', value=value)
+                for value in self.input_values
+            ]
+            return self.data_source.run(model, data_values)[0].value
+
+        fragment_numbers = [[index, index + 1] for index in range(1, 9)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            molecules = list(executor.map(evaluate, fragment_numbers))
+
+        # Stoichiometric numbers are only assigned to each molecule
+        for numbers, molecule in zip(fragment_numbers, molecules):
+            self.assertListEqual(
+                numbers,
+                [fragment.stoichiometry
+                 for fragment in molecule.fragments]
+            )
+            self.assertEqual(
+                23 * numbers[0] + 35 * numbers[1], molecule.mass)
+
+        self.assertEqual(1, self.positive_ion.stoichiometry)
+        self.assertEqual(1, self.negative_ion.stoichiometry)
+
     def test__assign_stoichiometry(self):
         self.model.n_fragments = 2
         self.model.fragment_numbers = [2, 3]
@@ -2,11 +2,23 @@
 #  All rights reserved.
 
 import os
+import re
+import shutil
 
 from force_bdss.api import (
     BaseDataSource, DataValue, Slot, Instance
 )
 
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
+from force_gromacs.io.gromacs_topology_preprocessor import (
+    GromacsTopologyPreprocessor
+)
+from force_gromacs.io.simulation_result_cache import (
+    SimulationResultCache, gromacs_version
+)
+from force_gromacs.pipelines.local_scheduler import LocalScheduler
+from force_gromacs.simulation_builders.base_gromacs_simulation_builder \
+    import BaseGromacsSimulationBuilder
 from force_gromacs.simulation_builders.i_simulation_builder import (
     ISimulationBuilder)
 
@@ -15,7 +27,18 @@ class SimulationDataSource(BaseDataSource):
     """Class that generates and calls a bash script for a single
     Gromacs simulation. Contains the option to perform the simulation
     locally, or export the bash script in order to run on a remote
-    cluster."""
+    cluster.
+
+    If enabled by the model, results are stored in a
+    `SimulationResultCache`, so that identical simulations are only
+    performed once. Several sets of parameters can also be simulated
+    concurrently using `run_batch`.
+
+    The production run of each simulation, i.e. its final mdrun step,
+    can be resumed from a checkpoint and monitored for convergence, as
+    set by the model. If a simulation is monitored for convergence, the
+    standard error achieved is reported as the `accuracy` of its
+    output."""
 
     simulation_builder = Instance(ISimulationBuilder)
 
@@ -28,6 +51,177 @@ class SimulationDataSource(BaseDataSource):
             return model.ow_data
         return True
 
+    def _create_cache(self, model):
+        """Returns cache of simulation results, if required by the
+        model. Results are never cached during a dry run."""
+
+        if model.use_cache and not model.dry_run:
+            return SimulationResultCache(
+                cache_directory=model.cache_directory,
+                max_bytes=int(model.cache_quota * 1024 ** 3)
+            )
+        return None
+
+    def _restore_results(self, model, cache, key, results_path):
+        """Restores cached results for `key` to `results_path`, unless
+        the model requires existing data to be overwritten
+
+        Returns
+        -------
+        restored: bool
+            Whether cached results were restored
+        """
+        if model.ow_data:
+            return False
+        return cache.restore(key, results_path)
+
+    def _configure_builder(self, model):
+        """Passes the restart and convergence options of the model to
+        the simulation builder, if supported"""
+
+        if isinstance(self.simulation_builder, BaseGromacsSimulationBuilder):
+            self.simulation_builder.trait_set(
+                restart=model.restart,
+                target_error=model.target_error,
+                convergence_observable=model.convergence_observable
+            )
+
+    def _configure_production_run(self, pipeline):
+        """Configures the final `Gromacs_mdrun` step in `pipeline` to
+        resume from a checkpoint and stop once converged, following
+        the options of the simulation builder"""
+
+        builder = self.simulation_builder
+        if not isinstance(builder, BaseGromacsSimulationBuilder):
+            return
+
+        mdruns = [
+            process for _, process in pipeline
+            if isinstance(process, Gromacs_mdrun)
+        ]
+        if mdruns:
+            builder.configure_restart(mdruns[-1])
+            builder.configure_convergence(mdruns[-1])
+
+    def _simulation_accuracy(self, pipeline):
+        """Returns standard error of the observable monitored for
+        convergence during the most recent run of `pipeline`, or None
+        if no simulations were monitored"""
+
+        errors = [
+            output['convergence']['error']
+            for output in pipeline.run_output.values()
+            if 'convergence' in output
+        ]
+        return errors[-1] if errors else None
+
+    def _topology_input_files(self, input_files):
+        """Returns `input_files`, with each Gromacs topology (.top or
+        .itp) file followed by every file that it includes. Includes
+        are resolved using the `include_dirs` and `defines` of the
+        simulation builder's topology data, if present. Topologies
+        that cannot be preprocessed are returned unchanged."""
+
+        topology_data = getattr(
+            self.simulation_builder, 'topology_data', None)
+        if topology_data is not None:
+            preprocessor = GromacsTopologyPreprocessor(
+                include_dirs=topology_data.include_dirs,
+                defines=topology_data.defines
+            )
+        else:
+            preprocessor = GromacsTopologyPreprocessor()
+
+        resolved_files = []
+        for file_path in input_files:
+            resolved_files.append(file_path)
+            if not file_path.endswith(('.top', '.itp')):
+                continue
+            try:
+                _, include_files = preprocessor.process(file_path)
+            except IOError:
+                continue
+            resolved_files += include_files[1:]
+
+        return list(dict.fromkeys(resolved_files))
+
+    def _generic_bash_script(self, bash_script):
+        """Returns `bash_script` with references to the folder, directory
+        and name of the simulation replaced by placeholders. Only whole
+        paths and path or file name components are replaced, so that
+        command arguments that happen to contain the name (such as
+        numbers) are unchanged.
+        """
+
+        builder = self.simulation_builder
+
+        # Start of a token, i.e. a command argument or path
+        token_start = r'(?<![^\s\'"=])'
+
+        if builder.folder:
+            bash_script = re.sub(
+                token_start + re.escape(builder.folder)
+                + r'(?=[/\s\'"]|$)',
+                '{folder}', bash_script)
+
+        if builder.directory not in ('', os.path.curdir):
+            bash_script = re.sub(
+                token_start + re.escape(builder.directory) + '(?=/)',
+                '{directory}', bash_script)
+
+        if builder.name:
+            name = re.escape(builder.name)
+            name_regex = re.compile(
+                # Component of a path, or a file name prefix
+                rf'(?<=/){name}(?=[/_\s\'"]|\.[A-Za-z]|$)'
+                rf'|{token_start}{name}(?=[/_]|\.[A-Za-z])'
+                # Folder created in the working directory
+                rf'|(?<=^mkdir ){name}(?=\s|$)'
+                # Name of the system in a topology file
+                rf'|^{name}$',
+                re.MULTILINE
+            )
+            bash_script = name_regex.sub('{name}', bash_script)
+
+        return bash_script
+
+    def create_cache_key(self, pipeline, cache):
+        """Returns key identifying the simulation performed by
+        `pipeline` in `cache`. References to the name and location of
+        the simulation are removed, so that identical simulations
+        share a key.
+
+        Parameters
+        ----------
+        pipeline: GromacsPipeline
+            A `GromacsPipeline` instance that performs the simulation
+        cache: SimulationResultCache
+            Cache that the key refers to
+
+        Returns
+        -------
+        key: str
+            Key identifying simulation results
+        """
+
+        builder = self.simulation_builder
+        bash_script = self._generic_bash_script(pipeline.bash_script())
+
+        # Include files that are referenced by, but not passed to,
+        # any Gromacs commands
+        input_files = pipeline.external_input_files()
+        topology_data = getattr(builder, 'topology_data', None)
+        if topology_data is not None:
+            input_files += topology_data.molecule_files
+        if getattr(builder, 'martini_parameters', ''):
+            input_files.append(builder.martini_parameters)
+
+        # Include files read by any topologies
+        input_files = self._topology_input_files(input_files)
+
+        return cache.cache_key(
+            bash_script, input_files=input_files, version=gromacs_version())
+
     def create_bash_script(self, pipeline, name=None):
         """Creates a string that can be exported as a bash script
         to run a Gromacs simulation simulation
@@ -82,9 +276,18 @@ class SimulationDataSource(BaseDataSource):
             "method that returns a BaseGromacsSimulationBuilder instance"
         )
 
-    def run(self, model, parameters):
-        """Takes in all parameters and molecules required to
-        perform a Gromacs simulation"""
+    def _prepare_simulation(self, model, parameters, cache):
+        """Creates a simulation builder for a set of parameters and
+        builds the pipeline required to perform the simulation, if any
+
+        Returns
+        -------
+        results_path: str
+            Path of the results trajectory file
+        pipeline: GromacsPipeline or None
+            Pipeline performing the simulation, or None if existing
+            results can be used
+        """
 
         # Generate a `BaseGromacsSimulationBuilder` object that will
         # pre-process all user input and produce a `GromacsPipeline`
@@ -93,29 +296,163 @@ class SimulationDataSource(BaseDataSource):
         self.simulation_builder = self.create_simulation_builder(
             model, parameters
         )
+        self._configure_builder(model)
 
         # Output the path containing the results trajectory file
         results_path = self.simulation_builder.get_results_path()
 
-        if self._check_perform_simulation(model, results_path):
+        # Existing results are validated by the cache, if used. Cached
+        # results are not restored if data should be overwritten
+        if cache is None and not self._check_perform_simulation(
+                model, results_path):
+            return results_path, None
 
-            # Create a `GromacsPipeline` with all commands needed to run the
-            # simulation simulation
-            pipeline = self.simulation_builder.build_pipeline()
+        # Create a `GromacsPipeline` with all commands needed to run the
+        # simulation simulation
+        pipeline = self.simulation_builder.build_pipeline()
+        self._configure_production_run(pipeline)
 
-            # Create bash script of Gromacs commands for remote submission
-            bash_script = self.create_bash_script(
-                pipeline, name=self.simulation_builder.name
-            )
+        # Create bash script of Gromacs commands for remote submission
+        bash_script = self.create_bash_script(
+            pipeline, name=self.simulation_builder.name
+        )
+
+        # Export the bash script to any HPCWriterNotificationListener
+        model.notify_bash_script(bash_script)
+
+        return results_path, pipeline
+
+    def _create_scheduler(self, model):
+        """Returns scheduler for running batches of simulations,
+        assigning `n_proc` cores to each simulation"""
+        return LocalScheduler(
+            cores_per_job=min(model.n_proc, os.cpu_count() or 1))
+
+    def run(self, model, parameters):
+        """Takes in all parameters and molecules required to
+        perform a Gromacs simulation"""
+
+        cache = self._create_cache(model)
+
+        results_path, pipeline = self._prepare_simulation(
+            model, parameters, cache)
+        accuracy = None
+
+        if pipeline is not None:
+            if cache is None:
+                # Run simulation locally
+                pipeline.run()
+                accuracy = self._simulation_accuracy(pipeline)
+            else:
+                key = self.create_cache_key(pipeline, cache)
+                if not self._restore_results(
+                        model, cache, key, results_path):
+                    pipeline.run()
+                    accuracy = self._simulation_accuracy(pipeline)
+                    cache.store(key, results_path, replace=model.ow_data)
+
+        return [
+            DataValue(
+                type="TRAJECTORY", value=results_path, accuracy=accuracy)
+        ]
+
+    def run_batch(self, model, parameter_sets, scheduler=None):
+        """Performs Gromacs simulations for several sets of parameters
+        concurrently. All pipelines are built up front, and identical
+        simulations are only performed once.
+
+        Parameters
+        ----------
+        model: SimulationDataSourceModel
+            The BaseDataSourceModel associated with this class
+        parameter_sets: list of List(DataValue)
+            Each item is a list of DataValue objects, as passed to `run`
+        scheduler: LocalScheduler, optional
+            Scheduler used to run simulations concurrently. If not
+            provided, a new scheduler assigning `model.n_proc` cores to
+            each simulation is used
+
+        Raises
+        ------
+        Exception
+            Any exception raised by a simulation, once all simulations
+            have completed
+
+        Returns
+        -------
+        results: list of List(DataValue)
+            Output of `run` for each set of parameters, in input order
+        """
+
+        cache = self._create_cache(model)
+        # Keys are required to identify duplicates, even without a cache
+        key_cache = cache or SimulationResultCache()
+
+        results_paths = []
+        results_keys = []
+        simulations = {}
+        for parameters in parameter_sets:
+            results_path, pipeline = self._prepare_simulation(
+                model, parameters, cache)
+            results_paths.append(results_path)
+
+            if pipeline is None:
+                results_keys.append(None)
+                continue
+
+            key = self.create_cache_key(pipeline, key_cache)
+            results_keys.append(key)
+            if key in simulations:
+                simulations[key][1].append(results_path)
+            elif cache is None or not self._restore_results(
+                    model, cache, key, results_path):
+                simulations[key] = (pipeline, [results_path])
+
+        owns_scheduler = scheduler is None
+        if owns_scheduler:
+            scheduler = self._create_scheduler(model)
+
+        error = None
+        accuracies = {}
+        try:
+            futures = {
+                key: scheduler.submit(pipeline)
+                for key, (pipeline, _) in simulations.items()
+            }
+
+            for key, future in futures.items():
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+
+                accuracies[key] = self._simulation_accuracy(
+                    simulations[key][0])
 
-            # Export the bash script to any HPCWriterNotificationListener
-            model.notify_bash_script(bash_script)
+                # Share results with any duplicate simulations
+                source_path, *duplicate_paths = simulations[key][1]
+                if cache is not None:
+                    cache.store(key, source_path, replace=model.ow_data)
+                if not model.dry_run:
+                    for results_path in duplicate_paths:
+                        if results_path == source_path:
+                            continue
+                        # Pipelines of duplicates are never run, so their
+                        # folders may not exist
+                        directory = os.path.dirname(results_path)
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        shutil.copyfile(source_path, results_path)
+        finally:
+            if owns_scheduler:
+                scheduler.shutdown()
 
-            # Run simulation locally
-            pipeline.run()
+        if error is not None:
+            raise error
 
         return [
-            DataValue(type="TRAJECTORY", value=results_path)
+            [DataValue(type="TRAJECTORY", value=results_path,
+                       accuracy=accuracies.get(key))]
+            for results_path, key in zip(results_paths, results_keys)
         ]
 
     def slots(self, model):
@@ -2,7 +2,7 @@
 #  All rights reserved.
 import os
 
-from traits.api import Unicode, Bool, Int, File, Directory
+from traits.api import Unicode, Bool, Int, Float, File, Directory
 from traitsui.api import View, Item, Group, VGroup
 
 from force_bdss.api import BaseDataSourceModel, VerifierError
@@ -36,9 +36,33 @@ class SimulationDataSourceModel(BaseDataSourceModel):
     #: Number of time steps in the production simulation
     n_steps = Int(1000)
 
+    #: Standard error of `convergence_observable` at which the
+    #: production run is stopped early. If zero, the production run
+    #: always lasts `n_steps`
+    target_error = Float(0.0)
+
+    #: Energy term reported in the Gromacs log file that is monitored
+    #: for convergence
+    convergence_observable = Unicode('Potential')
+
+    #: Whether or not to resume an interrupted production run from
+    #: its checkpoint file
+    restart = Bool(False)
+
     #: Whether or not to overwrite existing simulation data
     ow_data = Bool(False)
 
+    #: Whether or not to reuse results of identical simulations
+    #: stored in `cache_directory`. If enabled, existing simulation
+    #: data is only reused if its inputs are unchanged
+    use_cache = Bool(False)
+
+    #: Directory to store cached simulation results
+    cache_directory = Directory()
+
+    #: Maximum disk space used by cached simulation results in GB
+    cache_quota = Float(10.0)
+
     #: Whether or not to perform a dry run of Gromacs
     dry_run = Bool(True)
 
@@ -68,6 +92,10 @@ class SimulationDataSourceModel(BaseDataSourceModel):
         Group(
             Item("size", label='Number of particles'),
             Item("n_steps", label='Number of time steps'),
+            Item('target_error', label='Target standard error'),
+            Item('convergence_observable', label='Convergence observable',
+                 visible_when='target_error > 0'),
+            Item('restart', label='Resume from checkpoint?'),
             Item('mpi_run', label='Use MPI?'),
             Item("n_proc", label='Number of processes',
                  visible_when='mpi_run'),
@@ -86,6 +114,10 @@ class SimulationDataSourceModel(BaseDataSourceModel):
             ),
             VGroup(
                 Item("ow_data", label='Overwrite simulation data'),
+                Item('use_cache', label='Reuse cached results?'),
+                Item('cache_directory', visible_when='use_cache'),
+                Item('cache_quota', label='Cache quota (GB)',
+                     visible_when='use_cache'),
                 Item('name', label='Simulation name'),
                 Item('output_directory'),
                 label='Output'
@@ -102,6 +134,10 @@ class SimulationDataSourceModel(BaseDataSourceModel):
         """Use working directory as default location for output data"""
         return os.getcwd()
 
+    def _cache_directory_default(self):
+        """Store cached results in output directory by default"""
+        return os.path.join(self.output_directory, '.simulation_cache')
+
     # --------------------
     #   Private Methods
     # --------------------
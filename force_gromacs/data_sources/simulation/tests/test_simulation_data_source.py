@@ -2,15 +2,17 @@
 #  All rights reserved.
 
 import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
 from traits.testing.unittest_tools import UnittestTools
 
 from force_bdss.api import DataValue
 
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
 from force_gromacs.tests.probe_classes.chemicals import ProbeMolecule
 from force_gromacs.tests.probe_classes.simulation_builders import (
-    ProbeSimulationBuilder
+    ProbeSimulationBuilder, ProbeFileSimulationBuilder
 )
 from force_gromacs.tests.probe_classes.pipelines import (
     ProbeGromacsPipeline
@@ -18,12 +20,17 @@ from force_gromacs.tests.probe_classes.pipelines import (
 from force_gromacs.data_sources.simulation.simulation_factory import (
     SimulationFactory
 )
+from force_gromacs.io.simulation_result_cache import SimulationResultCache
 
 
 SIMULATION_DATASOURCE_PATH = ('force_gromacs.data_sources.simulation'
                               '.simulation_data_source.SimulationDataSource')
 SIMULATION_BUILDER_PATH = (f"{SIMULATION_DATASOURCE_PATH}"
                            '.create_simulation_builder')
+CACHE_PATH = ('force_gromacs.io.simulation_result_cache'
+              '.SimulationResultCache')
+PIPELINE_RUN_PATH = ('force_gromacs.tests.probe_classes.pipelines'
+                     '.ProbeGromacsPipeline.run')
 
 
 class TestSimulationDataSource(TestCase, UnittestTools):
@@ -77,11 +84,282 @@ class TestSimulationDataSource(TestCase, UnittestTools):
         self.assertEqual(1, len(res))
         self.assertEqual('/path/to/trajectory.gro', res[0].value)
 
+    def test_run_batch(self):
+
+        in_slots = self.data_source.slots(self.model)[0]
+        parameter_sets = [
+            [DataValue(type=slot.type, value=value)
+             for slot, value in zip(in_slots, self.input_values)]
+            for _ in range(3)
+        ]
+
+        with mock.patch(SIMULATION_BUILDER_PATH) as mock_sim, \
+                mock.patch(PIPELINE_RUN_PATH) as mock_run, \
+                mock.patch(f'{SIMULATION_DATASOURCE_PATH}'
+                           '.create_cache_key') as mock_key:
+            mock_sim.side_effect = lambda *args: ProbeSimulationBuilder()
+
+            # Identical simulations are only performed once
+            mock_key.side_effect = ['a', 'b', 'a']
+            with self.assertTraitChanges(self.model, 'event', count=3):
+                results = self.data_source.run_batch(
+                    self.model, parameter_sets)
+            self.assertEqual(2, mock_run.call_count)
+
+            self.assertEqual(3, len(results))
+            for result in results:
+                self.assertEqual(1, len(result))
+                self.assertEqual('/path/to/trajectory.gro', result[0].value)
+
+            # Errors are raised once all simulations are complete
+            mock_key.side_effect = ['a', 'b', 'c']
+            mock_run.side_effect = [None, RuntimeError('failed'), None]
+            with self.assertRaisesRegex(RuntimeError, 'failed'):
+                self.data_source.run_batch(self.model, parameter_sets)
+            self.assertEqual(5, mock_run.call_count)
+
+    def test_run_batch_duplicates(self):
+
+        with TemporaryDirectory() as directory:
+            input_file = os.path.join(directory, 'input.gro')
+            with open(input_file, 'w') as outfile:
+                outfile.write('coordinates')
+
+            def create_simulation_builder(model, parameters):
+                return ProbeFileSimulationBuilder(
+                    name=parameters[0], directory=directory,
+                    input_file=input_file, dry_run=False)
+
+            self.model.dry_run = False
+            with mock.patch(SIMULATION_BUILDER_PATH) as mock_sim:
+                mock_sim.side_effect = create_simulation_builder
+                results = self.data_source.run_batch(
+                    self.model, [['sim_a'], ['sim_b'], ['sim_c']])
+
+            # Duplicate results are copied into folders that are
+            # created for them
+            for result, name in zip(results, ['sim_a', 'sim_b', 'sim_c']):
+                results_path = os.path.join(
+                    directory, name, f'{name}_traj.gro')
+                self.assertEqual(results_path, result[0].value)
+                with open(results_path, 'r') as infile:
+                    self.assertEqual('coordinates', infile.read())
+
+    def test__create_scheduler(self):
+
+        self.model.n_proc = 1
+        scheduler = self.data_source._create_scheduler(self.model)
+        self.assertEqual(1, scheduler.cores_per_job)
+
+        self.model.n_proc = 100000
+        scheduler = self.data_source._create_scheduler(self.model)
+        self.assertEqual(os.cpu_count(), scheduler.cores_per_job)
+
     def test_default_traits(self):
         self.assertEqual(
             os.getcwd(),
             self.model.output_directory
         )
+        self.assertFalse(self.model.use_cache)
+        self.assertFalse(self.model.restart)
+        self.assertEqual(0, self.model.target_error)
+        self.assertEqual('Potential', self.model.convergence_observable)
+        self.assertEqual(
+            os.path.join(os.getcwd(), '.simulation_cache'),
+            self.model.cache_directory
+        )
+
+    def test__simulation_accuracy(self):
+
+        pipeline = ProbeGromacsPipeline()
+        self.assertIsNone(self.data_source._simulation_accuracy(pipeline))
+
+        pipeline.run_output = {
+            'min': {'returncode': 0},
+            'prod': {'convergence': {'error': 0.5, 'converged': True}}
+        }
+        self.assertEqual(
+            0.5, self.data_source._simulation_accuracy(pipeline))
+
+    def test__prepare_simulation_production_run(self):
+
+        self.model.restart = True
+        self.model.target_error = 0.5
+        self.model.convergence_observable = 'Pressure'
+
+        with TemporaryDirectory() as directory:
+            checkpoint_file = os.path.join(directory, 'prod.cpt')
+            with open(checkpoint_file, 'w') as outfile:
+                outfile.write('checkpoint')
+
+            minimize = Gromacs_mdrun(command_options={'-s': 'min.tpr'})
+            production = Gromacs_mdrun(
+                command_options={'-s': 'prod.tpr', '-cpo': checkpoint_file})
+            pipeline = ProbeGromacsPipeline()
+            pipeline.append(('minimize', minimize))
+            pipeline.append(('production', production))
+
+            with mock.patch(SIMULATION_BUILDER_PATH) as mock_sim:
+                mock_sim.return_value = ProbeSimulationBuilder(n_steps=500)
+                with mock.patch.object(
+                        ProbeSimulationBuilder, 'build_pipeline',
+                        return_value=pipeline):
+                    _, built_pipeline = self.data_source._prepare_simulation(
+                        self.model, [], None)
+
+            self.assertIs(pipeline, built_pipeline)
+
+            # Only the production run is resumed and monitored
+            self.assertFalse(minimize.restart)
+            self.assertIsNone(minimize.convergence_monitor)
+            self.assertNotIn('-cpi', minimize._build_command())
+
+            self.assertTrue(production.restart)
+            self.assertEqual(500, production.expected_steps)
+            self.assertIn(
+                f'-cpi {checkpoint_file}', production._build_command())
+            monitor = production.convergence_monitor
+            self.assertEqual(0.5, monitor.target_error)
+            self.assertEqual('Pressure', monitor.observable)
+
+    def test__create_cache(self):
+
+        self.assertIsNone(self.data_source._create_cache(self.model))
+
+        # Results are not cached in a dry run
+        self.model.use_cache = True
+        self.assertIsNone(self.data_source._create_cache(self.model))
+
+        self.model.dry_run = False
+        self.model.cache_quota = 0.5
+        cache = self.data_source._create_cache(self.model)
+        self.assertEqual(self.model.cache_directory, cache.cache_directory)
+        self.assertEqual(512 * 1024 ** 2, cache.max_bytes)
+
+    def test_create_cache_key(self):
+
+        self.data_source.simulation_builder = ProbeSimulationBuilder(
+            name='test_experiment')
+        cache = SimulationResultCache()
+        key = self.data_source.create_cache_key(
+            ProbeGromacsPipeline(), cache)
+
+        # Renamed simulations share a key
+        self.data_source.simulation_builder = ProbeSimulationBuilder(
+            name='other_experiment')
+        pipeline = ProbeGromacsPipeline()
+        pipeline['file_tree'].directory = 'other_experiment'
+        pipeline['top_file'].sim_name = 'other_experiment'
+        pipeline['top_file'].directory = os.path.join(
+            os.path.curdir, 'other_experiment')
+        self.assertEqual(
+            key, self.data_source.create_cache_key(pipeline, cache))
+
+        pipeline['solvate'].command_options = {'-radius': 20}
+        self.assertNotEqual(
+            key, self.data_source.create_cache_key(pipeline, cache))
+
+        # Arguments that contain the name are not replaced, so that
+        # different simulations do not share a key
+        keys = []
+        for value in ['1', '2']:
+            self.data_source.simulation_builder = ProbeSimulationBuilder(
+                name=value)
+            pipeline = ProbeGromacsPipeline()
+            pipeline['solvate'].command_options = {'-radius': int(value)}
+            keys.append(self.data_source.create_cache_key(pipeline, cache))
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test__topology_input_files(self):
+
+        self.data_source.simulation_builder = ProbeSimulationBuilder()
+        cache = SimulationResultCache()
+
+        with TemporaryDirectory() as directory:
+            molecule_file = os.path.join(directory, 'molecule.itp')
+            include_file = os.path.join(directory, 'include.itp')
+            with open(molecule_file, 'w') as outfile:
+                outfile.write('#include "include.itp"\n')
+            with open(include_file, 'w') as outfile:
+                outfile.write('[ moleculetype ]\nW 1\n')
+
+            self.assertListEqual(
+                ['test.mdp', molecule_file, include_file],
+                self.data_source._topology_input_files(
+                    ['test.mdp', molecule_file, include_file]))
+            self.assertListEqual(
+                [os.path.join(directory, 'missing.itp')],
+                self.data_source._topology_input_files(
+                    [os.path.join(directory, 'missing.itp')]))
+
+            # Changes to included files change the cache key
+            topology_data = self.data_source.simulation_builder.topology_data
+            topology_data.molecule_files = [molecule_file]
+            key = self.data_source.create_cache_key(
+                ProbeGromacsPipeline(), cache)
+            with open(include_file, 'w') as outfile:
+                outfile.write('[ moleculetype ]\nW 2\n')
+            self.assertNotEqual(
+                key, self.data_source.create_cache_key(
+                    ProbeGromacsPipeline(), cache))
+
+    def test__generic_bash_script(self):
+
+        self.data_source.simulation_builder = ProbeSimulationBuilder(
+            name='1', directory='/data/runs')
+        bash_script = (
+            "mkdir /data/runs/1\n"
+            "gmx solvate -radius 1 -scale 1.5 -p 1.top "
+            "-o /data/runs/1/1_coord.gro\n"
+            "gmx mdrun -s /data/runs/10/topol.tpr -nt 1\n"
+            "[ system ]\n1\nS 1"
+        )
+        self.assertEqual(
+            "mkdir {folder}\n"
+            "gmx solvate -radius 1 -scale 1.5 -p {name}.top "
+            "-o {folder}/{name}_coord.gro\n"
+            "gmx mdrun -s {directory}/10/topol.tpr -nt 1\n"
+            "[ system ]\n{name}\nS 1",
+            self.data_source._generic_bash_script(bash_script))
+
+    def test_run_cache(self):
+
+        in_slots = self.data_source.slots(self.model)[0]
+        data_values = [
+            DataValue(type=slot.type, value=value)
+            for slot, value in zip(in_slots, self.input_values)
+        ]
+        self.model.use_cache = True
+        self.model.dry_run = False
+
+        with mock.patch(SIMULATION_BUILDER_PATH) as mock_sim, \
+                mock.patch(PIPELINE_RUN_PATH) as mock_run, \
+                mock.patch(f'{CACHE_PATH}.restore') as mock_restore, \
+                mock.patch(f'{CACHE_PATH}.store') as mock_store, \
+                mock.patch('os.path.exists', return_value=True):
+            mock_sim.return_value = ProbeSimulationBuilder()
+
+            # Existing results are validated by the cache
+            mock_restore.return_value = False
+            self.data_source.run(self.model, data_values)
+            self.assertEqual(1, mock_run.call_count)
+            mock_store.assert_called_once_with(
+                mock.ANY, '/path/to/trajectory.gro', replace=False)
+
+            # Identical simulations are not repeated
+            mock_restore.return_value = True
+            res = self.data_source.run(self.model, data_values)
+            self.assertEqual(1, mock_run.call_count)
+            self.assertEqual(1, mock_store.call_count)
+            self.assertEqual('/path/to/trajectory.gro', res[0].value)
+
+            # Cached results are replaced if data should be overwritten
+            self.model.ow_data = True
+            self.data_source.run(self.model, data_values)
+            self.assertEqual(2, mock_restore.call_count)
+            self.assertEqual(2, mock_run.call_count)
+            mock_store.assert_called_with(
+                mock.ANY, '/path/to/trajectory.gro', replace=True)
 
     def test__check_perform_simulation(self):
 
@@ -1,8 +1,22 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import bz2
+import gzip
+import lzma
+import os
+
 from traits.api import HasStrictTraits, ReadOnly
 
+#: Compressed file extensions that are accepted as a suffix to the
+#: extension of each reader, with the function used to decompress them
+#: as a text stream
+COMPRESSION_OPENERS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open
+}
+
 
 class BaseFileReader(HasStrictTraits):
     """Class parses input files and returns data
@@ -35,24 +49,49 @@ class BaseFileReader(HasStrictTraits):
     #  Private Methods
     # ------------------
 
+    def _split_compression(self, file_path):
+        """Separate any compressed file extension from `file_path`,
+        returning the uncompressed file path and compression format
+        (or None if the file is not compressed)"""
+
+        prefix, ext = os.path.splitext(file_path)
+        ext = ext.strip('.')
+
+        if ext in COMPRESSION_OPENERS:
+            return prefix, ext
+        return file_path, None
+
     def _check_file_types(self, file_path):
         """Raise exception if specified Gromacs file does not have
-        expected format"""
+        expected format. Files compressed in any format listed in
+        `COMPRESSION_OPENERS` are also accepted."""
+
+        uncompressed_path, _ = self._split_compression(file_path)
 
         space_check = file_path.isspace()
-        ext_check = not file_path.endswith(f'.{self._ext}')
+        ext_check = not uncompressed_path.endswith(f'.{self._ext}')
 
         if space_check or ext_check:
             raise IOError(
                 '{} not a valid Gromacs file type'.format(
                     file_path))
 
-    def _read_file(self, file_path):
-        """Simple file loader"""
+    def _open_file(self, file_path):
+        """Open file as a text stream, decompressing the contents
+        on the fly if required"""
 
         self._check_file_types(file_path)
 
-        with open(file_path, 'r') as infile:
+        _, compression = self._split_compression(file_path)
+
+        if compression is not None:
+            return COMPRESSION_OPENERS[compression](file_path, 'rt')
+        return open(file_path, 'r')
+
+    def _read_file(self, file_path):
+        """Simple file loader"""
+
+        with self._open_file(file_path) as infile:
             file_lines = infile.readlines()
 
         return file_lines
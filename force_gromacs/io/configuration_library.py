@@ -0,0 +1,297 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from traits.api import HasStrictTraits, Any, Directory, Float
+
+#: Name of file indexing all configurations in the library
+_INDEX_FILE = 'index.json'
+
+
+def composition_distance(composition, other):
+    """Returns distance between two compositions, as the sum of
+    absolute differences between the mole fraction of each fragment.
+    Values lie between 0 (identical proportions) and 2 (no fragments
+    in common).
+
+    Parameters
+    ----------
+    composition, other: dict of str: int
+        Number of molecules of each fragment, as stored in
+        `GromacsTopologyData.fragment_ledger`
+    """
+
+    total = sum(composition.values())
+    other_total = sum(other.values())
+
+    if not total or not other_total:
+        return 0.0 if total == other_total else 2.0
+
+    return sum(
+        abs(composition.get(symbol, 0) / total
+            - other.get(symbol, 0) / other_total)
+        for symbol in set(composition) | set(other)
+    )
+
+
+class ConfigurationLibrary(HasStrictTraits):
+    """Library of equilibrated Gromacs coordinate files, indexed by
+    the composition of each simulation (its `fragment_ledger`). New
+    simulations can then be started from the configuration with the
+    closest composition, rather than building a box from scratch,
+    which reduces the equilibration time required.
+
+    Configurations are copied into `library_directory`, alongside a
+    JSON index. Each fragment is expected to be a single residue named
+    by its symbol in the coordinate file.
+
+    Example
+    -------
+    Storing an equilibrated configuration:
+        library = ConfigurationLibrary(library_directory='library')
+        library.add(topology_data.fragment_ledger, 'equil_coord.gro')
+    Preparing a starting configuration for a new composition:
+        missing = library.prepare(fragment_ledger, 'start_coord.gro')
+    """
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Location to store configurations in
+    library_directory = Directory()
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Maximum `composition_distance` of a configuration that can be
+    #: used as a starting point. Not limited if zero
+    max_distance = Float(0)
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Lock protecting the index when configurations are added
+    #: concurrently
+    _lock = Any()
+
+    # --------------------
+    #      Defaults
+    # --------------------
+
+    def __lock_default(self):
+        return threading.Lock()
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _index_path(self):
+        """Returns location of library index"""
+        return os.path.join(self.library_directory, _INDEX_FILE)
+
+    def _load_index(self):
+        """Returns raw entries stored in library index"""
+        try:
+            with open(self._index_path(), 'r') as infile:
+                return json.load(infile)
+        except FileNotFoundError:
+            return []
+
+    def _save_entries(self, entries):
+        """Write index of library. The file is replaced atomically, so
+        that it is not corrupted if interrupted"""
+        index_path = self._index_path()
+        temp_path = f'{index_path}.tmp'
+        with open(temp_path, 'w') as outfile:
+            json.dump(entries, outfile, indent=2, sort_keys=True)
+        os.replace(temp_path, index_path)
+
+    def _file_name(self, composition):
+        """Returns name of file storing configuration with
+        `composition`"""
+        sha256 = hashlib.sha256(
+            json.dumps(composition, sort_keys=True).encode())
+        return f'{sha256.hexdigest()}.gro'
+
+    def _read_molecules(self, coord_file):
+        """Parse the first frame of a Gromacs coordinate file
+
+        Returns
+        -------
+        title: str
+            Title line of the frame
+        molecules: list of (str, list of str)
+            Symbol and atom lines of each molecule, in file order
+        box: str
+            Cell dimensions line of the frame
+        """
+
+        with open(coord_file, 'r') as infile:
+            title = infile.readline()
+            n_atoms = int(infile.readline())
+            atom_lines = [infile.readline() for _ in range(n_atoms)]
+            box = infile.readline()
+
+        if not box.strip():
+            raise IOError(
+                f'Gromacs coordinate file {coord_file} does not include '
+                'a complete frame')
+
+        molecules = []
+        reference = None
+        for line in atom_lines:
+            # Residue number and name occupy the first 10 columns
+            if line[:10] != reference:
+                reference = line[:10]
+                molecules.append((line[5:10].strip(), []))
+            molecules[-1][1].append(line)
+
+        return title, molecules, box
+
+    def _write_molecules(self, coord_file, title, molecules, box):
+        """Write molecules to a Gromacs coordinate file, renumbering
+        each residue and atom"""
+
+        lines = [title, f'{sum(len(atoms) for _, atoms in molecules):5d}\n']
+        atom_index = 0
+        for res_index, (_, atom_lines) in enumerate(molecules):
+            for line in atom_lines:
+                atom_index += 1
+                lines.append(
+                    f'{(res_index + 1) % 100000:5d}{line[5:15]}'
+                    f'{atom_index % 100000:5d}{line[20:]}'
+                )
+        lines.append(box)
+
+        directory = os.path.dirname(coord_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(coord_file, 'w') as outfile:
+            outfile.writelines(lines)
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def entries(self):
+        """Returns list of dictionaries describing each configuration
+        in the library, containing its `composition` and `file_path`"""
+
+        return [
+            {'composition': entry['composition'],
+             'file_path': os.path.join(
+                 self.library_directory, entry['file_name'])}
+            for entry in self._load_index()
+        ]
+
+    def add(self, fragment_ledger, coord_file):
+        """Adds a copy of an equilibrated coordinate file to the library,
+        replacing any existing configuration with the same composition
+
+        Parameters
+        ----------
+        fragment_ledger: dict of str: int
+            Number of molecules of each fragment in the configuration
+        coord_file: str
+            Path of Gromacs coordinate file
+        """
+
+        composition = dict(fragment_ledger)
+        file_name = self._file_name(composition)
+
+        os.makedirs(self.library_directory, exist_ok=True)
+
+        # Copy into place before updating the index, so that the
+        # index never refers to an incomplete file
+        temp_path = os.path.join(self.library_directory, f'{file_name}.tmp')
+        shutil.copyfile(coord_file, temp_path)
+        os.replace(temp_path, os.path.join(self.library_directory, file_name))
+
+        with self._lock:
+            entries = [
+                entry for entry in self._load_index()
+                if entry['file_name'] != file_name
+            ]
+            entries.append(
+                {'composition': composition, 'file_name': file_name})
+            self._save_entries(entries)
+
+    def nearest(self, fragment_ledger):
+        """Returns the library entry with the composition closest to
+        `fragment_ledger`, or None if the library does not contain any
+        configurations within `max_distance`. Ties are broken by the
+        closest total number of molecules."""
+
+        n_molecules = sum(fragment_ledger.values())
+
+        def sort_key(entry):
+            return (
+                composition_distance(fragment_ledger, entry['composition']),
+                abs(sum(entry['composition'].values()) - n_molecules)
+            )
+
+        entries = self.entries()
+        if not entries:
+            return None
+
+        entry = min(entries, key=sort_key)
+        distance = composition_distance(
+            fragment_ledger, entry['composition'])
+        if self.max_distance and distance > self.max_distance:
+            return None
+
+        return entry
+
+    def prepare(self, fragment_ledger, coord_file):
+        """Writes a starting configuration for a simulation containing
+        `fragment_ledger` molecules, based on the nearest configuration
+        in the library. Excess molecules are removed, and the remaining
+        molecules are written in the order of `fragment_ledger`, so that
+        they follow the `[ molecules ]` section of the topology.
+
+        Any missing molecules must be added afterwards (for instance
+        using `Gromacs_insert_molecules`), and the configuration should
+        be minimised and equilibrated before a production run.
+
+        Parameters
+        ----------
+        fragment_ledger: dict of str: int
+            Number of molecules of each fragment required
+        coord_file: str
+            Path of Gromacs coordinate file to write
+
+        Returns
+        -------
+        missing: dict of str: int or None
+            Number of molecules of each fragment that need to be added
+            to the configuration, or None if no configuration could be
+            found, in which case no file is written
+        """
+
+        entry = self.nearest(fragment_ledger)
+        if entry is None:
+            return None
+
+        title, molecules, box = self._read_molecules(entry['file_path'])
+
+        retained = []
+        missing = {}
+        for symbol, number in fragment_ledger.items():
+            available = [
+                molecule for molecule in molecules if molecule[0] == symbol
+            ]
+            retained += available[:number]
+            if len(available) < number:
+                missing[symbol] = number - len(available)
+
+        self._write_molecules(coord_file, title, retained, box)
+
+        return missing
@@ -2,7 +2,8 @@
 #  All rights reserved.
 
 import logging
-import re
+import warnings
+from itertools import chain, islice
 
 import numpy as np
 
@@ -11,9 +12,63 @@ from .base_file_reader import BaseFileReader
 log = logging.getLogger(__name__)
 
 
+class CoordinateData(dict):
+    """Dictionary of data returned by `GromacsCoordinateReader`.
+
+    The `mol_ref` and `atom_ref` keys, which listed the residue and atom
+    reference of each atom before categorical references were introduced,
+    are deprecated. They are no longer stored, but are derived from the
+    categorical references when accessed, raising a `DeprecationWarning`.
+    """
+
+    #: Deprecated keys, and the categorical codes they are derived from
+    _deprecated_keys = {'mol_ref': 'res_code', 'atom_ref': 'atom_code'}
+
+    def _is_derived(self, key):
+        """Returns whether `key` is a deprecated key that is derived
+        from the categorical references"""
+        return (not dict.__contains__(self, key)
+                and dict.__contains__(self, self._deprecated_keys.get(key)))
+
+    def _derive(self, key, stacklevel):
+        """Returns list of references for deprecated `key`, warning the
+        caller `stacklevel` frames above this method's caller"""
+        if key == 'mol_ref':
+            reference = np.char.add(
+                self['res_id'].astype(str),
+                self['res_names'][self['res_code']])
+        else:
+            reference = self['atom_names'][self['atom_code']]
+
+        warnings.warn(
+            f"The '{key}' key is deprecated and will be removed in a "
+            "future release. Use the 'res_id', 'res_code', 'res_names', "
+            "'atom_code' and 'atom_names' keys instead.",
+            DeprecationWarning, stacklevel=stacklevel + 1)
+        return reference.tolist()
+
+    def __missing__(self, key):
+        if not self._is_derived(key):
+            raise KeyError(key)
+        return self._derive(key, stacklevel=2)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or self._is_derived(key)
+
+    def get(self, key, default=None):
+        if self._is_derived(key):
+            return self._derive(key, stacklevel=2)
+        return super().get(key, default)
+
+
 class GromacsCoordinateReader(BaseFileReader):
     """Class parses Gromacs coordinate .gro file and returns
     data required for each molecular type.
+
+    Residue and atom references are stored in a categorical format:
+    each atom is assigned an integer code referring to an entry in a
+    small lookup table of unique names, so that selections can be
+    performed as vectorised operations on the codes.
     """
 
     # ------------------
@@ -35,26 +90,128 @@ class GromacsCoordinateReader(BaseFileReader):
 
     def _remove_index(self, string):
         """Remove any digits from beginning of string"""
-        return re.sub(r"^\d+", "", string)
+        return string.lstrip('0123456789')
+
+    def _get_references(self, atom_lines):
+        """Build categorical references for each atom line in a single
+        frame of a parsed Gromacs file
+
+        Parameters
+        ----------
+        atom_lines: list of str
+            Lines in coordinate file referring to each atom
+
+        Returns
+        -------
+        references: dict
+            Dictionary containing the residue id of each atom
+            (`res_id`), integer codes for the residue and atom names
+            of each atom (`res_code` and `atom_code`) and the lookup
+            tables of unique names that these codes refer to
+            (`res_names` and `atom_names`)
+        """
+
+        res_ids = []
+        res_names = []
+        atom_names = []
+
+        for line in atom_lines:
+            mol_ref, atom_ref = line.split(maxsplit=2)[:2]
+            res_name = self._remove_index(mol_ref)
+            res_id = mol_ref[:len(mol_ref) - len(res_name)]
+            res_ids.append(int(res_id or 0))
+            res_names.append(res_name)
+            atom_names.append(atom_ref)
+
+        res_names, res_code = np.unique(
+            np.array(res_names, dtype=str), return_inverse=True)
+        atom_names, atom_code = np.unique(
+            np.array(atom_names, dtype=str), return_inverse=True)
+
+        return {
+            'res_id': np.array(res_ids, dtype=np.int32),
+            'res_code': res_code.astype(np.int32),
+            'res_names': res_names,
+            'atom_code': atom_code.astype(np.int32),
+            'atom_names': atom_names
+        }
+
+    def _iter_frame_lines(self, file_lines):
+        """Generate the lines belonging to each complete frame in a
+        parsed Gromacs file. Lines are consumed lazily, so that
+        `file_lines` may be an open file stream.
+
+        Parameters
+        ----------
+        file_lines: iterable of str
+            Lines in coordinate file as strings
+
+        Yields
+        ------
+        frame_lines: list of str
+            Lines in a single frame, including the title, number of
+            atoms and cell dimension lines
+        """
+
+        file_lines = iter(file_lines)
+
+        while True:
+            header = list(islice(file_lines, 2))
+            if len(header) < 2 or header[1].isspace():
+                return
+
+            n_particles = int(header[1].strip())
+            body = list(islice(file_lines, n_particles + 1))
 
-    def _get_data(self, file_lines, n_frames=None):
+            # Ignore any incomplete frame at the end of the file
+            if len(body) < n_particles + 1:
+                return
+
+            yield header + body
+
+    def _check_indices(self, indices, n_particles):
+        """Return `indices` as an array of positions (starting at 0),
+        raising an exception if any refer to a missing atom"""
+
+        indices = np.asarray(indices, dtype=int)
+        if np.any((indices < 0) | (indices >= n_particles)):
+            raise IndexError(
+                'Atom selection is out of range for a coordinate '
+                f'file containing {n_particles} atoms')
+        return indices
+
+    def _parse_frame(self, frame_lines, indices):
+        """Return the coordinates of atoms at positions `indices`
+        and cell dimensions in a single frame"""
+
+        coordinates = np.array(
+            [frame_lines[2 + index].split()[3:6] for index in indices],
+            dtype=float
+        ).reshape(-1, 3)
+
+        dimensions = np.array(frame_lines[-1].split()[:3], dtype=float)
+
+        return coordinates, dimensions
+
+    def _get_data(self, file_lines, n_frames=None, indices=None):
         """Process data from a parsed Gromacs file
 
         Parameters
         ----------
-        file_path: str
-            File path of Gromacs coordinate file
+        file_lines: iterable of str
+            Lines in coordinate file as strings. May be an open
+            file stream, which will be consumed frame by frame
         n_frames: int, optional
             Maximum number of frames to read
+        indices: array_like of int, optional
+            Positions (starting at 0) of atoms in each frame to
+            parse. If not specified, all atoms are parsed.
 
         Returns
         -------
-        mol_ref: list of str
-            Reference symbols for each molecular species in a single
-            frame
-        atom_ref: list of str
-            Reference symbols for each atomic species in a single
-            frame
+        references: dict
+            Categorical residue and atom references for each atom
+            in a single frame (see `_get_references`)
         coordinates: array_like of float
             Array with shape (n_frames, n_atoms, 3) containing
             all atomic coordinates in 3 dimensions for each frame
@@ -63,43 +220,147 @@ class GromacsCoordinateReader(BaseFileReader):
             cell dimensions for each frame
         """
 
+        references = None
+        coordinates = []
+        dimensions = []
+
+        frames = self._iter_frame_lines(file_lines)
+        if n_frames is not None:
+            # References are read from the first frame, even if no
+            # frames are required
+            frames = islice(frames, max(n_frames, 1))
+
+        for frame_lines in frames:
+
+            if references is None:
+                n_particles = len(frame_lines) - 3
+                if indices is None:
+                    indices = range(n_particles)
+                else:
+                    indices = self._check_indices(indices, n_particles)
+
+                # Only lines of selected atoms are split, so that the
+                # unwanted atoms are never converted into floats
+                references = self._get_references(
+                    [frame_lines[2 + index] for index in indices])
+
+            if n_frames == 0:
+                break
+
+            frame_coord, frame_dim = self._parse_frame(
+                frame_lines, indices)
+            coordinates.append(frame_coord)
+            dimensions.append(frame_dim)
+
+        if references is None:
+            raise IOError(
+                'Gromacs coordinate file does not include any'
+                ' complete frames'
+            )
+
+        return (references,
+                np.array(coordinates, dtype=float).reshape(
+                    len(coordinates), len(indices), 3),
+                np.array(dimensions, dtype=float).reshape(
+                    len(dimensions), 3))
+
+    def _peek_frame(self, file_lines):
+        """Return the lines of the first frame in a parsed Gromacs
+        file, together with an iterator over all file lines that
+        includes them"""
+
+        file_lines = iter(file_lines)
+
+        first_frame = list(islice(file_lines, 2))
+        if len(first_frame) == 2:
+            first_frame += list(
+                islice(file_lines, int(first_frame[1].strip()) + 1))
+
+        return first_frame, chain(first_frame, file_lines)
+
+    def _select_atoms(self, file_lines, symbols=None, atoms=None,
+                      indices=None):
+        """Resolve an atom selection using the first frame of a parsed
+        Gromacs file, so that it can be applied whilst parsing every
+        subsequent frame
+
+        Parameters
+        ----------
+        file_lines: list of str
+            List containing lines in coordinate file as strings. Only
+            the first frame is required
+        symbols: list of str, optional
+            Symbols corresponding to molecular species to select
+        atoms: list of str, optional
+            Symbols corresponding to atomic species to select
+        indices: array_like of int, optional
+            Positions (starting at 0) of atoms in each frame to select
+
+        Returns
+        -------
+        selection: array_like of int or None
+            Positions (starting at 0) of atoms meeting all selection
+            criteria, or None if no criteria were provided
+        """
+
+        if symbols is None and atoms is None and indices is None:
+            return None
+
         n_particles = int(file_lines[1].strip())
-        n_lines = n_particles + 3
+        mask = np.ones(n_particles, dtype=bool)
 
-        if n_frames is None:
-            n_frames = len(file_lines) // n_lines
+        if symbols is not None or atoms is not None:
+            # Only the reference columns of the first frame are needed
+            references = self._get_references(
+                file_lines[2: n_particles + 2])
 
-        mol_ref = []
-        atom_ref = []
-        dimensions = np.zeros((n_frames, 3))
-        coordinates = np.zeros((n_frames, n_particles, 3))
+            if symbols is not None:
+                selected = np.zeros(n_particles, dtype=bool)
+                selected[self.extract_molecules(references, symbols)] = True
+                mask &= selected
 
-        for frame in range(n_frames):
-            start = frame * n_lines + 2
-            end = (frame + 1) * n_lines
+            if atoms is not None:
+                selected = np.zeros(n_particles, dtype=bool)
+                selected[self.extract_atoms(references, atoms)] = True
+                mask &= selected
 
-            for index, line in enumerate(file_lines[start: end]):
+        if indices is not None:
+            indices = self._check_indices(indices, n_particles)
+            selected = np.zeros(n_particles, dtype=bool)
+            selected[indices] = True
+            mask &= selected
 
-                line = line.split()
+        return np.flatnonzero(mask)
 
-                if index == n_particles:
-                    coord = np.array([float(line[0]),
-                                      float(line[1]),
-                                      float(line[2])])
-                    dimensions[frame] = coord
+    def _extract_codes(self, codes, names, symbols):
+        """Return indices of entries in codes that refer to an entry
+        in names listed in symbols"""
 
-                else:
-                    if frame == 0:
-                        mol_ref.append(line[0])
-                        atom_ref.append(line[1])
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
+        selected_codes = np.flatnonzero(np.isin(names, symbols))
+
+        return np.flatnonzero(np.isin(codes, selected_codes))
+
+    def _legacy_codes(self, data, key):
+        """Return categorical codes and names for the deprecated
+        `mol_ref` or `atom_ref` references of each atom in data"""
+
+        warnings.warn(
+            f"Selecting atoms using the '{key}' key is deprecated and "
+            "will be removed in a future release. Use data returned by "
+            "`read` or `iter_frames` instead.",
+            DeprecationWarning, stacklevel=3)
 
-                    coord = np.array([float(line[3]),
-                                      float(line[4]),
-                                      float(line[5])])
+        references = data[key]
+        if key == 'mol_ref':
+            references = [self._remove_index(ref) for ref in references]
 
-                    coordinates[frame, index] = coord
+        names, codes = np.unique(
+            np.array(references, dtype=str), return_inverse=True)
 
-        return mol_ref, atom_ref, coordinates, dimensions
+        return codes, names
 
     # ------------------
     #   Public Methods
@@ -111,32 +372,114 @@ class GromacsCoordinateReader(BaseFileReader):
 
         Parameters
         ---------
-        mol_ref: list of str
-            Reference symbols for each molecular species in a single
-            frame
+        data: dict
+            Dictionary containing the `res_code` and `res_names`
+            categorical references for each atom in a single frame.
+            Dictionaries containing only the deprecated `mol_ref`
+            references are also accepted
         symbols: list of str
             List of molecular symbols for each group required to be
             returned
 
         Returns
         -------
-        indices: list of int
-            List of indexes corresponding to entries in mol_ref that
-            refer to molecules of the types listed in symbols
+        indices: array_like of int
+            Array of indexes corresponding to atoms that belong to
+            molecules of the types listed in symbols
         """
 
-        indices = []
+        if 'res_code' not in data:
+            return self._extract_codes(
+                *self._legacy_codes(data, 'mol_ref'), symbols)
 
-        if isinstance(symbols, str):
-            symbols = [symbols]
+        return self._extract_codes(
+            data['res_code'], data['res_names'], symbols)
 
-        for index, ref in enumerate(data['mol_ref']):
-            if self._remove_index(ref) in symbols:
-                indices.append(index)
+    def extract_atoms(self, data, atoms):
+        """Return coordinates of atoms that posses a symbol
+        listed in atoms list
 
-        return indices
+        Parameters
+        ---------
+        data: dict
+            Dictionary containing the `atom_code` and `atom_names`
+            categorical references for each atom in a single frame.
+            Dictionaries containing only the deprecated `atom_ref`
+            references are also accepted
+        atoms: list of str
+            List of atomic symbols for each group required to be
+            returned
 
-    def read(self, file_path, n_frames=None, symbols=None):
+        Returns
+        -------
+        indices: array_like of int
+            Array of indexes corresponding to atoms of the types
+            listed in atoms
+        """
+
+        if 'atom_code' not in data:
+            return self._extract_codes(
+                *self._legacy_codes(data, 'atom_ref'), atoms)
+
+        return self._extract_codes(
+            data['atom_code'], data['atom_names'], atoms)
+
+    def iter_frames(self, file_path, n_frames=None, symbols=None,
+                    atoms=None, indices=None):
+        """ Open Gromacs coordinate file located at `file_path` and
+        generate processed data for each frame in turn, so that only a
+        single frame is held in memory at any time. Compressed files
+        are decompressed as a stream.
+
+        Parameters
+        ----------
+        file_path: str
+            File path of Gromacs coordinate file
+        n_frames: int, optional
+            Maximum number of frames to read
+        symbols: list of str, optional
+            Symbols corresponding to molecular species to extract
+        atoms: list of str, optional
+            Symbols corresponding to atomic species to extract
+        indices: array_like of int, optional
+            Gromacs atom indices (starting at 1) to extract
+
+        Yields
+        ------
+        data : CoordinateData
+            Dictionary containing categorical residue and atom
+            references, as returned by `read`, as well as atomic
+            coordinates (`coord`) with shape (n_atoms, 3) and cell
+            dimensions (`dim`) with shape (3,) for a single frame
+        """
+
+        if indices is not None:
+            indices = np.asarray(indices, dtype=int) - 1
+
+        with self._open_file(file_path) as infile:
+            first_frame, file_lines = self._peek_frame(infile)
+            selection = self._select_atoms(
+                first_frame, symbols=symbols, atoms=atoms,
+                indices=indices)
+            if selection is None:
+                selection = range(len(first_frame) - 3)
+
+            references = self._get_references(
+                [first_frame[2 + index] for index in selection])
+
+            frames = islice(self._iter_frame_lines(file_lines), n_frames)
+            for frame_lines in frames:
+                coordinates, dimensions = self._parse_frame(
+                    frame_lines, selection)
+                data = CoordinateData(
+                    coord=coordinates,
+                    dim=dimensions,
+                )
+                data.update(references)
+                yield data
+
+    def read(self, file_path, n_frames=None, symbols=None, atoms=None,
+             indices=None):
         """ Open Gromacs coordinate file located at `file_path` and return
          processed data
 
@@ -150,41 +493,58 @@ class GromacsCoordinateReader(BaseFileReader):
             Symbols corresponding to molecular species to extract. If
             not specfified, all molecular groups present will be
             returned
+        atoms: list of str, optional
+            Symbols corresponding to atomic species to extract. If
+            not specfified, all atomic species present will be
+            returned
+        indices: array_like of int, optional
+            Gromacs atom indices (starting at 1) to extract, as stored
+            in each group of a Gromacs index file. If not specified,
+            all atoms present will be returned
 
         Returns
         -------
-        data : dict
-            Dictionary containing data (including molecule and atom
-            references, and atomic coordinates) extracted from Gromacs
-            coordinate file. Keys refer to the symbol of each
-            molecular species.
+        data : CoordinateData
+            Dictionary containing data extracted from Gromacs
+            coordinate file. Includes categorical residue and
+            atom references (`res_id`, `res_code`, `res_names`,
+            `atom_code` and `atom_names`), atomic coordinates
+            (`coord`) and cell dimensions (`dim`). The deprecated
+            `mol_ref` and `atom_ref` keys are derived on access.
+
+        Notes
+        -----
+        All selection criteria are resolved on the first frame and
+        combined, so that only atoms meeting every criterion are
+        parsed in each frame.
         """
 
+        if indices is not None:
+            indices = np.asarray(indices, dtype=int) - 1
+
         try:
-            file_lines = self._read_file(file_path)
+            infile = self._open_file(file_path)
         except IOError as e:
             log.exception('unable to open "{}"'.format(file_path))
             raise e
 
-        try:
-            (mol_ref, atom_ref,
-             coordinates, dimensions) = self._get_data(file_lines, n_frames)
-        except (IndexError, IOError) as e:
-            log.exception('unable to load data from "{}"'.format(file_path))
-            raise e
-
-        data = {
-            'mol_ref': mol_ref,
-            'atom_ref': atom_ref,
-            'coord': coordinates,
-            'dim': dimensions,
-        }
-
-        if symbols is not None:
-            indices = self.extract_molecules(data, symbols)
-
-            data['mol_ref'] = [data['mol_ref'][index] for index in indices]
-            data['atom_ref'] = [data['atom_ref'][index] for index in indices]
-            data['coord'] = data['coord'][:, indices]
+        with infile:
+            try:
+                first_frame, file_lines = self._peek_frame(infile)
+                selection = self._select_atoms(
+                    first_frame, symbols=symbols, atoms=atoms,
+                    indices=indices)
+                references, coordinates, dimensions = self._get_data(
+                    file_lines, n_frames, selection)
+            except (IndexError, IOError) as e:
+                log.exception(
+                    'unable to load data from "{}"'.format(file_path))
+                raise e
+
+        data = CoordinateData(
+            coord=coordinates,
+            dim=dimensions,
+        )
+        data.update(references)
 
         return data
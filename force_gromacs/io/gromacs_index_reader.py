@@ -0,0 +1,120 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import logging
+
+import numpy as np
+
+from .base_file_reader import BaseFileReader
+
+log = logging.getLogger(__name__)
+
+
+class GromacsIndexReader(BaseFileReader):
+    """Class parses Gromacs index (.ndx) file and returns the atom
+    indices belonging to each group listed.
+    """
+
+    # ------------------
+    #     Defaults
+    # ------------------
+
+    def __ext_default(self):
+        """Default extension for this reader subclass"""
+        return 'ndx'
+
+    def __comment_default(self):
+        """Default file comment character for this reader subclass"""
+        return ';'
+
+    # ------------------
+    #  Private Methods
+    # ------------------
+
+    def _parse_group_name(self, line):
+        """Return name of group if line is a group header, otherwise
+        return None"""
+        line = line.strip()
+        if line.startswith('[') and line.endswith(']'):
+            return line[1:-1].strip()
+        return None
+
+    def _get_data(self, file_lines):
+        """Process data from a parsed Gromacs index file
+
+        Parameters
+        ----------
+        file_lines : list of str
+            List containing lines in index file as strings
+
+        Returns
+        -------
+        groups : dict of str: array_like of int
+            Dictionary with group names as keys and arrays of
+            Gromacs atom indices (starting at 1) as values
+        """
+
+        group_names = map(self._parse_group_name, file_lines)
+        headers = [
+            (index, name) for index, name in enumerate(group_names)
+            if name is not None
+        ]
+
+        if not headers:
+            raise IOError(
+                'Gromacs index file does not include any groups'
+            )
+
+        groups = {}
+        end_indices = [index for index, _ in headers[1:]] + [None]
+
+        for (start, name), end in zip(headers, end_indices):
+            # Parse all indices in the group with a single pass,
+            # rather than converting each entry separately
+            group_text = ' '.join(file_lines[start + 1:end])
+            try:
+                groups[name] = np.array(group_text.split(), dtype=np.int32)
+            except ValueError:
+                raise IOError(
+                    f"Gromacs index file contains invalid atom indices "
+                    f"in group '{name}'"
+                )
+
+        return groups
+
+    # ------------------
+    #   Public Methods
+    # ------------------
+
+    def read(self, file_path):
+        """ Open Gromacs index file located at `file_path` and return
+        processed data
+
+        Parameters
+        ----------
+        file_path : str
+            File path of Gromacs index file
+
+        Returns
+        -------
+        groups : dict of str: array_like of int
+            Dictionary containing the Gromacs atom indices (starting
+            at 1) for each group in the index file. Keys refer to the
+            name of each group.
+        """
+
+        try:
+            file_lines = self._read_file(file_path)
+        except IOError as e:
+            log.exception('unable to open "{}"'.format(file_path))
+            raise e
+
+        file_lines = self._remove_comments(file_lines)
+
+        try:
+            groups = self._get_data(file_lines)
+        except Exception as e:
+            log.exception('unable to load data from "{}"'.format(file_path))
+            raise e
+
+        return groups
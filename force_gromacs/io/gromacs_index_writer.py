@@ -0,0 +1,133 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+
+import numpy as np
+
+from traits.api import (
+    HasTraits, Directory, Str, Dict, Array, Bool, provides
+)
+
+from force_gromacs.core.i_process import IProcess
+
+
+@provides(IProcess)
+class GromacsIndexWriter(HasTraits):
+    """Class writes Gromacs index file"""
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Dictionary with group names as keys and arrays of Gromacs
+    #: atom indices (starting at 1) as values
+    groups = Dict(Str, Array)
+
+    # ------------------------------
+    #  Required / Regular Attributes
+    # ------------------------------
+
+    #: Location to create index file in. If not provided,
+    #: a default value including sim_name attribute will be used.
+    directory = Directory()
+
+    #: Name of the Gromacs index file to be created. If not provided,
+    #: a default value including sim_name attribute will be used.
+    ndx_name = Str()
+
+    #: Reference name for the Gromacs simulation. Can be used to define
+    #: default values of directory and ndx_name attributes
+    sim_name = Str()
+
+    #: Whether or not to perform a 'dry run' i.e. build the file
+    #: contents but do not write them
+    dry_run = Bool(True)
+
+    #: Number of indices written on each line, following the
+    #: formatting used by Gromacs tools
+    _line_length = 15
+
+    # ------------------
+    #      Defaults
+    # ------------------
+
+    def _directory_default(self):
+        """If directory is not defined, use current directory
+        with sim_name as default directory"""
+        return os.path.join(os.path.curdir, self.sim_name)
+
+    def _ndx_name_default(self):
+        """If index file name is not defined, use sim_name with
+        .ndx extension as default file name"""
+        return f"{self.sim_name}_index.ndx"
+
+    # --------------------
+    #    Private Methods
+    # --------------------
+
+    def _format_group(self, indices):
+        """Format an array of indices as lines of fixed width columns"""
+        indices = np.asarray(indices, dtype=np.int32)
+        lines = []
+        for start in range(0, indices.size, self._line_length):
+            chunk = indices[start:start + self._line_length]
+            lines.append(' '.join(f'{index:4d}' for index in chunk))
+        return '\n'.join(lines)
+
+    def _create_index_file(self):
+        """Builds human readable index file for Gromacs tools"""
+
+        ndx_file = ""
+
+        for name, indices in self.groups.items():
+            ndx_file += f'[ {name} ]\n'
+            if len(indices) > 0:
+                ndx_file += self._format_group(indices) + '\n'
+
+        return ndx_file
+
+    # ------------------
+    #   Public Methods
+    # ------------------
+
+    def recall_stderr(self):
+        """Returns dummy stderr message"""
+        return ''
+
+    def recall_stdout(self):
+        """Returns dummy stdout message"""
+        return ''
+
+    def input_files(self):
+        """Returns empty list, since no input files are required"""
+        return []
+
+    def output_files(self):
+        """Returns list containing the file written by `run`"""
+        return [f'{self.directory}/{self.ndx_name}']
+
+    def bash_script(self):
+        """Output terminal command as a bash script"""
+
+        ndx_file = self._create_index_file()
+
+        bash_script = (
+            f"cat <<EOM > {self.directory}/{self.ndx_name}"
+            f"\n{ndx_file}EOM"
+        )
+
+        return bash_script
+
+    def run(self):
+        """Writes a human readable index file for Gromacs tools"""
+
+        ndx_file = self._create_index_file()
+
+        if not self.dry_run:
+            with open(f'{self.directory}/{self.ndx_name}',
+                      'w') as outfile:
+                outfile.write(ndx_file)
+
+        # Provide successful return code
+        return 0
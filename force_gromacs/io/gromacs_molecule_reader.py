@@ -1,20 +1,49 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import copy
 import logging
 
+from traits.api import Bool, Instance
+
 from force_gromacs.chemicals.gromacs_fragment import GromacsFragment
-from force_gromacs.chemicals.gromacs_particle import GromacsParticle
+from force_gromacs.chemicals.particle_table import ParticleTable
 
 from .base_file_reader import BaseFileReader
+from .gromacs_topology_preprocessor import GromacsTopologyPreprocessor
+from .parsed_file_cache import ParsedFileCache
 
 log = logging.getLogger(__name__)
 
+#: Process-wide cache of fragments parsed from each molecule file,
+#: shared between all GromacsMoleculeReader instances
+_fragment_cache = ParsedFileCache(maxsize=64)
+
 
 class GromacsMoleculeReader(BaseFileReader):
     """Class parses Gromacs molecule topology (.itp) file and
     returns data required for each molecular type listed.
+
+    Parsed files are stored in a process-wide cache, so that repeated
+    reads of an unchanged file return copies of the cached fragments
+    rather than parsing the file again. Single molecule types can also
+    be read using `read_symbol`, which only parses the relevant section
+    of the file.
+
+    Preprocessor directives (`#include`, `#ifdef` etc.) are resolved
+    by the `preprocessor` attribute before each file is parsed.
     """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Whether or not to use the process-wide cache of parsed files
+    use_cache = Bool(True)
+
+    #: Preprocessor used to resolve included files and defined macros
+    preprocessor = Instance(GromacsTopologyPreprocessor, ())
+
     # ------------------
     #     Defaults
     # ------------------
@@ -31,19 +60,34 @@ class GromacsMoleculeReader(BaseFileReader):
     #  Private Methods
     # ------------------
 
-    def _remove_comments(self, file_lines):
-        """If any in-line comments exists, then truncate
-        line at point of comment"""
+    def _parse_directive(self, line):
+        """Return the name of the directive if line opens a new section
+        of the file (i.e. '[ atoms ]'), otherwise return None"""
+        line = line.strip()
+        if line.startswith('[') and line.endswith(']'):
+            return line[1:-1].strip().lower()
+        return None
+
+    def _get_molecule_indices(self, file_lines):
+        """Return indices of lines that begin each molecule type
+        section in the file"""
 
-        file_lines = super()._remove_comments(file_lines)
+        mol_indices = [
+            index for index, line in enumerate(file_lines)
+            if self._parse_directive(line) == 'moleculetype'
+        ]
 
-        file_lines = [line.split(self._comment)[0].strip()
-                      for line in file_lines]
+        if len(mol_indices) == 0:
+            raise IOError(
+                'Gromacs topology file does not include any'
+                ' molecule types'
+            )
 
-        return file_lines
+        return mol_indices
 
-    def _get_molecule_sections(self, file_lines):
-        """ Find file location and molecule type of each section
+    def _get_molecule_offsets(self, file_lines):
+        """ Index the file location of each molecule type section,
+        without parsing the contents
 
         Parameters
         ----------
@@ -52,31 +96,24 @@ class GromacsMoleculeReader(BaseFileReader):
 
         Returns
         -------
-        mol_sections : list of str
-            List containing relevant lines of topology file for
-            each molecule in self.symbols
+        mol_offsets : dict of str: tuple of int
+            Dictionary containing the start and end indices of lines
+            in the topology file referring to each molecule type. Keys
+            refer to the symbol of each molecule type.
         """
 
-        # Get indices for beginning of sections of all molecule types
-        # in topology
-        mol_indices = [index for index, line in enumerate(file_lines)
-                       if "moleculetype" in line]
+        mol_indices = self._get_molecule_indices(file_lines)
 
-        if len(mol_indices) == 0:
-            raise IOError(
-                'Gromacs topology file does not include any'
-                ' molecule types'
-            )
-        mol_sections = []
+        mol_offsets = {}
         start_indices = mol_indices
-        end_indices = mol_indices[1:] + [None]
+        end_indices = mol_indices[1:] + [len(file_lines)]
 
-        # Extract the relevant lines in the topology file that correspond
-        # to each molecule
         for start, end in zip(start_indices, end_indices):
-            mol_sections.append(file_lines[start:end])
+            symbol = file_lines[start + 1].split()[0]
+            # Gromacs uses the first definition of any molecule type
+            mol_offsets.setdefault(symbol, (start, end))
 
-        return mol_sections
+        return mol_offsets
 
     def _parse_line(self, line):
         """Separate each value from the line"""
@@ -109,8 +146,69 @@ class GromacsMoleculeReader(BaseFileReader):
 
         return atom_1, atom_2
 
+    def _parse_angle_line(self, line):
+        """Parse line in gromacs molecule file that refers to angle
+        between three atoms"""
+        file_line = self._parse_line(line)
+
+        return tuple(int(index) for index in file_line[:3])
+
+    def _parse_dihedral_line(self, line):
+        """Parse line in gromacs molecule file that refers to dihedral
+        angle between four atoms"""
+        file_line = self._parse_line(line)
+
+        return tuple(int(index) for index in file_line[:4])
+
+    def _parse_constraint_line(self, line):
+        """Parse line in gromacs molecule file that refers to
+        constraint between two atoms"""
+        file_line = self._parse_line(line)
+
+        return int(file_line[0]), int(file_line[1])
+
+    def _handle_atom_line(self, data, line):
+        """Add particle referred to in line to fragment data"""
+        (_, element, _, at_label,
+         at_index, charge, mass) = self._parse_atom_line(line)
+        data['particles'].append(
+            (at_index, at_label, element, mass, charge)
+        )
+
+    def _handle_bond_line(self, data, line):
+        """Add bond referred to in line to fragment data"""
+        data['bonds'].append(self._parse_bond_line(line))
+
+    def _handle_angle_line(self, data, line):
+        """Add angle referred to in line to fragment data"""
+        data['angles'].append(self._parse_angle_line(line))
+
+    def _handle_dihedral_line(self, data, line):
+        """Add dihedral referred to in line to fragment data"""
+        data['dihedrals'].append(self._parse_dihedral_line(line))
+
+    def _handle_constraint_line(self, data, line):
+        """Add constraint referred to in line to fragment data"""
+        data['constraints'].append(self._parse_constraint_line(line))
+
+    def _line_handlers(self):
+        """Return a dictionary containing the method used to process
+        each line in a section of a molecule type, keyed by the name
+        of the section directive. Lines in sections without a handler
+        are ignored."""
+        return {
+            'atoms': self._handle_atom_line,
+            'bonds': self._handle_bond_line,
+            'angles': self._handle_angle_line,
+            'dihedrals': self._handle_dihedral_line,
+            'constraints': self._handle_constraint_line
+        }
+
     def _get_data(self, file_lines):
         """ Load data for each target molecule type in Gromacs topology
+        using a single pass through the file. The current section
+        directive is tracked, and each line is dispatched to the
+        relevant handler for that section.
 
         Parameters
         ----------
@@ -123,60 +221,164 @@ class GromacsMoleculeReader(BaseFileReader):
             List of GromacsFragment instances representing molecular fragment
         """
 
-        mol_sections = self._get_molecule_sections(file_lines)
-
-        fragments = []
-
-        for section in mol_sections:
-
-            # Get symbols that correspond to each molecule type
-            symbol = section[1].split()[0]
-
-            fragment = GromacsFragment(symbol=symbol)
-
-            # Find file location of atom list for target molecule
-            atom_indices = [index + 1 for index, line
-                            in enumerate(section) if "atoms" in line]
-
-            # Read the name, charge and mass of each atom/bead, which should
-            # be included at indices 4, 6 and 7 respectively
-            for atoms_index in atom_indices:
-                for line in section[atoms_index:]:
-                    if line.startswith('['):
-                        break
-                    else:
-                        (_, element, _, at_label,
-                         at_index, charge, mass) = self._parse_atom_line(line)
-                        fragment.particles.append(
-                            GromacsParticle(
-                                index=at_index,
-                                id=at_label,
-                                element=element,
-                                charge=charge,
-                                mass=mass)
-                        )
-
-            # Find file location of atom list for target molecule
-            bond_indices = [index + 1 for index, line
-                            in enumerate(section) if "bonds" in line]
-
-            # Read the atom indices of each bond
-            for bonds_index in bond_indices:
-                for line in section[bonds_index:]:
-                    if line.startswith('['):
-                        break
-                    else:
-                        bond = self._parse_bond_line(line)
-                        fragment.bonds.append(bond)
-
-            fragments.append(fragment)
+        handlers = self._line_handlers()
+        mol_data = []
+        data = None
+        directive = None
+
+        for line in file_lines:
+
+            new_directive = self._parse_directive(line)
+            if new_directive is not None:
+                directive = new_directive
+                if directive == 'moleculetype':
+                    data = None
+                continue
+
+            if directive == 'moleculetype':
+                # First line of section contains the symbol that
+                # corresponds to each molecule type
+                if data is None:
+                    data = {
+                        'symbol': line.split()[0],
+                        'particles': [],
+                        'bonds': [],
+                        'angles': [],
+                        'dihedrals': [],
+                        'constraints': []
+                    }
+                    mol_data.append(data)
+
+            # Ignore any sections outside of a molecule type
+            elif data is not None and directive in handlers:
+                handlers[directive](data, line)
+
+        if len(mol_data) == 0:
+            raise IOError(
+                'Gromacs topology file does not include any'
+                ' molecule types'
+            )
+
+        # Particles are stored in a compact table, to avoid creating
+        # an object for each particle
+        for data in mol_data:
+            data['particle_table'] = ParticleTable.from_records(
+                data.pop('particles'))
+
+        fragments = [GromacsFragment(**data) for data in mol_data]
 
         return fragments
 
+    def _load_file(self, file_path):
+        """Open Gromacs topology file located at `file_path` and return
+        preprocessed lines with comments removed, together with the
+        paths of all files that were included"""
+
+        self._check_file_types(file_path)
+
+        try:
+            file_lines, include_files = self.preprocessor.process(
+                file_path)
+        except IOError as e:
+            log.exception('unable to open "{}"'.format(file_path))
+            raise e
+
+        return file_lines, include_files
+
+    def _parse_file(self, file_path):
+        """Open and parse Gromacs topology file located at `file_path`,
+        bypassing the cache. Also returns the paths of all files that
+        were included."""
+
+        file_lines, include_files = self._load_file(file_path)
+
+        try:
+            fragments = self._get_data(file_lines)
+        except Exception as e:
+            log.exception('unable to load data from "{}"'.format(file_path))
+            raise e
+
+        for fragment in fragments:
+            fragment.topology = file_path
+
+        return fragments, include_files
+
+    def _index_file(self, file_path):
+        """Open Gromacs topology file located at `file_path` and return
+        lines with comments removed, together with the location of each
+        molecule type section, bypassing the cache. Also returns the
+        paths of all files that were included."""
+
+        file_lines, include_files = self._load_file(file_path)
+
+        try:
+            mol_offsets = self._get_molecule_offsets(file_lines)
+        except Exception as e:
+            log.exception('unable to load data from "{}"'.format(file_path))
+            raise e
+
+        return (file_lines, mol_offsets), include_files
+
+    def _include_keys(self, include_files):
+        """Return cache keys for each file in `include_files`, or None
+        if any of the files no longer exist"""
+        try:
+            return [_fragment_cache.file_key(include_file)
+                    for include_file in include_files]
+        except OSError:
+            return None
+
+    def _cached(self, file_path, loader, tag):
+        """Return result of `loader(file_path)`, using the process-wide
+        cache to avoid reloading unchanged files if required. The `tag`
+        distinguishes different types of cached result for each file.
+        Cached results are only returned if none of the files included
+        by `file_path` have changed since they were loaded."""
+
+        if not self.use_cache:
+            value, _ = loader(file_path)
+            return value
+
+        try:
+            key = _fragment_cache.file_key(
+                file_path, tag, self.preprocessor.cache_key())
+        except OSError:
+            # Let the loader report missing files
+            value, _ = loader(file_path)
+            return value
+
+        entry = _fragment_cache.get(key)
+        if entry is not None:
+            value, include_keys = entry
+            if self._include_keys(
+                    [include_key[0] for include_key in include_keys]
+            ) == include_keys:
+                return value
+
+        value, include_files = loader(file_path)
+        include_keys = self._include_keys(include_files)
+        if include_keys is not None:
+            _fragment_cache.put(key, (value, include_keys))
+
+        return value
+
     # ------------------
     #   Public Methods
     # ------------------
 
+    @staticmethod
+    def cache_info():
+        """Return a dictionary containing the number of hits and misses
+        of the process-wide cache of parsed files, as well as its
+        current and maximum size"""
+        return _fragment_cache.info()
+
+    @staticmethod
+    def cache_clear():
+        """Empty the process-wide cache of parsed files and reset
+        its counters"""
+        _fragment_cache.clear()
+
     def read(self, file_path):
         """ Open Gromacs topology file located at `file_path` and return
          processed data
@@ -188,28 +390,62 @@ class GromacsMoleculeReader(BaseFileReader):
 
         Returns
         -------
-        data : dict
-            Dictionary containing data (including constituent atoms, mass
-            and charge) extracted from Gromacs topology file. Keys refer
-            to the symbol of each
-            molecular species.
+        fragments : list of GromacsFragment
+            List of GromacsFragment instances representing each
+            molecular species in the topology file. These are always
+            new instances, even if the file has been parsed before.
         """
 
-        try:
-            file_lines = self._read_file(file_path)
-        except IOError as e:
-            log.exception('unable to open "{}"'.format(file_path))
-            raise e
+        fragments = self._cached(file_path, self._parse_file, 'fragments')
+
+        fragments = copy.deepcopy(fragments)
+        for fragment in fragments:
+            fragment.topology = file_path
+
+        return fragments
 
-        file_lines = self._remove_comments(file_lines)
+    def read_symbol(self, file_path, symbol):
+        """ Open Gromacs topology file located at `file_path` and return
+        processed data for a single molecule type. The location of each
+        molecule type in the file is indexed once, so that only the
+        section referring to `symbol` is parsed.
+
+        Parameters
+        ----------
+        file_path : str
+            File path of Gromacs topology file
+        symbol : str
+            Symbol of the molecule type to return
+
+        Returns
+        -------
+        fragment : GromacsFragment
+            New GromacsFragment instance representing the molecular
+            species with the given symbol
+
+        Raises
+        ------
+        KeyError
+            If no molecule type with the given symbol is present
+            in the topology file
+        """
+
+        file_lines, mol_offsets = self._cached(
+            file_path, self._index_file, 'index')
 
         try:
-            fragments = self._get_data(file_lines)
+            start, end = mol_offsets[symbol]
+        except KeyError:
+            raise KeyError(
+                f'Molecule type {symbol} is not included in '
+                f'Gromacs topology file {file_path}')
+
+        try:
+            fragment, = self._get_data(file_lines[start:end])
         except Exception as e:
             log.exception('unable to load data from "{}"'.format(file_path))
             raise e
 
-        for fragment in fragments:
-            fragment.topology = file_path
+        fragment.topology = file_path
 
-        return fragments
+        return fragment
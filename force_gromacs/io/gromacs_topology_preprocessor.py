@@ -0,0 +1,272 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+
+from traits.api import Bool, Dict, Directory, List, Str
+
+from .base_file_reader import BaseFileReader
+from .parsed_file_cache import ParsedFileCache
+
+#: Process-wide cache of lines read from each topology file, with
+#: comments removed. Shared between all GromacsTopologyPreprocessor
+#: instances, so that force field files included by many topologies
+#: are only read once.
+_include_cache = ParsedFileCache(maxsize=256)
+
+
+class GromacsTopologyPreprocessor(BaseFileReader):
+    """Class resolves C preprocessor directives in Gromacs topology
+    (.top or .itp) files, following the behaviour of `gmx grompp`.
+    The `#include`, `#define`, `#undef`, `#ifdef`, `#ifndef`, `#else`
+    and `#endif` directives are supported.
+
+    Included files are searched for in the directory of the including
+    file, then in each of `include_dirs`, and finally in each directory
+    listed in the GMXLIB environment variable.
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Additional directories to search for included files
+    include_dirs = List(Directory)
+
+    #: Macros defined before processing each file (equivalent to the
+    #: `define` option in a Gromacs .mdp file). Keys refer to the
+    #: macro name and values to its substitution, which may be empty.
+    defines = Dict(Str, Str)
+
+    #: Whether or not to use the process-wide cache of file lines
+    use_cache = Bool(True)
+
+    # ------------------
+    #     Defaults
+    # ------------------
+
+    def __ext_default(self):
+        """Default extension for this reader subclass"""
+        return 'top'
+
+    def __comment_default(self):
+        """Default file comment character for this reader subclass"""
+        return ';'
+
+    # ------------------
+    #  Private Methods
+    # ------------------
+
+    def _check_file_types(self, file_path):
+        """Raise exception if file is neither a Gromacs .top or
+        .itp file"""
+
+        uncompressed_path, _ = self._split_compression(file_path)
+
+        space_check = file_path.isspace()
+        ext_check = not uncompressed_path.endswith(('.top', '.itp'))
+
+        if space_check or ext_check:
+            raise IOError(
+                '{} not a valid Gromacs file type'.format(
+                    file_path))
+
+    def _remove_comments(self, file_lines):
+        """Join any continued lines, then remove comments and
+        whitespace lines"""
+
+        joined_lines = []
+        continued = ''
+        for line in file_lines:
+            line = line.rstrip()
+            if line.endswith('\\'):
+                continued += line[:-1] + ' '
+                continue
+            joined_lines.append(continued + line)
+            continued = ''
+        if continued:
+            joined_lines.append(continued)
+
+        file_lines = super()._remove_comments(joined_lines)
+
+        file_lines = [line.split(self._comment)[0].strip()
+                      for line in file_lines]
+
+        return [line for line in file_lines if line]
+
+    def _load_file(self, file_path):
+        """Return lines from file located at `file_path` with comments
+        removed, using the process-wide cache if required"""
+
+        if not self.use_cache:
+            return self._remove_comments(self._read_file(file_path))
+
+        try:
+            key = _include_cache.file_key(file_path)
+        except OSError:
+            # Let the file opener report missing files
+            return self._remove_comments(self._read_file(file_path))
+
+        file_lines = _include_cache.get(key)
+        if file_lines is None:
+            file_lines = self._remove_comments(self._read_file(file_path))
+            _include_cache.put(key, file_lines)
+
+        return file_lines
+
+    def _parse_preprocessor(self, line):
+        """Return the name and argument of a preprocessor directive
+        (i.e. '#include "file.itp"' returns ('include', '"file.itp"'))"""
+        directive = line[1:].split(None, 1)
+        if len(directive) == 0:
+            return '', ''
+        if len(directive) == 1:
+            return directive[0], ''
+        return directive[0], directive[1].strip()
+
+    def _substitute(self, line, defines):
+        """Replace any tokens in `line` that refer to defined macros"""
+        tokens = line.split()
+        if not any(token in defines for token in tokens):
+            return line
+        return ' '.join(defines.get(token, token) for token in tokens)
+
+    def _find_include(self, include_file, directory):
+        """Return the path of `include_file`, searching the including
+        `directory`, `include_dirs` and GMXLIB in order"""
+
+        search_dirs = [directory] + list(self.include_dirs)
+        gmxlib = os.environ.get('GMXLIB')
+        if gmxlib:
+            search_dirs += gmxlib.split(os.pathsep)
+
+        for search_dir in search_dirs:
+            file_path = os.path.join(search_dir, include_file)
+            if os.path.isfile(file_path):
+                return file_path
+
+        raise IOError(
+            f'Included file {include_file} not found in any of '
+            f'{search_dirs}')
+
+    def _process(self, file_path, defines, include_stack, include_files):
+        """Return preprocessed lines of file located at `file_path`.
+        Macros in `defines` are updated in place, and the absolute
+        paths of all files read are appended to `include_files`"""
+
+        abs_path = os.path.abspath(file_path)
+        if abs_path in include_stack:
+            raise IOError(f'Recursive #include of {file_path}')
+
+        file_lines = self._load_file(file_path)
+        include_files.append(abs_path)
+        directory = os.path.dirname(abs_path)
+
+        # Stack of conditions for each nested #ifdef block
+        conditions = []
+        processed_lines = []
+
+        for line in file_lines:
+            if not line.startswith('#'):
+                if all(conditions):
+                    processed_lines.append(
+                        self._substitute(line, defines))
+                continue
+
+            directive, argument = self._parse_preprocessor(line)
+
+            # Conditional directives are always tracked so that
+            # nested blocks are matched correctly
+            if directive in ('ifdef', 'ifndef'):
+                conditions.append(
+                    (argument in defines) == (directive == 'ifdef'))
+                continue
+            if directive in ('else', 'endif'):
+                if not conditions:
+                    raise IOError(
+                        f'#{directive} without matching #ifdef '
+                        f'in {file_path}')
+                if directive == 'else':
+                    conditions[-1] = not conditions[-1]
+                else:
+                    conditions.pop()
+                continue
+
+            if not all(conditions):
+                continue
+
+            if directive == 'define':
+                name, *value = argument.split()
+                defines[name] = ' '.join(value)
+            elif directive == 'undef':
+                defines.pop(argument, None)
+            elif directive == 'include':
+                include_path = self._find_include(
+                    argument.strip('"<>'), directory)
+                processed_lines += self._process(
+                    include_path, defines,
+                    include_stack + [abs_path], include_files)
+            else:
+                raise IOError(
+                    f'Unsupported preprocessor directive {line} '
+                    f'in {file_path}')
+
+        if conditions:
+            raise IOError(
+                f'Unterminated #ifdef block in {file_path}')
+
+        return processed_lines
+
+    # ------------------
+    #   Public Methods
+    # ------------------
+
+    @staticmethod
+    def cache_info():
+        """Return a dictionary containing the number of hits and misses
+        of the process-wide cache of file lines, as well as its
+        current and maximum size"""
+        return _include_cache.info()
+
+    @staticmethod
+    def cache_clear():
+        """Empty the process-wide cache of file lines and reset
+        its counters"""
+        _include_cache.clear()
+
+    def cache_key(self):
+        """Return a hashable representation of all attributes that
+        affect the output of the preprocessor"""
+        return (tuple(self.include_dirs),
+                tuple(sorted(self.defines.items())),
+                os.environ.get('GMXLIB'))
+
+    def process(self, file_path):
+        """ Open Gromacs topology file located at `file_path` and
+        resolve all preprocessor directives
+
+        Parameters
+        ----------
+        file_path : str
+            File path of Gromacs topology file
+
+        Returns
+        -------
+        file_lines : list of str
+            Lines of the topology file, with comments removed, macros
+            substituted and all included files expanded in place
+        include_files : list of str
+            Absolute paths of every file read, starting with
+            `file_path` itself
+        """
+        include_files = []
+        file_lines = self._process(
+            file_path, dict(self.defines), [], include_files)
+
+        return file_lines, include_files
+
+    def read(self, file_path):
+        """Return preprocessed lines of the Gromacs topology file
+        located at `file_path`"""
+        file_lines, _ = self.process(file_path)
+        return file_lines
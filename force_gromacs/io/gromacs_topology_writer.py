@@ -90,6 +90,14 @@ class GromacsTopologyWriter(HasTraits):
         """Returns dummy stdout message"""
         return ''
 
+    def input_files(self):
+        """Returns empty list, since no input files are required"""
+        return []
+
+    def output_files(self):
+        """Returns list containing the file written by `run`"""
+        return [f'{self.directory}/{self.top_name}']
+
     def bash_script(self):
         """Output terminal command as a bash script"""
 
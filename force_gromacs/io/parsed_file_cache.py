@@ -0,0 +1,113 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from collections import OrderedDict
+import os
+import threading
+
+from traits.api import HasStrictTraits, Int, Instance, Any
+
+
+class ParsedFileCache(HasStrictTraits):
+    """Least recently used cache for data parsed from files. Entries
+    are keyed by the absolute path, modification time and size of each
+    file, so that any change to a file on disk invalidates its entry.
+    Hit and miss counters are provided for instrumentation purposes.
+
+    Instances can safely be shared between threads.
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Maximum number of entries retained in the cache
+    maxsize = Int(128)
+
+    #: Number of successful cache lookups
+    hits = Int(0)
+
+    #: Number of unsuccessful cache lookups
+    misses = Int(0)
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Cached entries, ordered from least to most recently used
+    _entries = Instance(OrderedDict, ())
+
+    #: Lock guarding access to `_entries` and counters
+    _lock = Any()
+
+    # --------------------
+    #      Defaults
+    # --------------------
+
+    def __lock_default(self):
+        return threading.RLock()
+
+    # --------------------
+    #  Protected Methods
+    # --------------------
+
+    def __len__(self):
+        """Returns the number of entries in the cache"""
+        return len(self._entries)
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def file_key(self, file_path, *args):
+        """Return a cache key for the file located at `file_path`.
+        Any additional arguments are included in the key.
+
+        Raises
+        ------
+        OSError
+            If file does not exist
+        """
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path),
+                stat.st_mtime_ns,
+                stat.st_size) + args
+
+    def get(self, key, default=None):
+        """Return the entry for `key` if present, otherwise `default`"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store `value` under `key`, discarding the least recently
+        used entries if `maxsize` is exceeded"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return a dictionary summarising cache usage"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
@@ -0,0 +1,265 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from functools import lru_cache
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from traits.api import HasStrictTraits, Directory, Int
+
+#: Size of each chunk read when hashing file contents
+_CHUNK_SIZE = 2 ** 20
+
+#: Name of file storing metadata in each cache entry
+_METADATA_FILE = 'metadata.json'
+
+
+@lru_cache(maxsize=None)
+def gromacs_version(executable='gmx'):
+    """Returns version string reported by a Gromacs executable, or an
+    empty string if it cannot be found. Result is cached, since the
+    installation is not expected to change during a run."""
+
+    try:
+        proc = subprocess.run(
+            [executable, '--version'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        return ''
+
+    for line in proc.stdout.decode(errors='replace').splitlines():
+        if line.strip().startswith('GROMACS version:'):
+            return line.split(':', 1)[1].strip()
+    return ''
+
+
+class SimulationResultCache(HasStrictTraits):
+    """Content-addressed store of Gromacs simulation results. Each entry
+    is keyed by a hash of everything that determines the outcome of a
+    simulation: the commands that are run, the contents of their input
+    files and the Gromacs version. Identical simulations can therefore
+    share results, regardless of their names or locations.
+
+    Entries are stored as separate folders in `cache_directory`. Once the
+    total size exceeds `max_bytes`, the least recently used entries
+    are removed.
+    """
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Location to store cached results in
+    cache_directory = Directory()
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Maximum disk space used by cached results in bytes. Entries are
+    #: not evicted if zero
+    max_bytes = Int(0)
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _entry_path(self, key):
+        """Returns location of cache entry `key`"""
+        return os.path.join(self.cache_directory, key[:2], key)
+
+    def _entry_size(self, entry_path):
+        """Returns total size of files in cache entry in bytes"""
+        return sum(
+            os.path.getsize(os.path.join(entry_path, file_name))
+            for file_name in os.listdir(entry_path)
+        )
+
+    def _entries(self):
+        """Returns list of (last access time, size, path) for
+        every entry in the cache"""
+
+        entries = []
+        if not os.path.isdir(self.cache_directory):
+            return entries
+
+        for prefix in os.listdir(self.cache_directory):
+            prefix_path = os.path.join(self.cache_directory, prefix)
+            if not os.path.isdir(prefix_path):
+                continue
+            for key in os.listdir(prefix_path):
+                entry_path = os.path.join(prefix_path, key)
+                metadata_path = os.path.join(entry_path, _METADATA_FILE)
+                if not os.path.exists(metadata_path):
+                    continue
+                entries.append((
+                    os.path.getmtime(metadata_path),
+                    self._entry_size(entry_path),
+                    entry_path
+                ))
+
+        return entries
+
+    def _hash_file(self, file_path, sha256):
+        """Update `sha256` hash with file contents"""
+        with open(file_path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+
+    def _restore_entry(self, old_path, entry_path):
+        """Move an entry at `old_path` back to `entry_path`, unless
+        another entry has since been stored there"""
+        try:
+            os.rename(old_path, entry_path)
+        except OSError:
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def cache_key(self, bash_script, input_files=(), version=''):
+        """Returns key identifying a simulation
+
+        Parameters
+        ----------
+        bash_script: str
+            Commands used to perform the simulation. Any references to
+            the simulation name or location should be replaced by
+            placeholders, so that renamed simulations share a key
+        input_files: list of str, optional
+            Files read by the simulation, whose contents are included
+            in the key. Missing files are recorded as such
+        version: str, optional
+            Version of Gromacs used to run the simulation
+
+        Returns
+        -------
+        key: str
+            SHA256 hex digest of all simulation inputs
+        """
+
+        sha256 = hashlib.sha256()
+        sha256.update(version.encode())
+        sha256.update(b'\0')
+        sha256.update(bash_script.encode())
+
+        for file_path in input_files:
+            sha256.update(b'\0')
+            if os.path.isfile(file_path):
+                sha256.update(b'file')
+                self._hash_file(file_path, sha256)
+            else:
+                sha256.update(b'missing')
+
+        return sha256.hexdigest()
+
+    def contains(self, key):
+        """Returns whether results are stored for `key`"""
+        return os.path.exists(
+            os.path.join(self._entry_path(key), _METADATA_FILE))
+
+    def store(self, key, results_path, replace=False):
+        """Stores the results file of a simulation under `key`, and
+        evicts old entries if `max_bytes` is exceeded. Existing entries
+        are only replaced if `replace` is True."""
+
+        entry_path = self._entry_path(key)
+        if self.contains(key) and not replace:
+            return
+
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # Build entry in a temporary folder, so that incomplete
+        # entries are never visible
+        temp_path = tempfile.mkdtemp(dir=os.path.dirname(entry_path))
+        try:
+            file_name = 'results' + os.path.splitext(results_path)[1]
+            # Results are copied rather than linked, since they may
+            # later be modified in place
+            shutil.copyfile(
+                results_path, os.path.join(temp_path, file_name))
+            with open(os.path.join(temp_path, _METADATA_FILE), 'w') as outfile:
+                json.dump({'key': key,
+                           'file_name': file_name,
+                           'created': time.time()}, outfile)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        # Replaced entries are only deleted once the new entry is in
+        # place, and are restored otherwise
+        old_path = None
+        try:
+            if replace and os.path.exists(entry_path):
+                old_path = f'{temp_path}.old'
+                os.rename(entry_path, old_path)
+            os.rename(temp_path, entry_path)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if old_path is not None:
+                self._restore_entry(old_path, entry_path)
+                raise
+            # Another process may have stored the same entry
+            if not self.contains(key):
+                raise
+        else:
+            if old_path is not None:
+                shutil.rmtree(old_path, ignore_errors=True)
+
+        self.evict()
+
+    def restore(self, key, results_path):
+        """Restores cached results for `key` to `results_path`.
+
+        Returns
+        -------
+        restored: bool
+            Whether any results were stored for `key`
+        """
+
+        entry_path = self._entry_path(key)
+        metadata_path = os.path.join(entry_path, _METADATA_FILE)
+        try:
+            with open(metadata_path, 'r') as infile:
+                metadata = json.load(infile)
+        except FileNotFoundError:
+            return False
+
+        directory = os.path.dirname(results_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        shutil.copyfile(
+            os.path.join(entry_path, metadata['file_name']), results_path)
+
+        # Record access time for least recently used eviction
+        os.utime(metadata_path)
+
+        return True
+
+    def evict(self):
+        """Removes least recently used entries until the total size of
+        the cache is within `max_bytes`"""
+
+        if not self.max_bytes:
+            return
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total -= size
+
+    def size(self):
+        """Returns total size of cached results in bytes"""
+        return sum(size for _, size, _ in self._entries())
@@ -1,9 +1,13 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
-from force_gromacs.io.base_file_reader import BaseFileReader
+from force_gromacs.io.base_file_reader import (
+    BaseFileReader, COMPRESSION_OPENERS
+)
 from force_gromacs.tests.probe_classes.io import (
     ProbeFileReader
 )
@@ -52,6 +56,32 @@ class TestBaseFileReader(TestCase):
             )
             mock_open.assert_called()
 
+    def test__check_file_types(self):
+
+        self.reader._check_file_types('some_path.file')
+
+        for compression in ['gz', 'bz2', 'xz']:
+            self.reader._check_file_types(f'some_path.file.{compression}')
+
+        for file_path in ['some_path.gz', 'some_path.file.zip',
+                          'some_path.gz.file.bz', '  ']:
+            with self.assertRaisesRegex(
+                    IOError, 'not a valid Gromacs file type'):
+                self.reader._check_file_types(file_path)
+
+    def test__read_compressed_file(self):
+
+        with TemporaryDirectory() as directory:
+            for compression, opener in COMPRESSION_OPENERS.items():
+                file_path = os.path.join(
+                    directory, f'some_path.file.{compression}')
+                with opener(file_path, 'wt') as outfile:
+                    outfile.write(top_file)
+
+                file_lines = self.reader._read_file(file_path)
+                self.assertListEqual(
+                    top_file.splitlines(keepends=True), file_lines)
+
     def test__remove_comments(self):
         top_lines = top_file.split('\n')
 
@@ -0,0 +1,121 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from force_gromacs.io.configuration_library import (
+    ConfigurationLibrary, composition_distance
+)
+from force_gromacs.io.gromacs_coordinate_reader import (
+    GromacsCoordinateReader
+)
+
+COORDINATE_FILE = (
+    "Test configuration\n"
+    "    7\n"
+    "    1W        W    1   0.100   0.100   0.100\n"
+    "    2W        W    2   0.200   0.200   0.200\n"
+    "    3W        W    3   0.300   0.300   0.300\n"
+    "    4PS     PS1    4   1.000   1.000   1.000\n"
+    "    4PS     PS2    5   1.100   1.000   1.000\n"
+    "    5PS     PS1    6   2.000   2.000   2.000\n"
+    "    5PS     PS2    7   2.100   2.000   2.000\n"
+    "   3.00000   3.00000   3.00000\n"
+)
+
+
+class TestConfigurationLibrary(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.library = ConfigurationLibrary(
+            library_directory=os.path.join(self.directory.name, 'library'))
+        self.coord_file = os.path.join(self.directory.name, 'coord.gro')
+        with open(self.coord_file, 'w') as outfile:
+            outfile.write(COORDINATE_FILE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_composition_distance(self):
+        self.assertAlmostEqual(
+            0, composition_distance({'W': 3, 'PS': 2}, {'PS': 4, 'W': 6}))
+        self.assertAlmostEqual(
+            0.8, composition_distance({'W': 3, 'PS': 2}, {'W': 5}))
+        self.assertEqual(
+            2, composition_distance({'W': 3}, {'PS': 2}))
+        self.assertEqual(0, composition_distance({}, {}))
+        self.assertEqual(2, composition_distance({'W': 3}, {}))
+
+    def test_add(self):
+        self.assertListEqual([], self.library.entries())
+
+        self.library.add({'W': 3, 'PS': 2}, self.coord_file)
+        self.library.add({'W': 6, 'PS': 4}, self.coord_file)
+        entries = self.library.entries()
+        self.assertEqual(2, len(entries))
+        self.assertDictEqual({'W': 3, 'PS': 2}, entries[0]['composition'])
+        self.assertTrue(os.path.exists(entries[0]['file_path']))
+
+        # Configurations with the same composition are replaced
+        self.library.add({'PS': 2, 'W': 3}, self.coord_file)
+        self.assertEqual(2, len(self.library.entries()))
+
+    def test_nearest(self):
+        self.assertIsNone(self.library.nearest({'W': 3, 'PS': 2}))
+
+        self.library.add({'W': 3, 'PS': 2}, self.coord_file)
+        self.library.add({'W': 6, 'PS': 4}, self.coord_file)
+        self.library.add({'W': 5}, self.coord_file)
+
+        entry = self.library.nearest({'W': 4, 'PS': 2})
+        self.assertDictEqual({'W': 3, 'PS': 2}, entry['composition'])
+        entry = self.library.nearest({'W': 7, 'PS': 4})
+        self.assertDictEqual({'W': 6, 'PS': 4}, entry['composition'])
+        entry = self.library.nearest({'W': 10})
+        self.assertDictEqual({'W': 5}, entry['composition'])
+
+        self.library.max_distance = 0.1
+        self.assertIsNone(self.library.nearest({'PS': 10}))
+
+    def test_prepare(self):
+        output_file = os.path.join(self.directory.name, 'start.gro')
+        self.assertIsNone(
+            self.library.prepare({'W': 3, 'PS': 2}, output_file))
+        self.assertFalse(os.path.exists(output_file))
+
+        self.library.add({'W': 3, 'PS': 2}, self.coord_file)
+
+        missing = self.library.prepare({'PS': 1, 'W': 2, 'C': 1}, output_file)
+        self.assertDictEqual({'C': 1}, missing)
+
+        with open(output_file, 'r') as infile:
+            lines = infile.readlines()
+        self.assertListEqual(
+            ["Test configuration\n",
+             "    4\n",
+             "    1PS     PS1    1   1.000   1.000   1.000\n",
+             "    1PS     PS2    2   1.100   1.000   1.000\n",
+             "    2W        W    3   0.100   0.100   0.100\n",
+             "    3W        W    4   0.200   0.200   0.200\n",
+             "   3.00000   3.00000   3.00000\n"],
+            lines)
+
+        # Output can be parsed as a Gromacs coordinate file
+        data = GromacsCoordinateReader().read(output_file)
+        self.assertEqual((1, 4, 3), data['coord'].shape)
+
+        missing = self.library.prepare({'W': 5, 'PS': 2}, output_file)
+        self.assertDictEqual({'W': 2}, missing)
+
+    def test_incomplete_file(self):
+        with open(self.coord_file, 'w') as outfile:
+            outfile.write(COORDINATE_FILE[:-31])
+        self.library.add({'W': 3, 'PS': 2}, self.coord_file)
+
+        with self.assertRaises(IOError):
+            self.library.prepare(
+                {'W': 3, 'PS': 2},
+                os.path.join(self.directory.name, 'start.gro'))
@@ -1,14 +1,20 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 import numpy as np
 
+from force_gromacs.io.base_file_reader import COMPRESSION_OPENERS
 from force_gromacs.io.gromacs_coordinate_reader import (
     GromacsCoordinateReader
 )
-from force_gromacs.tests.fixtures import gromacs_coordinate_file
+from force_gromacs.io.gromacs_index_reader import GromacsIndexReader
+from force_gromacs.tests.fixtures import (
+    gromacs_coordinate_file, gromacs_index_file
+)
 
 
 class TestGromacsCoordinateReader(TestCase):
@@ -42,30 +48,40 @@ class TestGromacsCoordinateReader(TestCase):
             self.reader._remove_comments(file_lines)
         )
 
+    def res_names(self, data):
+        return data['res_names'][data['res_code']].tolist()
+
+    def atom_names(self, data):
+        return data['atom_names'][data['atom_code']].tolist()
+
     def test_basic_function(self):
 
         data = self.reader.read(gromacs_coordinate_file)
 
-        self.assertEqual(4, len(data))
-        self.assertIn('mol_ref', data.keys())
-        self.assertIn('atom_ref', data.keys())
+        self.assertEqual(7, len(data))
+        self.assertIn('res_id', data.keys())
+        self.assertIn('res_code', data.keys())
+        self.assertIn('res_names', data.keys())
+        self.assertIn('atom_code', data.keys())
+        self.assertIn('atom_names', data.keys())
         self.assertIn('coord', data.keys())
         self.assertIn('dim', data.keys())
 
-        self.assertIsInstance(data['mol_ref'], list)
-        self.assertIsInstance(data['atom_ref'], list)
+        for key in ['res_id', 'res_code', 'atom_code']:
+            self.assertIsInstance(data[key], np.ndarray)
+            self.assertEqual(np.int32, data[key].dtype)
         self.assertIsInstance(data['coord'], np.ndarray)
         self.assertIsInstance(data['dim'], np.ndarray)
 
-        self.assertEqual(6, len(data['mol_ref']))
-        self.assertEqual(6, len(data['atom_ref']))
+        self.assertEqual(6, len(data['res_code']))
+        self.assertEqual(6, len(data['atom_code']))
         self.assertEqual((2, 6, 3), data['coord'].shape)
         self.assertEqual((2, 3,), data['dim'].shape)
 
         data = self.reader.read(gromacs_coordinate_file, 1)
 
-        self.assertEqual(6, len(data['mol_ref']))
-        self.assertEqual(6, len(data['atom_ref']))
+        self.assertEqual(6, len(data['res_code']))
+        self.assertEqual(6, len(data['atom_code']))
         self.assertEqual((1, 6, 3), data['coord'].shape)
         self.assertEqual((1, 3,), data['dim'].shape)
         self.assertTrue(np.allclose(self.coord[:1], data['coord']))
@@ -73,40 +89,271 @@ class TestGromacsCoordinateReader(TestCase):
 
         data = self.reader.read(gromacs_coordinate_file, symbols=['PS1', 'SS'])
 
-        self.assertEqual(4, len(data['mol_ref']))
-        self.assertEqual(4, len(data['atom_ref']))
+        self.assertEqual(4, len(data['res_code']))
+        self.assertEqual(4, len(data['atom_code']))
         self.assertEqual((2, 4, 3), data['coord'].shape)
         self.assertEqual((2, 3,), data['dim'].shape)
 
+    def test_deprecated_references(self):
+
+        data = self.reader.read(gromacs_coordinate_file)
+        self.assertIn('mol_ref', data)
+        self.assertIn('atom_ref', data)
+        self.assertNotIn('not_a_key', data)
+
+        with self.assertWarns(DeprecationWarning):
+            mol_ref = data['mol_ref']
+        self.assertListEqual(
+            ['1PS1', '1PS1', '2SS', '2SS', '3PI', '4NI'], mol_ref)
+        with self.assertWarns(DeprecationWarning):
+            self.assertListEqual(mol_ref, data.get('mol_ref'))
+        self.assertIsNone(data.get('not_a_key'))
+        self.assertIs(data['coord'], data.get('coord'))
+
+        frame = next(self.reader.iter_frames(
+            gromacs_coordinate_file, symbols=['SS']))
+        with self.assertWarns(DeprecationWarning):
+            atom_ref = frame['atom_ref']
+        self.assertListEqual(['SS1', 'SS2'], atom_ref)
+
+        with self.assertRaises(KeyError):
+            data['not_a_key']
+
+    def test__get_references(self):
+        file_lines = self.reader._read_file(gromacs_coordinate_file)
+
+        references = self.reader._get_references(file_lines[2:8])
+
+        self.assertListEqual(
+            [1, 1, 2, 2, 3, 4], references['res_id'].tolist())
+        self.assertListEqual(
+            ['NI', 'PI', 'PS1', 'SS'], references['res_names'].tolist())
+        self.assertListEqual(
+            [2, 2, 3, 3, 1, 0], references['res_code'].tolist())
+        self.assertListEqual(
+            ['PS1', 'PS1', 'SS', 'SS', 'PI', 'NI'],
+            self.res_names(references))
+        self.assertListEqual(
+            ['PS11', 'PS12', 'SS1', 'SS2', 'PI', 'NI'],
+            self.atom_names(references))
+
+        references = self.reader._get_references([])
+        self.assertEqual(0, references['res_id'].size)
+        self.assertEqual(0, references['res_names'].size)
+
     def test__get_data(self):
         file_lines = self.reader._read_file(gromacs_coordinate_file)
 
-        mol_ref, atom_ref, coord, dim = self.reader._get_data(file_lines)
+        references, coord, dim = self.reader._get_data(file_lines)
 
-        self.assertEqual(6, len(mol_ref))
-        self.assertEqual(6, len(atom_ref))
+        self.assertEqual(6, len(references['res_code']))
+        self.assertEqual(6, len(references['atom_code']))
         self.assertEqual((2, 6, 3), coord.shape)
         self.assertEqual((2, 3,), dim.shape)
 
         self.assertListEqual(
-            ['1PS1', '1PS1', '2SS', '2SS', '3PI', '4NI'],
-            mol_ref
+            ['PS1', 'PS1', 'SS', 'SS', 'PI', 'NI'],
+            self.res_names(references)
         )
         self.assertListEqual(
             ['PS11', 'PS12', 'SS1', 'SS2', 'PI', 'NI'],
-            atom_ref
+            self.atom_names(references)
         )
 
         self.assertTrue(np.allclose(self.coord, coord))
         self.assertTrue(np.allclose(self.dim, dim))
 
-        mol_ref, atom_ref, coord, dim = self.reader._get_data(file_lines, 1)
+        references, coord, dim = self.reader._get_data(file_lines, 1)
 
-        self.assertEqual(6, len(mol_ref))
-        self.assertEqual(6, len(atom_ref))
+        self.assertEqual(6, len(references['res_code']))
+        self.assertEqual(6, len(references['atom_code']))
         self.assertEqual((1, 6, 3), coord.shape)
         self.assertEqual((1, 3,), dim.shape)
 
+        # References are returned without any frames
+        references, coord, dim = self.reader._get_data(file_lines, 0)
+
+        self.assertEqual(6, len(references['res_code']))
+        self.assertEqual((0, 6, 3), coord.shape)
+        self.assertEqual((0, 3,), dim.shape)
+
+    def test__get_data_stream(self):
+
+        with open(gromacs_coordinate_file) as infile:
+            references, coord, dim = self.reader._get_data(
+                infile, 1, [1, 2])
+            # Only the lines of the first frame have been consumed
+            self.assertEqual('Some header comment', next(infile).strip())
+
+        self.assertListEqual(['PS1', 'SS'], self.res_names(references))
+        self.assertTrue(np.allclose(self.coord[:1, 1:3], coord))
+
+        with self.assertRaisesRegex(
+                IOError, 'does not include any complete frames'):
+            self.reader._get_data(iter([]))
+
+    def test__iter_frame_lines(self):
+        file_lines = self.reader._read_file(gromacs_coordinate_file)
+
+        frames = list(self.reader._iter_frame_lines(file_lines))
+        self.assertEqual(2, len(frames))
+        self.assertListEqual(file_lines[:9], frames[0])
+        self.assertListEqual(file_lines[9:], frames[1])
+
+        # Incomplete frames at the end of the file are ignored
+        frames = list(self.reader._iter_frame_lines(file_lines[:-1]))
+        self.assertEqual(1, len(frames))
+
+        frames = list(self.reader._iter_frame_lines(
+            file_lines[:9] + ['\n', '\n']))
+        self.assertEqual(1, len(frames))
+
+    def test_read_compressed(self):
+
+        with open(gromacs_coordinate_file) as infile:
+            contents = infile.read()
+
+        with TemporaryDirectory() as directory:
+            for compression, opener in COMPRESSION_OPENERS.items():
+                file_path = os.path.join(
+                    directory, f'coordinates.gro.{compression}')
+                with opener(file_path, 'wt') as outfile:
+                    outfile.write(contents)
+
+                data = self.reader.read(file_path, symbols='SS')
+
+                self.assertListEqual(['SS', 'SS'], self.res_names(data))
+                self.assertTrue(
+                    np.allclose(self.coord[:, 2:4], data['coord']))
+                self.assertTrue(np.allclose(self.dim, data['dim']))
+
+    def test_iter_frames(self):
+
+        frames = list(self.reader.iter_frames(gromacs_coordinate_file))
+
+        self.assertEqual(2, len(frames))
+        for index, data in enumerate(frames):
+            self.assertListEqual(
+                ['PS1', 'PS1', 'SS', 'SS', 'PI', 'NI'],
+                self.res_names(data))
+            self.assertTrue(np.allclose(self.coord[index], data['coord']))
+            self.assertTrue(np.allclose(self.dim[index], data['dim']))
+
+        frames = list(self.reader.iter_frames(
+            gromacs_coordinate_file, n_frames=1, atoms=['PI', 'NI'],
+            indices=[5, 6]))
+
+        self.assertEqual(1, len(frames))
+        self.assertListEqual(['PI', 'NI'], self.atom_names(frames[0]))
+        self.assertEqual((2, 3), frames[0]['coord'].shape)
+        self.assertTrue(np.allclose(self.coord[0, 4:], frames[0]['coord']))
+
+    def test_read_indices(self):
+
+        groups = GromacsIndexReader().read(gromacs_index_file)
+
+        data = self.reader.read(
+            gromacs_coordinate_file, indices=groups['Ions'])
+
+        self.assertListEqual([3, 4], data['res_id'].tolist())
+        self.assertListEqual(['PI', 'NI'], self.res_names(data))
+        self.assertListEqual(['PI', 'NI'], self.atom_names(data))
+        self.assertEqual((2, 2, 3), data['coord'].shape)
+        self.assertTrue(np.allclose(self.coord[:, 4:], data['coord']))
+
+        data = self.reader.read(
+            gromacs_coordinate_file, indices=groups['SS'],
+            symbols=['SS'])
+        self.assertListEqual(['SS', 'SS'], self.res_names(data))
+        self.assertTrue(np.allclose(self.coord[:, 2:4], data['coord']))
+
+        with self.assertRaises(IndexError):
+            self.reader.read(gromacs_coordinate_file, indices=[0])
+
+    def test__get_data_indices(self):
+        file_lines = self.reader._read_file(gromacs_coordinate_file)
+
+        references, coord, dim = self.reader._get_data(
+            file_lines, indices=[5, 0])
+
+        self.assertListEqual(['NI', 'PS1'], self.res_names(references))
+        self.assertListEqual(['NI', 'PS11'], self.atom_names(references))
+        self.assertEqual((2, 2, 3), coord.shape)
+        self.assertTrue(np.allclose(self.coord[:, [5, 0]], coord))
+        self.assertTrue(np.allclose(self.dim, dim))
+
+        references, coord, dim = self.reader._get_data(
+            file_lines, n_frames=5, indices=[])
+
+        self.assertEqual(0, references['res_code'].size)
+        self.assertEqual((2, 0, 3), coord.shape)
+        self.assertEqual((2, 3), dim.shape)
+
+    def test_read_selection(self):
+
+        data = self.reader.read(gromacs_coordinate_file, atoms='PI')
+        self.assertListEqual(['PI'], self.res_names(data))
+        self.assertListEqual(['PI'], self.atom_names(data))
+        self.assertTrue(np.allclose(self.coord[:, 4:5], data['coord']))
+
+        data = self.reader.read(
+            gromacs_coordinate_file, symbols=['PS1', 'SS'],
+            atoms=['PS12', 'SS1', 'PI'])
+        self.assertListEqual([1, 2], data['res_id'].tolist())
+        self.assertListEqual(['PS1', 'SS'], self.res_names(data))
+        self.assertListEqual(['PS12', 'SS1'], self.atom_names(data))
+        self.assertEqual((2, 2, 3), data['coord'].shape)
+        self.assertTrue(np.allclose(self.coord[:, 1:3], data['coord']))
+
+        data = self.reader.read(
+            gromacs_coordinate_file, symbols='SS', indices=[1, 4])
+        self.assertListEqual(['SS'], self.res_names(data))
+        self.assertTrue(np.allclose(self.coord[:, 3:4], data['coord']))
+
+        data = self.reader.read(gromacs_coordinate_file, symbols='S')
+        self.assertEqual(0, data['res_code'].size)
+        self.assertEqual((2, 0, 3), data['coord'].shape)
+        self.assertEqual((2, 3), data['dim'].shape)
+
+    def test__select_atoms(self):
+        file_lines = self.reader._read_file(gromacs_coordinate_file)
+
+        self.assertIsNone(self.reader._select_atoms(file_lines))
+
+        selection = self.reader._select_atoms(
+            file_lines, symbols=['NI', 'SS'])
+        self.assertListEqual([2, 3, 5], selection.tolist())
+
+        selection = self.reader._select_atoms(
+            file_lines, atoms='SS2', indices=[3, 0])
+        self.assertListEqual([3], selection.tolist())
+
+        with self.assertRaises(IndexError):
+            self.reader._select_atoms(file_lines, indices=[6])
+
+    def test_extract_atoms(self):
+
+        data = {
+            'atom_code': np.array([2, 3, 4, 5, 1, 0]),
+            'atom_names': np.array(['NI', 'PI', 'PS11', 'PS12',
+                                    'SS1', 'SS2'])
+        }
+
+        indices = self.reader.extract_atoms(data, 'PI')
+        self.assertListEqual([4], indices.tolist())
+
+        indices = self.reader.extract_atoms(data, ['SS1', 'NI'])
+        self.assertListEqual([2, 5], indices.tolist())
+
+        indices = self.reader.extract_atoms(data, ['S'])
+        self.assertListEqual([], indices.tolist())
+
+        # Deprecated references are accepted
+        data = {'atom_ref': ['PS11', 'PS12', 'SS1', 'SS2', 'PI', 'NI']}
+        with self.assertWarns(DeprecationWarning):
+            indices = self.reader.extract_atoms(data, ['SS1', 'NI'])
+        self.assertListEqual([2, 5], indices.tolist())
+
     def test__remove_index(self):
         string = '424ght6aos57'
         self.assertEqual('ght6aos57',
@@ -114,19 +361,28 @@ class TestGromacsCoordinateReader(TestCase):
 
     def test_extract_molecules(self):
 
-        data = {'mol_ref': ['1PS1', '1PS1', '2SS', '2SS', '3PI', '4NI']}
+        data = {
+            'res_code': np.array([2, 2, 3, 3, 1, 0]),
+            'res_names': np.array(['NI', 'PI', 'PS1', 'SS'])
+        }
 
         indices = self.reader.extract_molecules(data, 'PS1')
-        self.assertListEqual([0, 1], indices)
+        self.assertListEqual([0, 1], indices.tolist())
 
         indices = self.reader.extract_molecules(data, ['PS1'])
-        self.assertListEqual([0, 1], indices)
+        self.assertListEqual([0, 1], indices.tolist())
 
         indices = self.reader.extract_molecules(data, ['PS1', 'SS'])
-        self.assertListEqual([0, 1, 2, 3], indices)
+        self.assertListEqual([0, 1, 2, 3], indices.tolist())
 
         indices = self.reader.extract_molecules(data, ['S'])
-        self.assertListEqual([], indices)
+        self.assertListEqual([], indices.tolist())
+
+        # Deprecated references are accepted
+        data = {'mol_ref': ['1PS1', '1PS1', '2SS', '2SS', '3PI', '4NI']}
+        with self.assertWarns(DeprecationWarning):
+            indices = self.reader.extract_molecules(data, ['PS1', 'SS'])
+        self.assertListEqual([0, 1, 2, 3], indices.tolist())
 
     def test_check_file_types(self):
 
@@ -0,0 +1,72 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+import testfixtures
+
+from force_gromacs.io.gromacs_index_reader import (
+    GromacsIndexReader
+)
+from force_gromacs.tests.fixtures import gromacs_index_file
+
+
+class TestGromacsIndexReader(TestCase):
+
+    def setUp(self):
+
+        self.reader = GromacsIndexReader()
+
+    def test_read(self):
+
+        groups = self.reader.read(gromacs_index_file)
+
+        self.assertListEqual(
+            ['System', 'PS1', 'SS', 'Ions'], list(groups.keys()))
+
+        for indices in groups.values():
+            self.assertIsInstance(indices, np.ndarray)
+            self.assertEqual(np.int32, indices.dtype)
+
+        self.assertListEqual(
+            [1, 2, 3, 4, 5, 6], groups['System'].tolist())
+        self.assertListEqual([1, 2], groups['PS1'].tolist())
+        self.assertListEqual([3, 4], groups['SS'].tolist())
+        self.assertListEqual([5, 6], groups['Ions'].tolist())
+
+    def test__get_data(self):
+
+        groups = self.reader._get_data(
+            ['[ Empty ]', '[Full]', '1 2', '3'])
+
+        self.assertEqual(0, groups['Empty'].size)
+        self.assertListEqual([1, 2, 3], groups['Full'].tolist())
+
+        with self.assertRaisesRegex(
+                IOError,
+                'Gromacs index file does not include any groups'):
+            self.reader._get_data(['1 2 3'])
+
+        with self.assertRaisesRegex(
+                IOError,
+                "invalid atom indices in group 'Full'"):
+            self.reader._get_data(['[ Empty ]', '[Full]', '1 2.5', '3'])
+
+    def test_check_file_types(self):
+
+        with self.assertRaises(IOError):
+            self.reader._check_file_types('some_file.nd')
+
+    def test_file_opening_exception_handling(self):
+
+        with testfixtures.LogCapture() as capture:
+            with self.assertRaises(IOError):
+                self.reader.read(
+                    'this_file_should_not_exist.ndx'
+                )
+            capture.check(
+                ('force_gromacs.io.gromacs_index_reader',
+                 'ERROR',
+                 'unable to open "this_file_should_not_exist.ndx"')
+            )
@@ -0,0 +1,76 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from force_gromacs.io.gromacs_index_reader import GromacsIndexReader
+from force_gromacs.io.gromacs_index_writer import GromacsIndexWriter
+
+
+class TestGromacsIndexWriter(TestCase):
+
+    def setUp(self):
+
+        self.writer = GromacsIndexWriter(
+            groups={
+                'System': np.arange(1, 21),
+                'Ions': np.array([5, 6])
+            },
+            sim_name='test_experiment',
+            dry_run=True
+        )
+
+    def test___init__(self):
+
+        self.assertEqual(
+            os.path.join(os.path.curdir, 'test_experiment'),
+            self.writer.directory)
+        self.assertEqual(
+            'test_experiment_index.ndx', self.writer.ndx_name)
+
+    def test__create_index_file(self):
+        ndx_file = self.writer._create_index_file()
+
+        res = ndx_file.split('\n')
+        self.assertEqual(6, len(res))
+        self.assertEqual('[ System ]', res[0])
+        self.assertEqual(15, len(res[1].split()))
+        self.assertEqual(
+            '  16   17   18   19   20', res[2])
+        self.assertEqual('[ Ions ]', res[3])
+        self.assertEqual('   5    6', res[4])
+
+    def test_bash_script(self):
+
+        bash_script = self.writer.bash_script()
+        file_path = os.path.join(
+            os.path.curdir, 'test_experiment', 'test_experiment_index.ndx')
+
+        res = bash_script.split('\n')
+        self.assertEqual(7, len(res))
+        self.assertEqual(f'cat <<EOM > {file_path}', res[0])
+        self.assertEqual('[ System ]', res[1])
+        self.assertEqual('EOM', res[6])
+
+    def test_run(self):
+
+        with TemporaryDirectory() as directory:
+            self.writer.directory = directory
+            self.assertEqual(0, self.writer.run())
+            self.assertEqual([], os.listdir(directory))
+
+            self.writer.dry_run = False
+            self.assertEqual(0, self.writer.run())
+
+            groups = GromacsIndexReader().read(
+                os.path.join(directory, 'test_experiment_index.ndx'))
+
+        self.assertListEqual(['System', 'Ions'], list(groups.keys()))
+        self.assertTrue(
+            np.array_equal(np.arange(1, 21), groups['System']))
+        self.assertTrue(
+            np.array_equal([5, 6], groups['Ions']))
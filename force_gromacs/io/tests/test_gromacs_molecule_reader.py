@@ -1,6 +1,9 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+import shutil
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
 import testfixtures
@@ -35,6 +38,7 @@ class TestGromacsMoelculeReader(TestCase):
     def setUp(self):
 
         self.reader = GromacsMoleculeReader()
+        self.reader.cache_clear()
         self.cleaned_lines = [
             '[moleculetype]', 'So 1', '[atoms]',
             '1 T 1 So So 1 0 18.0',
@@ -65,42 +69,138 @@ class TestGromacsMoelculeReader(TestCase):
             [(1, 2), (2, 3)], fragments[0].bonds)
         self.assertListEqual([], fragments[1].bonds)
 
+        self.assertListEqual(
+            [(1, 2, 3)], fragments[0].angles)
+        self.assertListEqual([], fragments[1].angles)
+
         self.assertEqual(gromacs_molecule_file, fragments[0].topology)
         self.assertEqual(gromacs_molecule_file, fragments[1].topology)
 
-    def test__remove_comments(self):
-        top_lines = top_file.split('\n')
+    def test_read_cache(self):
+
+        fragments = self.reader.read(gromacs_molecule_file)
+        self.assertDictEqual(
+            {'hits': 0, 'misses': 1, 'size': 1, 'maxsize': 64},
+            self.reader.cache_info()
+        )
+
+        cached_fragments = self.reader.read(gromacs_molecule_file)
+        self.assertEqual(1, self.reader.cache_info()['hits'])
+
+        # Cached fragments are returned as independent copies
+        self.assertListEqual(
+            ['So', 'I'],
+            [fragment.symbol for fragment in cached_fragments]
+        )
+        self.assertIsNot(fragments[0], cached_fragments[0])
+        self.assertIsNot(
+            fragments[0].particles[0], cached_fragments[0].particles[0])
 
-        cleaned_lines = self.reader._remove_comments(top_lines)
+        cached_fragments[0].particles[0].mass = 20
+        self.assertEqual(22, cached_fragments[0].mass)
+        self.assertEqual(
+            18, self.reader.read(gromacs_molecule_file)[0].mass)
+
+        # Cache is shared between instances
+        GromacsMoleculeReader().read(gromacs_molecule_file)
+        self.assertEqual(3, self.reader.cache_info()['hits'])
+
+        reader = GromacsMoleculeReader(use_cache=False)
+        reader.read(gromacs_molecule_file)
+        self.assertEqual(3, self.reader.cache_info()['hits'])
+        self.assertEqual(1, self.reader.cache_info()['misses'])
+
+    def test_read_cache_invalidation(self):
+
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'molecules.itp')
+            shutil.copy(gromacs_molecule_file, file_path)
+
+            fragments = self.reader.read(file_path)
+            self.assertEqual(2, len(fragments))
+            self.assertEqual(file_path, fragments[0].topology)
+
+            with open(file_path, 'a') as outfile:
+                outfile.write('\n[ moleculetype ]\nW 1\n'
+                              '[ atoms ]\n1 P4 1 W W 1 0 72.0\n')
+
+            fragments = self.reader.read(file_path)
+            self.assertEqual(3, len(fragments))
+            self.assertEqual(2, self.reader.cache_info()['misses'])
+
+    def test_read_include(self):
+
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'molecules.itp')
+            include_path = os.path.join(directory, 'water.itp')
+            shutil.copy(gromacs_molecule_file, file_path)
+            with open(file_path, 'a') as outfile:
+                outfile.write('\n#ifndef NO_WATER\n'
+                              '#include "water.itp"\n#endif\n')
+            with open(include_path, 'w') as outfile:
+                outfile.write('[ moleculetype ]\nW 1\n'
+                              '[ atoms ]\n1 P4 1 W W 1 0 72.0\n')
+
+            fragments = self.reader.read(file_path)
+            self.assertListEqual(
+                ['So', 'I', 'W'],
+                [fragment.symbol for fragment in fragments]
+            )
+            self.assertEqual(72, self.reader.read_symbol(file_path, 'W').mass)
+
+            # Changes to included files invalidate the cache
+            with open(include_path, 'a') as outfile:
+                outfile.write('2 P4 1 W W 1 0 72.0\n')
+            self.assertEqual(144, self.reader.read(file_path)[2].mass)
+            self.assertEqual(2, self.reader.cache_info()['size'])
+
+            reader = GromacsMoleculeReader()
+            reader.preprocessor.defines = {'NO_WATER': ''}
+            self.assertEqual(2, len(reader.read(file_path)))
+
+    def test_read_symbol(self):
+
+        fragment = self.reader.read_symbol(gromacs_molecule_file, 'I')
+        self.assertEqual('I', fragment.symbol)
+        self.assertEqual(gromacs_molecule_file, fragment.topology)
+        self.assertEqual(1, len(fragment.particles))
+        self.assertEqual(24, fragment.mass)
+
+        fragment = self.reader.read_symbol(gromacs_molecule_file, 'So')
+        self.assertEqual('So', fragment.symbol)
+        self.assertEqual(3, len(fragment.particles))
+        self.assertListEqual([(1, 2), (2, 3)], fragment.bonds)
+
+        # File is only indexed once
+        self.assertDictEqual(
+            {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 64},
+            self.reader.cache_info()
+        )
 
-        self.assertEqual(8, len(cleaned_lines))
-        self.assertEqual('[moleculetype]', cleaned_lines[0])
-        self.assertEqual('So 1', cleaned_lines[1])
-        self.assertEqual('[atoms]', cleaned_lines[2])
-        self.assertEqual('1 T 1 So So 1 0 18.0', cleaned_lines[3])
-        self.assertEqual('[ moleculetype ]', cleaned_lines[4])
-        self.assertEqual('I 1', cleaned_lines[5])
-        self.assertEqual('[ atoms ]', cleaned_lines[6])
-        self.assertEqual('1 F 1 I I 1 1.0 24', cleaned_lines[7])
+        with self.assertRaisesRegex(
+                KeyError,
+                'Molecule type W is not included in '
+                'Gromacs topology file'):
+            self.reader.read_symbol(gromacs_molecule_file, 'W')
 
-    def test__get_molecule_sections(self):
+    def test__get_molecule_offsets(self):
 
-        mol_sections = self.reader._get_molecule_sections(
+        mol_offsets = self.reader._get_molecule_offsets(
             self.cleaned_lines)
 
-        self.assertEqual(2, len(mol_sections))
-        self.assertListEqual(
-            ['[moleculetype]', 'So 1', '[atoms]',
-             '1 T 1 So So 1 0 18.0'], mol_sections[0])
-        self.assertListEqual(
-            ['[ moleculetype ]', 'I 1', '[ atoms ]',
-             '1 F 1 I I 1 1.0 24'], mol_sections[1])
+        self.assertDictEqual({'So': (0, 4), 'I': (4, 8)}, mol_offsets)
+
+        # Only the first definition of a molecule type is indexed
+        mol_offsets = self.reader._get_molecule_offsets(
+            self.cleaned_lines + self.cleaned_lines[:4])
+
+        self.assertDictEqual({'So': (0, 4), 'I': (4, 8)}, mol_offsets)
 
         with self.assertRaisesRegex(
                 IOError,
                 'Gromacs topology file does not include any'
                 ' molecule types'):
-            self.reader._get_molecule_sections([])
+            self.reader._get_molecule_offsets([])
 
     def test__get_data(self):
 
@@ -136,6 +236,43 @@ class TestGromacsMoelculeReader(TestCase):
             [particle.mass for particle in fragments[1].particles]
         )
 
+    def test__get_data_sections(self):
+
+        file_lines = [
+            '[ atomtypes ]', 'P4 72.0 0.000 A 0.0 0.0',
+            '[ moleculetype ]', 'Poly 1',
+            '[ atoms ]',
+            '1 P4 1 Poly atoms 1 0 72.0',
+            '2 P4 1 Poly bonds 2 0 72.0',
+            '3 P4 1 Poly B 3 0 72.0',
+            '4 P4 1 Poly B 4 0 72.0',
+            '[ BONDS ]', '1 2 1 0.47 1250',
+            '[ constraints ]', '2 3 1 0.47',
+            '[ angles ]', '1 2 3 2 180 25',
+            '[ dihedrals ]', '1 2 3 4 1 0 1.8 1',
+            '[ exclusions ]', '1 4'
+        ]
+
+        fragments = self.reader._get_data(file_lines)
+
+        self.assertEqual(1, len(fragments))
+        self.assertEqual('Poly', fragments[0].symbol)
+        self.assertListEqual(
+            ['atoms', 'bonds', 'B', 'B'], fragments[0].atoms)
+        self.assertListEqual([(1, 2)], fragments[0].bonds)
+        self.assertListEqual([(2, 3)], fragments[0].constraints)
+        self.assertListEqual([(1, 2, 3)], fragments[0].angles)
+        self.assertListEqual([(1, 2, 3, 4)], fragments[0].dihedrals)
+
+    def test__parse_directive(self):
+
+        self.assertEqual(
+            'atoms', self.reader._parse_directive('[ atoms ]'))
+        self.assertEqual(
+            'moleculetype', self.reader._parse_directive('[MoleculeType]'))
+        self.assertIsNone(
+            self.reader._parse_directive('1 P4 1 Poly atoms 1 0 72.0'))
+
     def test_check_file_types(self):
 
         topology = 'some_file.isp'
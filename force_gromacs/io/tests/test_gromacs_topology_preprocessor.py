@@ -0,0 +1,176 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from force_gromacs.io.gromacs_topology_preprocessor import (
+    GromacsTopologyPreprocessor
+)
+
+top_file = """; Example topology
+#include "forcefield.itp"
+#define ANGLE 109.5 \\
+    25.0
+[ moleculetype ]
+So 3
+[ atoms ]
+1 O 1 So O 1 -2 16.0
+#ifdef FLEXIBLE
+2 H 1 So H1 2 1 1.0
+#else
+2 H 1 So H1 2 1 2.0 ; heavy
+#endif
+
+[ angles ]
+1 2 3 ANGLE
+#include "ions.itp"
+"""
+
+forcefield_file = """[ defaults ]
+1 1 no
+#ifndef RIGID
+#define FLEXIBLE
+#endif
+"""
+
+ions_file = """[ moleculetype ]
+I 1
+[ atoms ]
+1 F 1 I I 1 1.0 24
+"""
+
+
+class TestGromacsTopologyPreprocessor(TestCase):
+
+    def setUp(self):
+        self.preprocessor = GromacsTopologyPreprocessor()
+        self.preprocessor.cache_clear()
+
+        self.directory = TemporaryDirectory()
+        self.lib_dir = os.path.join(self.directory.name, 'lib')
+        os.mkdir(self.lib_dir)
+
+        self.top_path = os.path.join(self.directory.name, 'topol.top')
+        for file_path, contents in [
+                (self.top_path, top_file),
+                (os.path.join(self.directory.name, 'forcefield.itp'),
+                 forcefield_file),
+                (os.path.join(self.lib_dir, 'ions.itp'), ions_file)]:
+            with open(file_path, 'w') as outfile:
+                outfile.write(contents)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_process(self):
+
+        with self.assertRaisesRegex(
+                IOError, 'Included file ions.itp not found'):
+            self.preprocessor.process(self.top_path)
+
+        self.preprocessor.include_dirs = [self.lib_dir]
+        file_lines, include_files = self.preprocessor.process(
+            self.top_path)
+
+        self.assertListEqual(
+            ['[ defaults ]', '1 1 no',
+             '[ moleculetype ]', 'So 3', '[ atoms ]',
+             '1 O 1 So O 1 -2 16.0', '2 H 1 So H1 2 1 1.0',
+             '[ angles ]', '1 2 3 109.5 25.0',
+             '[ moleculetype ]', 'I 1', '[ atoms ]',
+             '1 F 1 I I 1 1.0 24'],
+            file_lines
+        )
+        self.assertListEqual(
+            [os.path.abspath(self.top_path),
+             os.path.join(self.directory.name, 'forcefield.itp'),
+             os.path.join(self.lib_dir, 'ions.itp')],
+            include_files
+        )
+
+        # Defines do not persist between files
+        self.assertDictEqual({}, self.preprocessor.defines)
+
+        self.preprocessor.defines = {'RIGID': ''}
+        file_lines = self.preprocessor.read(self.top_path)
+        self.assertIn('2 H 1 So H1 2 1 2.0', file_lines)
+
+    def test_process_gmxlib(self):
+
+        with mock.patch.dict(os.environ, {'GMXLIB': self.lib_dir}):
+            file_lines = self.preprocessor.read(self.top_path)
+
+        self.assertIn('1 F 1 I I 1 1.0 24', file_lines)
+
+    def test_include_cache(self):
+
+        self.preprocessor.include_dirs = [self.lib_dir]
+        self.preprocessor.read(self.top_path)
+        self.assertDictEqual(
+            {'hits': 0, 'misses': 3, 'size': 3, 'maxsize': 256},
+            self.preprocessor.cache_info()
+        )
+
+        # Cache is shared between instances
+        GromacsTopologyPreprocessor(
+            include_dirs=[self.lib_dir]).read(self.top_path)
+        self.assertEqual(3, self.preprocessor.cache_info()['hits'])
+
+        GromacsTopologyPreprocessor(
+            include_dirs=[self.lib_dir], use_cache=False
+        ).read(self.top_path)
+        self.assertEqual(3, self.preprocessor.cache_info()['hits'])
+        self.assertEqual(3, self.preprocessor.cache_info()['misses'])
+
+    def test_directive_errors(self):
+
+        file_path = os.path.join(self.directory.name, 'errors.itp')
+
+        for contents, message in [
+                ('#ifdef A\n[ atoms ]\n', 'Unterminated #ifdef block'),
+                ('#endif\n', '#endif without matching #ifdef'),
+                ('#else\n', '#else without matching #ifdef'),
+                ('#if A\n#endif\n', 'Unsupported preprocessor directive'),
+                ('#include "errors.itp"\n', 'Recursive #include')]:
+            with open(file_path, 'w') as outfile:
+                outfile.write(contents)
+            with self.assertRaisesRegex(IOError, message):
+                self.preprocessor.read(file_path)
+
+        # Unsupported directives are ignored in inactive blocks
+        with open(file_path, 'w') as outfile:
+            outfile.write('#ifdef A\n#if A\n#endif\n')
+        self.assertListEqual([], self.preprocessor.read(file_path))
+
+    def test__parse_preprocessor(self):
+
+        self.assertEqual(
+            ('include', '"file.itp"'),
+            self.preprocessor._parse_preprocessor('#include "file.itp"'))
+        self.assertEqual(
+            ('define', 'A 1.0  2.0'),
+            self.preprocessor._parse_preprocessor('# define A 1.0  2.0'))
+        self.assertEqual(
+            ('endif', ''),
+            self.preprocessor._parse_preprocessor('#endif'))
+
+    def test__substitute(self):
+
+        self.assertEqual(
+            '1 2 1 0.1 100',
+            self.preprocessor._substitute('1 2 1 gb_1', {'gb_1': '0.1 100'})
+        )
+        self.assertEqual(
+            '1  2 gb_2',
+            self.preprocessor._substitute('1  2 gb_2', {'gb_1': '0.1 100'})
+        )
+
+    def test_check_file_types(self):
+
+        self.preprocessor._check_file_types('topol.top')
+        self.preprocessor._check_file_types('molecules.itp.gz')
+        with self.assertRaisesRegex(
+                IOError, 'conf.gro not a valid Gromacs file type'):
+            self.preprocessor._check_file_types('conf.gro')
@@ -55,6 +55,12 @@ class TestGromacsTopologyWriter(TestCase):
         self.assertEqual('S 200', res[11])
         self.assertEqual('So 2120', res[12])
 
+    def test_output_files(self):
+
+        self.assertListEqual(
+            [os.path.join(os.path.curdir, 'test_experiment', 'test_top.itp')],
+            self.writer.output_files())
+
     def test_bash_script(self):
 
         bash_script = self.writer.bash_script()
@@ -0,0 +1,75 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from force_gromacs.io.parsed_file_cache import ParsedFileCache
+
+
+class TestParsedFileCache(TestCase):
+
+    def setUp(self):
+        self.cache = ParsedFileCache(maxsize=2)
+
+    def test_get_put(self):
+
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(0, self.cache.get('a', 0))
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+        self.cache.put('a', 1)
+        self.cache.put('b', 2)
+        self.assertEqual(1, self.cache.get('a'))
+        self.assertEqual(1, self.cache.hits)
+
+        # Least recently used entry is discarded
+        self.cache.put('c', 3)
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(1, self.cache.get('a'))
+        self.assertEqual(3, self.cache.get('c'))
+
+        self.assertDictEqual(
+            {'hits': 3, 'misses': 3, 'size': 2, 'maxsize': 2},
+            self.cache.info()
+        )
+
+    def test_clear(self):
+
+        self.cache.put('a', 1)
+        self.cache.get('a')
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(0, self.cache.misses)
+
+    def test_zero_maxsize(self):
+
+        self.cache.maxsize = 0
+        self.cache.put('a', 1)
+        self.assertEqual(0, len(self.cache))
+
+    def test_file_key(self):
+
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'test.itp')
+            with open(file_path, 'w') as outfile:
+                outfile.write('[ moleculetype ]')
+
+            key = self.cache.file_key(file_path)
+            self.assertEqual(os.path.abspath(file_path), key[0])
+            self.assertEqual(key, self.cache.file_key(file_path))
+            self.assertEqual(
+                key + ('extra',), self.cache.file_key(file_path, 'extra'))
+
+            # Changes to the file produce a different key
+            with open(file_path, 'a') as outfile:
+                outfile.write('\n')
+            self.assertNotEqual(key, self.cache.file_key(file_path))
+
+        with self.assertRaises(OSError):
+            self.cache.file_key(file_path)
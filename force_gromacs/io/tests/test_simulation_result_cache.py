@@ -0,0 +1,182 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+import subprocess
+from tempfile import TemporaryDirectory
+import time
+from unittest import TestCase, mock
+
+from force_gromacs.io.simulation_result_cache import (
+    SimulationResultCache, gromacs_version
+)
+
+gmx_version_output = b"""                :-) GROMACS - gmx, 2018.1 (-:
+
+Executable:   /usr/bin/gmx
+GROMACS version:    2018.1
+Precision:          single
+"""
+
+
+class TestSimulationResultCache(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = SimulationResultCache(
+            cache_directory=self.file_path('cache'))
+
+        self.input_file = self.file_path('input.mdp')
+        self.write_file(self.input_file, 'nsteps = 100')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def file_path(self, *names):
+        return os.path.join(self.directory.name, *names)
+
+    def write_file(self, file_path, contents):
+        with open(file_path, 'w') as outfile:
+            outfile.write(contents)
+
+    def test_cache_key(self):
+
+        key = self.cache.cache_key(
+            'grompp -f input.mdp', [self.input_file], '2018.1')
+        self.assertEqual(64, len(key))
+        self.assertEqual(
+            key,
+            self.cache.cache_key(
+                'grompp -f input.mdp', [self.input_file], '2018.1'))
+
+        # Key depends on all inputs
+        self.assertNotEqual(
+            key,
+            self.cache.cache_key(
+                'grompp -f input.mdp', [self.input_file], '2019'))
+        self.assertNotEqual(
+            key,
+            self.cache.cache_key(
+                'grompp -f other.mdp', [self.input_file], '2018.1'))
+        self.assertNotEqual(
+            key,
+            self.cache.cache_key(
+                'grompp -f input.mdp', [self.file_path('missing.mdp')],
+                '2018.1'))
+
+        self.write_file(self.input_file, 'nsteps = 200')
+        self.assertNotEqual(
+            key,
+            self.cache.cache_key(
+                'grompp -f input.mdp', [self.input_file], '2018.1'))
+
+    def test_store_restore(self):
+
+        results_path = self.file_path('sim', 'traj.gro')
+        restore_path = self.file_path('other', 'traj.gro')
+
+        self.assertFalse(self.cache.contains('abcdef'))
+        self.assertFalse(self.cache.restore('abcdef', restore_path))
+
+        os.mkdir(self.file_path('sim'))
+        self.write_file(results_path, 'trajectory')
+        self.cache.store('abcdef', results_path)
+
+        self.assertTrue(self.cache.contains('abcdef'))
+        self.assertTrue(os.path.exists(
+            self.file_path('cache', 'ab', 'abcdef', 'results.gro')))
+        size = self.cache.size()
+        self.assertGreater(size, 10)
+
+        # Existing results are replaced
+        os.mkdir(self.file_path('other'))
+        self.write_file(restore_path, 'stale')
+        self.assertTrue(self.cache.restore('abcdef', restore_path))
+        with open(restore_path) as infile:
+            self.assertEqual('trajectory', infile.read())
+
+        # Entries are not overwritten
+        self.write_file(results_path, 'new trajectory')
+        self.cache.store('abcdef', results_path)
+        self.assertEqual(size, self.cache.size())
+        self.assertTrue(self.cache.restore('abcdef', restore_path))
+        with open(restore_path) as infile:
+            self.assertEqual('trajectory', infile.read())
+
+        # Unless explicitly replaced
+        self.cache.store('abcdef', results_path, replace=True)
+        self.assertTrue(self.cache.restore('abcdef', restore_path))
+        with open(restore_path) as infile:
+            self.assertEqual('new trajectory', infile.read())
+        self.assertListEqual(
+            ['abcdef'], os.listdir(self.file_path('cache', 'ab')))
+
+    def test_store_replace_error(self):
+
+        results_path = self.file_path('traj.gro')
+        restore_path = self.file_path('restored.gro')
+        self.write_file(results_path, 'trajectory')
+        self.cache.store('abcdef', results_path)
+
+        # Replaced entries are kept if the new entry cannot be stored
+        self.write_file(results_path, 'new trajectory')
+        rename = os.rename
+
+        def failing_rename(source, destination):
+            # Only fail to move the new entry into place
+            if destination.endswith('abcdef') and \
+                    not source.endswith('.old'):
+                raise OSError
+            rename(source, destination)
+
+        with mock.patch('os.rename', side_effect=failing_rename):
+            with self.assertRaises(OSError):
+                self.cache.store('abcdef', results_path, replace=True)
+
+        self.assertTrue(self.cache.restore('abcdef', restore_path))
+        with open(restore_path) as infile:
+            self.assertEqual('trajectory', infile.read())
+        self.assertListEqual(
+            ['abcdef'], os.listdir(self.file_path('cache', 'ab')))
+
+    def test_evict(self):
+
+        results_path = self.file_path('traj.gro')
+        self.write_file(results_path, 'x' * 100)
+
+        for key in ['aa', 'bb', 'cc']:
+            self.cache.store(key, results_path)
+        entry_size = self.cache.size() // 3
+
+        # Make 'aa' the most recently used entry
+        for index, key in enumerate(['bb', 'cc', 'aa']):
+            metadata_path = self.file_path(
+                'cache', key[:2], key, 'metadata.json')
+            access_time = time.time() - 100 + index
+            os.utime(metadata_path, (access_time, access_time))
+
+        # Allow for small differences in metadata size between entries
+        self.cache.max_bytes = int(2.5 * entry_size)
+        self.cache.evict()
+
+        self.assertFalse(self.cache.contains('bb'))
+        self.assertTrue(self.cache.contains('cc'))
+        self.assertTrue(self.cache.contains('aa'))
+
+        # Quota is enforced when storing new entries
+        self.cache.store('dd', results_path)
+        self.assertFalse(self.cache.contains('cc'))
+        self.assertTrue(self.cache.contains('dd'))
+
+    def test_gromacs_version(self):
+
+        gromacs_version.cache_clear()
+        with mock.patch('subprocess.run') as mock_run:
+            mock_run.return_value = subprocess.CompletedProcess(
+                [], 0, stdout=gmx_version_output)
+            self.assertEqual('2018.1', gromacs_version())
+            self.assertEqual('2018.1', gromacs_version())
+        self.assertEqual(1, mock_run.call_count)
+
+        self.assertEqual('', gromacs_version('not_a_command'))
+        gromacs_version.cache_clear()
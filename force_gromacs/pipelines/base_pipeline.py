@@ -1,19 +1,34 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import json
+import os
+import time
+
 from traits.api import (
     HasStrictTraits, List, Tuple, Str, on_trait_change,
-    Dict, Property, provides, Bool
+    Dict, Property, provides, Bool, Callable, Instance
 )
 
 from force_gromacs.core.i_process import IProcess
+from force_gromacs.core.resource_usage import CUMULATIVE_RESOURCES
+from force_gromacs.pipelines.pipeline_manifest import PipelineManifest
 
 
 @provides(IProcess)
 class BasePipeline(HasStrictTraits):
     """A simple pipeline for subprocess commands, based on scikit-learn
     pipeline functionality that can sequentially apply a list of bash
-    commands using subprocess and retain the standard output/error."""
+    commands using subprocess and retain the standard output/error.
+
+    The time and resources used by each step are also recorded during
+    `run`, and can be summarised using the `report` method. Callables
+    in `step_hooks` are invoked after each step has completed, failed
+    or been skipped.
+
+    If a `manifest` is provided, steps that are up to date with their
+    input and output files are skipped during `run`, so that a pipeline
+    can be resumed after a failure without repeating completed steps."""
 
     # --------------------
     #  Regular Attributes
@@ -30,6 +45,15 @@ class BasePipeline(HasStrictTraits):
     #: command but do not call subprocess to run it
     dry_run = Bool()
 
+    #: Callables invoked after each step in `run` with the step name
+    #: and a dictionary containing its timing information. The 'status'
+    #: of the step is either 'completed', 'failed' or 'skipped'
+    step_hooks = List(Callable)
+
+    #: Optional record of the files used by each step. If provided,
+    #: steps that are up to date are not repeated during `run`
+    manifest = Instance(PipelineManifest)
+
     # --------------------
     #      Properties
     # --------------------
@@ -59,6 +83,101 @@ class BasePipeline(HasStrictTraits):
         for name, process in self.steps:
             process.dry_run = self.dry_run
 
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _output_bytes(self, process):
+        """Returns total size of output files produced by process.
+        Processes that do not report any `output_files` produce
+        zero bytes"""
+
+        output_files = getattr(process, 'output_files', list)()
+
+        return sum(
+            os.path.getsize(file_path) for file_path in output_files
+            if os.path.isfile(file_path)
+        )
+
+    def _step_resources(self, process):
+        """Returns the CPU time and memory used by the subprocess
+        commands run by process. Processes that do not report any
+        resource usage are assumed to use none"""
+
+        usage = dict.fromkeys(CUMULATIVE_RESOURCES + ('max_rss',), 0.0)
+        usage.update(getattr(process, 'recall_resource_usage', dict)())
+
+        return usage
+
+    def _step_timing(self, process, start, status):
+        """Returns timing information for a step that began at wall
+        clock time `start`, and finished with `status`"""
+
+        timing = {'start': start, 'end': time.time()}
+        timing.update(self._step_resources(process))
+        timing['wall_time'] = timing['end'] - start
+        timing['output_bytes'] = self._output_bytes(process)
+        timing['status'] = status
+
+        return timing
+
+    def _call_hooks(self, name, timing):
+        """Invokes each callable in `step_hooks` for a step"""
+        for hook in self.step_hooks:
+            hook(name, timing)
+
+    def _run_step(self, name, process):
+        """Runs a single step and stores its output and timing
+        information in `run_output`. Steps that are up to date
+        with `manifest` are skipped."""
+
+        use_manifest = self.manifest is not None and not self.dry_run
+
+        if use_manifest and self.manifest.is_up_to_date(name, process):
+            self.run_output[name].update(
+                {'returncode': 0, 'stderr': '', 'stdout': '',
+                 'skipped': True})
+            # Skipped steps are not included in the report, since
+            # they use no resources
+            now = time.time()
+            timing = dict.fromkeys(CUMULATIVE_RESOURCES + ('max_rss',), 0.0)
+            timing.update({'start': now, 'end': now, 'output_bytes': 0,
+                           'status': 'skipped'})
+            self._call_hooks(name, timing)
+            return
+
+        start = time.time()
+        try:
+            returncode = process.run()
+        except Exception:
+            timing = self._step_timing(process, start, 'failed')
+            self.run_output[name]['timing'] = timing
+            if use_manifest:
+                self.manifest.remove(name)
+                self.manifest.save()
+            self._call_hooks(name, timing)
+            raise
+
+        timing = self._step_timing(process, start, 'completed')
+        self.run_output[name]['timing'] = timing
+
+        if use_manifest:
+            self.manifest.update(name, process)
+            self.manifest.save()
+
+        self.run_output[name]['skipped'] = False
+        self.run_output[name]['returncode'] = returncode
+        self.run_output[name]['stderr'] = process.recall_stderr()
+        self.run_output[name]['stdout'] = process.recall_stdout()
+
+        # Record uncertainty of simulations that were monitored
+        # for convergence
+        convergence = getattr(process, 'recall_convergence', dict)()
+        if convergence:
+            self.run_output[name]['convergence'] = convergence
+
+        self._call_hooks(name, timing)
+
     # --------------------
     #  Protected Methods
     # --------------------
@@ -109,6 +228,20 @@ class BasePipeline(HasStrictTraits):
         return {name: process.recall_stdout()
                 for name, process in self.steps}
 
+    def external_input_files(self):
+        """Returns list of input files required by steps that are
+        not produced as outputs by any step in the pipeline"""
+
+        input_files, output_files = [], set()
+        for name, process in self:
+            input_files += getattr(process, 'input_files', list)()
+            output_files.update(getattr(process, 'output_files', list)())
+
+        return [
+            file_path for file_path in dict.fromkeys(input_files)
+            if file_path not in output_files
+        ]
+
     def bash_script(self):
         """Returns all terminal commands for steps
 
@@ -129,9 +262,50 @@ class BasePipeline(HasStrictTraits):
         from subprocess in `_run_output` """
         self.run_output = self._run_output_default()
 
+        if self.manifest is not None and not self.dry_run:
+            self.manifest.load()
+
         for name, process in self:
-            returncode = process.run()
+            self._run_step(name, process)
+
+    def recall_resource_usage(self):
+        """Returns resources used by all steps in the most recent
+        pipeline run as a dictionary, so that pipelines can be nested
+        as steps of another pipeline"""
+        total = self.report()['total']
+        total.pop('output_bytes')
+        return total
+
+    def report(self):
+        """Returns timing information from the most recent pipeline
+        run as a dictionary
+
+        Returns
+        -------
+        report: dict
+            Contains a 'steps' dictionary with the start and end
+            timestamps, wall clock time, CPU time and maximum resident
+            set size of subprocess commands, bytes of output files
+            produced and status of each step that has been run, as
+            well as a 'total' dictionary summarising all steps
+        """
+
+        steps = {
+            name: dict(output['timing'])
+            for name, output in self.run_output.items()
+            if 'timing' in output
+        }
+
+        total = {key: 0.0 for key in CUMULATIVE_RESOURCES}
+        total.update({'max_rss': 0.0, 'output_bytes': 0})
+        for timing in steps.values():
+            for key in CUMULATIVE_RESOURCES + ('output_bytes',):
+                total[key] += timing[key]
+            total['max_rss'] = max(total['max_rss'], timing['max_rss'])
+
+        return {'steps': steps, 'total': total}
 
-            self.run_output[name]['returncode'] = returncode
-            self.run_output[name]['stderr'] = process.recall_stderr()
-            self.run_output[name]['stdout'] = process.recall_stdout()
+    def report_json(self, **kwargs):
+        """Returns output of `report` as a JSON string. Any keyword
+        arguments are passed to `json.dumps`"""
+        return json.dumps(self.report(), **kwargs)
@@ -0,0 +1,191 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import (
+    ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+import os
+
+from traits.api import Dict, Int, List, Str
+
+from force_gromacs.pipelines.base_pipeline import BasePipeline
+
+
+class DAGPipeline(BasePipeline):
+    """A pipeline for subprocess commands where each step can declare
+    the names of other steps that it depends on, forming a directed
+    acyclic graph (DAG). During `run`, each step begins as soon as all
+    its dependencies have completed, so that independent steps are run
+    concurrently using a pool of up to `max_workers` threads.
+
+    The bash script generated by `bash_script` groups steps into
+    topologically ordered levels. Steps in the same level are run in
+    the background and are followed by a `wait` command.
+
+    Note that `step_hooks` may be invoked from worker threads.
+
+    Example
+    -------
+    Preparing two solvent boxes concurrently before solvation:
+        pipeline = DAGPipeline(max_workers=2)
+        pipeline.append(('water', water_genconf))
+        pipeline.append(('salt', salt_genconf))
+        pipeline.append(
+            ('solvate', solvate), depends_on=['water', 'salt'])
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Dictionary with step names as keys and lists of the names of
+    #: steps that they depend on as values. Steps that are not
+    #: included have no dependencies
+    dependencies = Dict(Str, List(Str))
+
+    #: Maximum number of steps to run concurrently
+    max_workers = Int()
+
+    # --------------------
+    #      Defaults
+    # --------------------
+
+    def _max_workers_default(self):
+        return os.cpu_count() or 1
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _bash_level(self, names):
+        """Returns bash script running all steps in a level, in the
+        background if there is more than one"""
+
+        scripts = [
+            self.named_steps[name].bash_script() for name in names
+        ]
+        if len(scripts) == 1:
+            return scripts[0] + '\n'
+
+        bash_script = ''
+        for script in scripts:
+            bash_script += f'(\n{script}\n) &\n'
+
+        return bash_script + 'wait\n'
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def append(self, step, depends_on=None):
+        """Appends step to `self.steps` attribute, along with the
+        names of any steps that it depends on"""
+        if depends_on:
+            self.dependencies[step[0]] = list(depends_on)
+        super(DAGPipeline, self).append(step)
+
+    def levels(self):
+        """Sorts steps into topologically ordered levels, so that each
+        step only depends on steps in previous levels. The order of
+        steps within each level follows `steps`.
+
+        Raises
+        ------
+        ValueError
+            If a dependency refers to a step that does not exist or
+            the dependencies contain a cycle
+
+        Returns
+        -------
+        levels: list of list of str
+            Names of steps in each level
+        """
+
+        names = [name for name, _ in self.steps]
+
+        for name, depends_on in self.dependencies.items():
+            for dependency in [name] + depends_on:
+                if dependency not in self.named_steps:
+                    raise ValueError(
+                        f'Dependency {dependency} is not a step '
+                        'in the pipeline')
+
+        levels = []
+        completed = set()
+        while len(completed) < len(names):
+            level = [
+                name for name in names
+                if name not in completed
+                and completed.issuperset(self.dependencies.get(name, []))
+            ]
+            if not level:
+                remaining = [name for name in names if name not in completed]
+                raise ValueError(
+                    f'Dependencies between steps {remaining} '
+                    'contain a cycle')
+            levels.append(level)
+            completed.update(level)
+
+        return levels
+
+    def bash_script(self):
+        """Returns all terminal commands for steps, in topological
+        order with independent steps run in the background
+
+        Returns
+        -------
+        pipeline_commands : str
+            Generated bash commands as a string
+        """
+        bash_script = ''
+
+        for level in self.levels():
+            bash_script += self._bash_level(level)
+
+        return bash_script
+
+    def run(self):
+        """Runs all terminal commands for steps concurrently, respecting
+        dependencies, and stores output from subprocess in `run_output`.
+        If a step raises an exception, no further steps are started and
+        the exception is raised once all running steps have completed."""
+
+        # Also checks that dependencies are valid
+        self.levels()
+        self.run_output = self._run_output_default()
+
+        if self.manifest is not None and not self.dry_run:
+            self.manifest.load()
+
+        pending = [name for name, _ in self.steps]
+        completed = set()
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [
+                        name for name in pending
+                        if completed.issuperset(
+                            self.dependencies.get(name, []))
+                    ]
+                    for name in ready:
+                        pending.remove(name)
+                        future = executor.submit(
+                            self._run_step, name, self.named_steps[name])
+                        running[future] = name
+                elif not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        if error is None:
+                            error = future.exception()
+                    else:
+                        completed.add(name)
+
+        if error is not None:
+            raise error
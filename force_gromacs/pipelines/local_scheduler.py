@@ -0,0 +1,165 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+
+from traits.api import HasStrictTraits, Any, Int, Property
+
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
+
+
+class LocalScheduler(HasStrictTraits):
+    """Runs several pipelines concurrently on a single node, packing
+    simulations onto disjoint sets of cores. Small simulations often
+    scale poorly beyond a few cores, so running several at once with
+    `cores_per_job` cores each gives a higher throughput than running
+    each one on the whole node.
+
+    Before each pipeline is run, any (non-MPI) `Gromacs_mdrun` steps
+    are assigned `cores_per_job` threads, pinned to a set of cores
+    that is not used by any other running pipeline via the mdrun
+    `-nt`, `-ntomp`, `-pin` and `-pinoffset` options. At most
+    `total_cores` cores are used at any time.
+
+    Example
+    -------
+    Running simulations 8 at a time on a 64 core node:
+        with LocalScheduler(total_cores=64, cores_per_job=8) as scheduler:
+            scheduler.run(pipelines)
+    """
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Total number of cores available for all pipelines
+    total_cores = Int()
+
+    #: Number of cores assigned to each pipeline
+    cores_per_job = Int(1)
+
+    # --------------------
+    #     Properties
+    # --------------------
+
+    #: Number of pipelines that can be run concurrently
+    n_slots = Property(Int, depends_on='total_cores,cores_per_job')
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Pool of threads running each pipeline
+    _executor = Any()
+
+    #: Queue of indices of slots that are not in use
+    _free_slots = Any()
+
+    # --------------------
+    #      Defaults
+    # --------------------
+
+    def _total_cores_default(self):
+        return os.cpu_count() or 1
+
+    # --------------------
+    #      Listeners
+    # --------------------
+
+    def _get_n_slots(self):
+        if self.cores_per_job < 1:
+            raise ValueError('cores_per_job must be at least 1')
+        if self.total_cores < self.cores_per_job:
+            raise ValueError(
+                f'total_cores ({self.total_cores}) must be at least '
+                f'cores_per_job ({self.cores_per_job})')
+        return self.total_cores // self.cores_per_job
+
+    # --------------------
+    #  Protected Methods
+    # --------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _start(self):
+        """Create thread pool and core slots, if not already running"""
+        if self._executor is None:
+            self._free_slots = queue.SimpleQueue()
+            for slot in range(self.n_slots):
+                self._free_slots.put(slot)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_slots)
+
+    def _run_pipeline(self, pipeline):
+        """Run pipeline on a free slot, returning its output"""
+
+        slot = self._free_slots.get()
+        try:
+            self.assign_cores(pipeline, slot * self.cores_per_job)
+            pipeline.run()
+        finally:
+            self._free_slots.put(slot)
+
+        return pipeline.run_output
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def assign_cores(self, pipeline, offset):
+        """Assign `cores_per_job` cores starting at `offset` to all
+        Gromacs mdrun steps in pipeline. MPI runs are not modified,
+        since their cores are assigned by `mpirun`"""
+
+        for name, process in pipeline:
+            if isinstance(process, Gromacs_mdrun) and not process.mpi_run:
+                command_options = dict(process.command_options)
+                command_options.update({
+                    '-nt': self.cores_per_job,
+                    '-ntomp': self.cores_per_job,
+                    '-pin': 'on',
+                    '-pinoffset': offset
+                })
+                process.command_options = command_options
+
+    def submit(self, pipeline):
+        """Schedule a pipeline to be run once a slot is free
+
+        Returns
+        -------
+        future: concurrent.futures.Future
+            Future returning the `run_output` of the pipeline
+        """
+        self._start()
+        return self._executor.submit(self._run_pipeline, pipeline)
+
+    def run(self, pipelines):
+        """Run all pipelines, waiting until they have completed.
+        If any pipeline raises an exception, it is raised once all
+        pipelines have completed.
+
+        Returns
+        -------
+        run_outputs: list of dict
+            The `run_output` of each pipeline, in the same order
+        """
+        futures = [self.submit(pipeline) for pipeline in pipelines]
+        for future in futures:
+            future.exception()
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        """Wait for all pipelines to complete and release threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,187 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import hashlib
+import json
+import os
+import threading
+
+from traits.api import HasStrictTraits, Any, Dict, Enum, File
+
+#: Size of each chunk read when hashing file contents
+_CHUNK_SIZE = 2 ** 20
+
+
+class PipelineManifest(HasStrictTraits):
+    """Records fingerprints of the input and output files of each step
+    in a pipeline, so that steps can be skipped when re-running a
+    pipeline if they are up to date, in the style of `make`.
+
+    A step is considered up to date if its bash script is unchanged
+    and all of its input and output files have the same fingerprints as
+    when it was last run. When fingerprinting by modification time, none
+    of its outputs can be older than its inputs. Steps that do not report
+    any output files are never up to date. Processes must provide
+    `input_files` and `output_files` methods in order to be fingerprinted.
+
+    The manifest is stored as a JSON file, typically in the
+    simulation folder.
+    """
+
+    # --------------------
+    #  Required Attributes
+    # --------------------
+
+    #: Location of JSON file storing the manifest
+    file_path = File()
+
+    # --------------------
+    #  Regular Attributes
+    # --------------------
+
+    #: Method used to fingerprint files. Either file size and
+    #: modification time ('stat'), or a hash of file contents ('hash')
+    fingerprint_mode = Enum('stat', 'hash')
+
+    # --------------------
+    #  Private Attributes
+    # --------------------
+
+    #: Dictionary with step names as keys and records of each step
+    #: as values
+    _entries = Dict()
+
+    #: Lock protecting `_entries` when steps are run concurrently
+    _lock = Any()
+
+    # --------------------
+    #      Defaults
+    # --------------------
+
+    def __lock_default(self):
+        return threading.Lock()
+
+    # --------------------
+    #  Private Methods
+    # --------------------
+
+    def _hash_file(self, file_path):
+        """Returns SHA256 hash of file contents"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def _fingerprints(self, file_paths):
+        """Returns dictionary of fingerprints for each file path"""
+        return {
+            file_path: self.fingerprint(file_path)
+            for file_path in file_paths
+        }
+
+    def _step_files(self, process):
+        """Returns lists of input and output files of process"""
+        return (
+            list(getattr(process, 'input_files', list)()),
+            list(getattr(process, 'output_files', list)())
+        )
+
+    # --------------------
+    #    Public Methods
+    # --------------------
+
+    def fingerprint(self, file_path):
+        """Returns fingerprint of file, or None if it does not exist"""
+
+        if not os.path.isfile(file_path):
+            return None
+
+        if self.fingerprint_mode == 'hash':
+            return {
+                'size': os.path.getsize(file_path),
+                'sha256': self._hash_file(file_path)
+            }
+
+        stat = os.stat(file_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def load(self):
+        """Load manifest from `file_path`, if it exists"""
+
+        entries = {}
+        if os.path.exists(self.file_path):
+            with open(self.file_path, 'r') as infile:
+                entries = json.load(infile)
+
+        with self._lock:
+            self._entries = entries
+
+    def save(self):
+        """Write manifest to `file_path`. The file is replaced
+        atomically, so that it is not corrupted if interrupted"""
+
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f'{self.file_path}.tmp'
+        with self._lock:
+            with open(temp_path, 'w') as outfile:
+                json.dump(self._entries, outfile, indent=2, sort_keys=True)
+            os.replace(temp_path, self.file_path)
+
+    def is_up_to_date(self, name, process):
+        """Returns whether step `name` can be skipped, since it has
+        been run with the same inputs and its outputs are unchanged"""
+
+        with self._lock:
+            entry = self._entries.get(name)
+
+        input_files, output_files = self._step_files(process)
+
+        if entry is None or not output_files:
+            return False
+        if entry['command'] != process.bash_script():
+            return False
+        if (entry['inputs'] != self._fingerprints(input_files)
+                or entry['outputs'] != self._fingerprints(output_files)):
+            return False
+        if None in entry['inputs'].values():
+            return False
+        if None in entry['outputs'].values():
+            return False
+        if self.fingerprint_mode == 'hash':
+            return True
+
+        # Files that are both read and updated by the step are
+        # excluded from the comparison of modification times
+        updated_files = set(input_files) & set(output_files)
+        input_times = [
+            os.path.getmtime(file_path) for file_path in input_files
+            if file_path not in updated_files
+        ]
+        output_times = [
+            os.path.getmtime(file_path) for file_path in output_files
+        ]
+
+        return not input_times or min(output_times) >= max(input_times)
+
+    def update(self, name, process):
+        """Record fingerprints of all files of step `name`, after
+        it has been run"""
+
+        input_files, output_files = self._step_files(process)
+        entry = {
+            'command': process.bash_script(),
+            'inputs': self._fingerprints(input_files),
+            'outputs': self._fingerprints(output_files)
+        }
+
+        with self._lock:
+            self._entries[name] = entry
+
+    def remove(self, name):
+        """Remove record of step `name`, so that it will be run again"""
+        with self._lock:
+            self._entries.pop(name, None)
@@ -1,10 +1,17 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import json
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
+from force_gromacs.commands.convergence_monitor import ConvergenceMonitor
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
+from force_gromacs.io.gromacs_index_writer import GromacsIndexWriter
+from force_gromacs.pipelines.pipeline_manifest import PipelineManifest
 from force_gromacs.tests.probe_classes.pipelines import (
-    ProbeProcess, ProbePipeline
+    ProbeFileProcess, ProbeProcess, ProbePipeline
 )
 
 
@@ -107,3 +114,208 @@ class TestPipeline(TestCase):
             self.step_names + ['test_append'],
             [name for name, _ in self.pipeline.steps]
         )
+
+    def test_run_timing(self):
+
+        hook_calls = []
+        self.pipeline.step_hooks.append(
+            lambda name, timing: hook_calls.append((name, timing)))
+        self.pipeline.run()
+
+        self.assertListEqual(
+            self.step_names, [name for name, _ in hook_calls])
+
+        for name, timing in hook_calls:
+            self.assertIs(timing, self.pipeline.run_output[name]['timing'])
+            self.assertEqual(
+                {'start', 'end', 'wall_time', 'user_time', 'system_time',
+                 'max_rss', 'output_bytes', 'status'},
+                set(timing))
+            self.assertEqual('completed', timing['status'])
+            self.assertLessEqual(timing['start'], timing['end'])
+            self.assertGreaterEqual(timing['wall_time'], 0)
+            # ProbeProcess does not report any output files or
+            # resource usage by default
+            self.assertEqual(0, timing['output_bytes'])
+            self.assertEqual(0, timing['user_time'])
+
+    def test_run_resource_usage(self):
+
+        usage = {'wall_time': 5.0, 'user_time': 1.0,
+                 'system_time': 0.5, 'max_rss': 2048.0}
+        for _, process in self.pipeline:
+            process.resource_usage = usage
+        self.pipeline.run()
+
+        for name in self.step_names:
+            timing = self.pipeline.run_output[name]['timing']
+            self.assertEqual(1.0, timing['user_time'])
+            self.assertEqual(0.5, timing['system_time'])
+            self.assertEqual(2048.0, timing['max_rss'])
+            # Wall clock time is measured for the whole step
+            self.assertLess(timing['wall_time'], 5.0)
+
+        # Usage of each step is summed for nested pipelines
+        total = self.pipeline.recall_resource_usage()
+        self.assertEqual(
+            {'wall_time', 'user_time', 'system_time', 'max_rss'},
+            set(total))
+        self.assertEqual(4.0, total['user_time'])
+        self.assertEqual(2.0, total['system_time'])
+        self.assertEqual(2048.0, total['max_rss'])
+
+        pipeline = ProbePipeline()
+        pipeline.append(('nested', self.pipeline))
+        for _, process in pipeline.steps[:4]:
+            process.resource_usage = usage
+        pipeline.run()
+        self.assertEqual(
+            4.0, pipeline.run_output['nested']['timing']['user_time'])
+        self.assertEqual(8.0, pipeline.recall_resource_usage()['user_time'])
+
+    def test_run_failed_hooks(self):
+
+        hook_calls = []
+        self.pipeline.step_hooks.append(
+            lambda name, timing: hook_calls.append((name, timing)))
+        self.pipeline.append(('copy', ProbeFileProcess(
+            input_file='missing.gro', output_file='output.gro',
+            dry_run=False)))
+
+        with self.assertRaises(FileNotFoundError):
+            self.pipeline.run()
+
+        name, timing = hook_calls[-1]
+        self.assertEqual('copy', name)
+        self.assertEqual('failed', timing['status'])
+        self.assertIs(timing, self.pipeline.run_output['copy']['timing'])
+        self.assertIn('copy', self.pipeline.report()['steps'])
+
+    def test_run_output_bytes(self):
+
+        with TemporaryDirectory() as directory:
+            writer = GromacsIndexWriter(
+                groups={'System': [1, 2, 3]},
+                directory=directory,
+                ndx_name='index.ndx')
+            self.pipeline.append(('index', writer))
+            self.pipeline.dry_run = False
+            self.pipeline.run()
+
+            self.assertEqual(
+                os.path.getsize(os.path.join(directory, 'index.ndx')),
+                self.pipeline.run_output['index']['timing']['output_bytes']
+            )
+
+    def test_run_convergence(self):
+
+        mdrun = Gromacs_mdrun(
+            convergence_monitor=ConvergenceMonitor(target_error=1.0))
+        self.pipeline.append(('mdrun', mdrun))
+        self.pipeline.dry_run = True
+        self.pipeline.run()
+
+        self.assertDictEqual(
+            mdrun.recall_convergence(),
+            self.pipeline.run_output['mdrun']['convergence'])
+        self.assertNotIn(
+            'convergence', self.pipeline.run_output[self.step_names[0]])
+
+    def test_report(self):
+
+        # No steps have been run
+        report = self.pipeline.report()
+        self.assertEqual({}, report['steps'])
+        self.assertEqual(0, report['total']['wall_time'])
+
+        self.pipeline.run()
+        report = self.pipeline.report()
+
+        self.assertListEqual(self.step_names, list(report['steps']))
+        self.assertAlmostEqual(
+            sum(timing['wall_time'] for timing in report['steps'].values()),
+            report['total']['wall_time'])
+        self.assertEqual(
+            {'wall_time', 'user_time', 'system_time', 'max_rss',
+             'output_bytes'},
+            set(report['total']))
+
+        self.assertDictEqual(
+            report, json.loads(self.pipeline.report_json(indent=2)))
+
+    def test_run_manifest(self):
+
+        with TemporaryDirectory() as directory:
+            file_paths = [
+                os.path.join(directory, f'{index}.gro')
+                for index in range(3)
+            ]
+            with open(file_paths[0], 'w') as outfile:
+                outfile.write('input')
+
+            first = ProbeFileProcess(
+                input_file=file_paths[0], output_file=file_paths[1])
+            second = ProbeFileProcess(
+                input_file=file_paths[1], output_file=file_paths[2])
+            self.pipeline.append(('copy_1', first))
+            self.pipeline.append(('copy_2', second))
+            self.pipeline.manifest = PipelineManifest(
+                file_path=os.path.join(directory, 'manifest.json'))
+
+            # Manifest is not used in a dry run
+            self.pipeline.dry_run = True
+            self.pipeline.run()
+            self.assertFalse(
+                os.path.exists(self.pipeline.manifest.file_path))
+
+            self.pipeline.dry_run = False
+            self.pipeline.run()
+            self.assertEqual(2, first.n_runs)
+            self.assertFalse(self.pipeline.run_output['copy_1']['skipped'])
+
+            # Completed steps are skipped
+            hook_calls = []
+            self.pipeline.step_hooks.append(
+                lambda name, timing: hook_calls.append((name, timing)))
+            self.pipeline.run()
+            self.assertEqual(
+                [('copy_1', 'skipped'), ('copy_2', 'skipped')],
+                [(name, timing['status']) for name, timing in hook_calls
+                 if name.startswith('copy')])
+            self.pipeline.step_hooks = []
+            self.assertEqual(2, first.n_runs)
+            self.assertEqual(2, second.n_runs)
+            self.assertTrue(self.pipeline.run_output['copy_1']['skipped'])
+            self.assertEqual(
+                0, self.pipeline.run_output['copy_1']['returncode'])
+            self.assertNotIn('copy_1', self.pipeline.report()['steps'])
+            # Steps without output files are always run
+            self.assertFalse(self.pipeline.run_output['first']['skipped'])
+
+            # Changes propagate to subsequent steps
+            os.remove(file_paths[1])
+            self.pipeline.run()
+            self.assertEqual(3, first.n_runs)
+            self.assertEqual(3, second.n_runs)
+
+            # Failed steps are removed from the manifest
+            first.input_file = os.path.join(directory, 'missing.gro')
+            with self.assertRaises(FileNotFoundError):
+                self.pipeline.run()
+            first.input_file = file_paths[0]
+            self.pipeline.run()
+            self.assertEqual(5, first.n_runs)
+
+    def test_external_input_files(self):
+
+        self.assertListEqual([], self.pipeline.external_input_files())
+
+        self.pipeline.append(('copy_1', ProbeFileProcess(
+            input_file='input.gro', output_file='output.gro')))
+        self.pipeline.append(('copy_2', ProbeFileProcess(
+            input_file='output.gro', output_file='final.gro')))
+        self.pipeline.append(('copy_3', ProbeFileProcess(
+            input_file='input.gro', output_file='other.gro')))
+
+        self.assertListEqual(
+            ['input.gro'], self.pipeline.external_input_files())
@@ -0,0 +1,126 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import subprocess
+import time
+from unittest import TestCase
+
+from force_gromacs.commands.base_gromacs_command import (
+    BaseGromacsCommand
+)
+from force_gromacs.pipelines.dag_pipeline import DAGPipeline
+from force_gromacs.tests.probe_classes.pipelines import ProbeProcess
+
+
+def sleep_command(duration):
+    return BaseGromacsCommand(
+        executable='', name=f'sleep {duration}')
+
+
+class TestDAGPipeline(TestCase):
+
+    def setUp(self):
+
+        self.pipeline = DAGPipeline(max_workers=2)
+        self.pipeline.append(('first', ProbeProcess()))
+        self.pipeline.append(('second', ProbeProcess()))
+        self.pipeline.append(
+            ('third', ProbeProcess()), depends_on=['first'])
+        self.pipeline.append(
+            ('fourth', ProbeProcess()), depends_on=['second', 'third'])
+
+    def test_append(self):
+
+        self.assertEqual(4, len(self.pipeline))
+        self.assertDictEqual(
+            {'third': ['first'], 'fourth': ['second', 'third']},
+            self.pipeline.dependencies)
+
+    def test_levels(self):
+
+        self.assertListEqual(
+            [['first', 'second'], ['third'], ['fourth']],
+            self.pipeline.levels())
+
+        self.pipeline.dependencies['first'] = ['fourth']
+        with self.assertRaisesRegex(
+                ValueError,
+                r"Dependencies between steps \['first', 'third', "
+                r"'fourth'\] contain a cycle"):
+            self.pipeline.levels()
+
+        self.pipeline.dependencies['first'] = ['fifth']
+        with self.assertRaisesRegex(
+                ValueError,
+                'Dependency fifth is not a step in the pipeline'):
+            self.pipeline.levels()
+
+    def test_bash_script(self):
+
+        self.pipeline = DAGPipeline()
+        for name in ['water', 'salt', 'oil']:
+            self.pipeline.append((name, sleep_command(0)))
+        self.pipeline.append(
+            ('solvate', sleep_command(1)),
+            depends_on=['water', 'salt', 'oil'])
+
+        bash_script = self.pipeline.bash_script()
+        self.assertEqual(
+            '(\nsleep 0\n) &\n' * 3 + 'wait\nsleep 1\n',
+            bash_script)
+
+        # Script is valid bash
+        subprocess.run(
+            ['bash', '-n'], input=bash_script.encode(), check=True)
+
+    def test_run(self):
+
+        hook_calls = []
+        self.pipeline.step_hooks.append(
+            lambda name, timing: hook_calls.append(name))
+
+        self.pipeline.run()
+
+        self.assertEqual(4, len(hook_calls))
+        self.assertLess(
+            hook_calls.index('first'), hook_calls.index('third'))
+        self.assertEqual('fourth', hook_calls[-1])
+        for name in self.pipeline.named_steps:
+            self.assertEqual(0, self.pipeline.run_output[name]['returncode'])
+            self.assertIn('timing', self.pipeline.run_output[name])
+
+    def test_run_concurrent(self):
+
+        self.pipeline = DAGPipeline(max_workers=4, dry_run=False)
+        for index in range(4):
+            self.pipeline.append((f'sleep_{index}', sleep_command(0.5)))
+        self.pipeline.append(
+            ('final', sleep_command(0)),
+            depends_on=[f'sleep_{index}' for index in range(4)])
+
+        start = time.monotonic()
+        self.pipeline.run()
+        self.assertLess(time.monotonic() - start, 1.5)
+
+        final_start = self.pipeline.run_output['final']['timing']['start']
+        for index in range(4):
+            self.assertLessEqual(
+                self.pipeline.run_output[f'sleep_{index}']['timing']['end'],
+                final_start)
+
+    def test_run_error(self):
+
+        self.pipeline = DAGPipeline(max_workers=2, dry_run=False)
+        self.pipeline.append(('slow', sleep_command(0.5)))
+        self.pipeline.append(
+            ('fail', BaseGromacsCommand(executable='', name='false')))
+        self.pipeline.append(
+            ('after', sleep_command(0)), depends_on=['fail'])
+
+        with self.assertRaisesRegex(
+                RuntimeError, "Gromacs command 'false' did not run"):
+            self.pipeline.run()
+
+        # Running steps complete, but dependent steps are not started
+        self.assertEqual(0, self.pipeline.run_output['slow']['returncode'])
+        self.assertDictEqual({}, self.pipeline.run_output['after'])
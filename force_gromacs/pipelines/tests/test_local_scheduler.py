@@ -0,0 +1,110 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import time
+from unittest import TestCase
+
+from force_gromacs.commands.base_gromacs_command import (
+    BaseGromacsCommand
+)
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
+from force_gromacs.pipelines.gromacs_pipeline import GromacsPipeline
+from force_gromacs.pipelines.local_scheduler import LocalScheduler
+
+
+def sleep_pipeline(duration, mdrun=None):
+    steps = [('sleep', BaseGromacsCommand(
+        executable='', name=f'sleep {duration}', dry_run=False))]
+    if mdrun is not None:
+        steps.append(('mdrun', mdrun))
+    return GromacsPipeline(steps=steps)
+
+
+class TestLocalScheduler(TestCase):
+
+    def setUp(self):
+        self.scheduler = LocalScheduler(total_cores=8, cores_per_job=2)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_n_slots(self):
+
+        self.assertEqual(4, self.scheduler.n_slots)
+        self.scheduler.cores_per_job = 3
+        self.assertEqual(2, self.scheduler.n_slots)
+
+        self.scheduler.cores_per_job = 9
+        with self.assertRaisesRegex(
+                ValueError,
+                r'total_cores \(8\) must be at least cores_per_job \(9\)'):
+            self.scheduler.n_slots
+
+        self.scheduler.cores_per_job = 0
+        with self.assertRaisesRegex(
+                ValueError, 'cores_per_job must be at least 1'):
+            self.scheduler.n_slots
+
+    def test_assign_cores(self):
+
+        mdrun = Gromacs_mdrun(command_options={'-s': 'topol.tpr'})
+        mpi_mdrun = Gromacs_mdrun(mpi_run=True, n_proc=4)
+        pipeline = GromacsPipeline(
+            steps=[('mdrun', mdrun), ('mpi_mdrun', mpi_mdrun)],
+            dry_run=True)
+
+        self.scheduler.assign_cores(pipeline, 6)
+
+        self.assertDictEqual(
+            {'-s': 'topol.tpr', '-nt': 2, '-ntomp': 2,
+             '-pin': 'on', '-pinoffset': 6},
+            mdrun.command_options)
+        self.assertIn(
+            '-nt 2 -ntomp 2 -pin on -pinoffset 6', mdrun.bash_script())
+        self.assertDictEqual({}, mpi_mdrun.command_options)
+
+    def test_run(self):
+
+        mdruns = [Gromacs_mdrun(dry_run=True) for _ in range(8)]
+        pipelines = [sleep_pipeline(0.5, mdrun) for mdrun in mdruns]
+        for pipeline in pipelines:
+            pipeline.dry_run = False
+            pipeline['mdrun'].dry_run = True
+
+        start = time.monotonic()
+        run_outputs = self.scheduler.run(pipelines)
+        duration = time.monotonic() - start
+
+        # Runs 4 pipelines at a time
+        self.assertGreaterEqual(duration, 1.0)
+        self.assertLess(duration, 1.9)
+
+        self.assertEqual(8, len(run_outputs))
+        for pipeline, run_output in zip(pipelines, run_outputs):
+            self.assertIs(pipeline.run_output, run_output)
+            self.assertEqual(0, run_output['sleep']['returncode'])
+
+        self.assertEqual(
+            {0, 2, 4, 6},
+            {mdrun.command_options['-pinoffset'] for mdrun in mdruns})
+
+    def test_run_error(self):
+
+        failing = GromacsPipeline(steps=[('false', BaseGromacsCommand(
+            executable='', name='false', dry_run=False))])
+        pipelines = [sleep_pipeline(0.2), failing, sleep_pipeline(0.2)]
+
+        with self.assertRaisesRegex(
+                RuntimeError, "Gromacs command 'false' did not run"):
+            self.scheduler.run(pipelines)
+
+        # Remaining pipelines complete
+        self.assertEqual(0, pipelines[2].run_output['sleep']['returncode'])
+
+    def test_submit(self):
+
+        with LocalScheduler(total_cores=2) as scheduler:
+            future = scheduler.submit(sleep_pipeline(0))
+            self.assertEqual(
+                0, future.result()['sleep']['returncode'])
+        self.assertIsNone(scheduler._executor)
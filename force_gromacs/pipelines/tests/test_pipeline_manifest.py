@@ -0,0 +1,112 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from force_gromacs.pipelines.pipeline_manifest import PipelineManifest
+from force_gromacs.tests.probe_classes.pipelines import (
+    ProbeFileProcess, ProbeProcess
+)
+
+
+class TestPipelineManifest(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.input_file = self.file_path('input.gro')
+        self.output_file = self.file_path('output.gro')
+
+        with open(self.input_file, 'w') as outfile:
+            outfile.write('input')
+
+        self.process = ProbeFileProcess(
+            input_file=self.input_file,
+            output_file=self.output_file,
+            dry_run=False)
+        self.manifest = PipelineManifest(
+            file_path=self.file_path('folder', 'manifest.json'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def file_path(self, *names):
+        return os.path.join(self.directory.name, *names)
+
+    def run_step(self):
+        if not self.manifest.is_up_to_date('copy', self.process):
+            self.process.run()
+            self.manifest.update('copy', self.process)
+
+    def test_fingerprint(self):
+
+        self.assertIsNone(self.manifest.fingerprint(self.output_file))
+
+        stat = os.stat(self.input_file)
+        self.assertDictEqual(
+            {'size': 5, 'mtime_ns': stat.st_mtime_ns},
+            self.manifest.fingerprint(self.input_file))
+
+        self.manifest.fingerprint_mode = 'hash'
+        self.assertDictEqual(
+            {'size': 5,
+             'sha256': ('c96c6d5be8d08a12e7b5cdc1b207fa6b'
+                        '2430974c86803d8891675e76fd992c20')},
+            self.manifest.fingerprint(self.input_file))
+
+    def test_is_up_to_date(self):
+
+        self.run_step()
+        self.assertEqual(1, self.process.n_runs)
+        self.run_step()
+        self.assertEqual(1, self.process.n_runs)
+
+        # Modified input
+        with open(self.input_file, 'w') as outfile:
+            outfile.write('new input')
+        self.run_step()
+        self.assertEqual(2, self.process.n_runs)
+
+        # Missing output
+        os.remove(self.output_file)
+        self.run_step()
+        self.assertEqual(3, self.process.n_runs)
+
+        # Modified command
+        self.process.output_file = self.file_path('other.gro')
+        self.run_step()
+        self.assertEqual(4, self.process.n_runs)
+
+        # Outputs older than inputs
+        os.utime(self.input_file, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+        self.manifest.update('copy', self.process)
+        self.assertFalse(
+            self.manifest.is_up_to_date('copy', self.process))
+
+        # Only contents are compared using hashes
+        self.manifest.fingerprint_mode = 'hash'
+        self.manifest.update('copy', self.process)
+        os.utime(self.input_file, ns=(3 * 10 ** 18, 3 * 10 ** 18))
+        self.assertTrue(
+            self.manifest.is_up_to_date('copy', self.process))
+
+        # Steps without output files are never up to date
+        self.manifest.update('probe', ProbeProcess())
+        self.assertFalse(
+            self.manifest.is_up_to_date('probe', ProbeProcess()))
+
+    def test_save_load(self):
+
+        self.run_step()
+        self.manifest.save()
+        self.assertTrue(os.path.exists(self.manifest.file_path))
+        self.assertFalse(os.path.exists(self.manifest.file_path + '.tmp'))
+
+        manifest = PipelineManifest(file_path=self.manifest.file_path)
+        self.assertFalse(manifest.is_up_to_date('copy', self.process))
+        manifest.load()
+        self.assertTrue(manifest.is_up_to_date('copy', self.process))
+
+        manifest.remove('copy')
+        self.assertFalse(manifest.is_up_to_date('copy', self.process))
@@ -7,8 +7,11 @@ from traits.api import (
     provides, List, Float
 )
 
+from force_gromacs.commands.convergence_monitor import ConvergenceMonitor
+from force_gromacs.io.configuration_library import ConfigurationLibrary
 from force_gromacs.io.gromacs_file_registry import GromacsFileRegistry
 from force_gromacs.pipelines.gromacs_pipeline import GromacsPipeline
+from force_gromacs.pipelines.pipeline_manifest import PipelineManifest
 from force_gromacs.simulation_builders.gromacs_topology_data import (
     GromacsTopologyData
 )
@@ -54,6 +57,22 @@ class BaseGromacsSimulationBuilder(HasTraits):
     #: Whether or not to perform a dry run
     dry_run = Bool(True)
 
+    #: Whether or not to skip pipeline steps that are up to date with
+    #: a manifest stored in the simulation folder, so that simulations
+    #: can be resumed without repeating completed steps
+    incremental = Bool(False)
+
+    #: Whether or not to resume simulations from any existing checkpoint
+    #: files, so that interrupted simulations do not restart from zero
+    restart = Bool(False)
+
+    #: Standard error of `convergence_observable` at which a production
+    #: run can be stopped early. Simulations run for `n_steps` if zero
+    target_error = Float(0)
+
+    #: Energy term in the simulation log file monitored for convergence
+    convergence_observable = Str('Potential')
+
     # --------------------
     #  Regular Attributes
     # --------------------
@@ -68,6 +87,11 @@ class BaseGromacsSimulationBuilder(HasTraits):
     #: type
     file_registry = Instance(GromacsFileRegistry)
 
+    #: Library of equilibrated configurations that simulations can be
+    #: started from, instead of building a box from scratch. Not used
+    #: if not provided
+    configuration_library = Instance(ConfigurationLibrary)
+
     # --------------------
     #  Private Attributes
     # --------------------
@@ -91,7 +115,10 @@ class BaseGromacsSimulationBuilder(HasTraits):
         return GromacsFileRegistry(prefix=self.name)
 
     def __pipeline_default(self):
-        return GromacsPipeline(dry_run=self.dry_run)
+        manifest = None
+        if self.incremental:
+            manifest = PipelineManifest(file_path=self.get_manifest_path())
+        return GromacsPipeline(dry_run=self.dry_run, manifest=manifest)
 
     # --------------------
     #    Public Methods
@@ -113,6 +140,85 @@ class BaseGromacsSimulationBuilder(HasTraits):
             '`build_pipeline` method'
         )
 
+    def configure_restart(self, mdrun, n_steps=None):
+        """Configures a `Gromacs_mdrun` command to resume from its
+        checkpoint file if `restart` is True, checking that the completed
+        simulation reaches `n_steps` time steps (by default, the
+        `n_steps` attribute). If no checkpoint file is set, the
+        `state_file` in `folder` is used.
+
+        Parameters
+        ----------
+        mdrun: Gromacs_mdrun
+            Command performing a simulation
+        n_steps: int, optional
+            Expected number of time steps of simulation
+        """
+        mdrun.restart = self.restart
+        if not self.restart:
+            return
+
+        if '-cpi' not in mdrun.command_options:
+            command_options = dict(mdrun.command_options)
+            command_options.setdefault(
+                '-cpo',
+                os.path.join(self.folder, self.file_registry.state_file))
+            mdrun.command_options = command_options
+
+        if n_steps is None:
+            n_steps = self.n_steps
+        mdrun.expected_steps = n_steps
+
+    def configure_convergence(self, mdrun, **traits):
+        """Configures a `Gromacs_mdrun` command to stop once the
+        standard error of `convergence_observable` falls below
+        `target_error`, if set. Additional traits are passed to the
+        `ConvergenceMonitor`.
+
+        Parameters
+        ----------
+        mdrun: Gromacs_mdrun
+            Command performing a production run
+        """
+        if not self.target_error:
+            mdrun.convergence_monitor = None
+            return
+
+        mdrun.convergence_monitor = ConvergenceMonitor(
+            observable=self.convergence_observable,
+            target_error=self.target_error,
+            **traits
+        )
+
+    def prepare_configuration(self, coord_file):
+        """Writes a starting configuration to `coord_file`, based on the
+        configuration in `configuration_library` with the composition
+        closest to `topology_data.fragment_ledger`
+
+        Returns
+        -------
+        missing: dict of str: int or None
+            Number of molecules of each fragment that still need to be
+            inserted, or None if no configuration is available, so that
+            the simulation box must be built from scratch
+        """
+        if self.configuration_library is None:
+            return None
+        return self.configuration_library.prepare(
+            self.topology_data.fragment_ledger, coord_file)
+
+    def store_configuration(self, coord_file):
+        """Adds an equilibrated configuration to `configuration_library`,
+        indexed by the composition in `topology_data.fragment_ledger`"""
+        if self.configuration_library is not None:
+            self.configuration_library.add(
+                self.topology_data.fragment_ledger, coord_file)
+
+    def get_manifest_path(self):
+        """Returns location of the manifest recording the files
+        used by each pipeline step, if `incremental` is True"""
+        return os.path.join(self.folder, 'pipeline_manifest.json')
+
     def get_results_path(self):
         """Obtain the results trajectory file path for further
         post-processing
@@ -1,11 +1,16 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import HasStrictTraits, List, File, Dict, Str, Int
+from traits.api import (
+    HasStrictTraits, List, File, Dict, Str, Int, Directory
+)
 
 from force_gromacs.io.gromacs_molecule_reader import (
     GromacsMoleculeReader
 )
+from force_gromacs.io.gromacs_topology_preprocessor import (
+    GromacsTopologyPreprocessor
+)
 
 
 class GromacsTopologyData(HasStrictTraits):
@@ -25,12 +30,25 @@ class GromacsTopologyData(HasStrictTraits):
     #: provided in the given topology files
     fragment_ledger = Dict(Str, Int)
 
+    #: Additional directories to search for files included by
+    #: each molecule file
+    include_dirs = List(Directory)
+
+    #: Macros defined when preprocessing each molecule file
+    defines = Dict(Str, Str)
+
     # --------------------
-    #  Private Attributes
+    #  Private Methods
     # --------------------
 
-    #: Reader required to parse .itp files
-    _reader = GromacsMoleculeReader()
+    def _create_reader(self):
+        """Return reader required to parse .itp files, resolving
+        preprocessor directives using `include_dirs` and `defines`"""
+        preprocessor = GromacsTopologyPreprocessor(
+            include_dirs=self.include_dirs,
+            defines=self.defines
+        )
+        return GromacsMoleculeReader(preprocessor=preprocessor)
 
     # --------------------
     #    Public Methods
@@ -72,14 +90,16 @@ class GromacsTopologyData(HasStrictTraits):
     def verify(self):
         """Checks that each file listed in `itp_files` is readable and that
         each fragment in the `fragment_ledger` is referenced in at least
-        one topology"""
+        one topology. Any files included by each topology are also
+        read."""
 
         # Build cache of fragment types included in topology files
         fragment_cache = []
+        reader = self._create_reader()
 
         for molecule_file in self.molecule_files:
             try:
-                fragments = self._reader.read(molecule_file)
+                fragments = reader.read(molecule_file)
             except IOError:
                 return False
             fragment_cache.extend(
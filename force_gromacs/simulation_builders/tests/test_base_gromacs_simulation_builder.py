@@ -2,6 +2,7 @@
 #  All rights reserved.
 
 import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from force_gromacs.simulation_builders.base_gromacs_simulation_builder import (
@@ -10,6 +11,8 @@ from force_gromacs.simulation_builders.base_gromacs_simulation_builder import (
 from force_gromacs.simulation_builders.gromacs_topology_data import (
     GromacsTopologyData
 )
+from force_gromacs.commands.gromacs_commands import Gromacs_mdrun
+from force_gromacs.io.configuration_library import ConfigurationLibrary
 from force_gromacs.pipelines.gromacs_pipeline import GromacsPipeline
 
 
@@ -81,6 +84,97 @@ class TestGromacsSimulationBuilder(TestCase):
         self.assertIsInstance(
             self.sim_builder.topology_data, GromacsTopologyData
         )
+        self.assertFalse(self.sim_builder.incremental)
+        self.assertIsNone(self.sim_builder._pipeline.manifest)
+        self.assertFalse(self.sim_builder.restart)
+        self.assertIsNone(self.sim_builder.configuration_library)
+        self.assertEqual(0, self.sim_builder.target_error)
+
+    def test_incremental(self):
+
+        sim_builder = BaseGromacsSimulationBuilder(
+            name='test_experiment', incremental=True)
+        self.assertEqual(
+            os.path.join(
+                os.path.curdir, 'test_experiment', 'pipeline_manifest.json'),
+            sim_builder.get_manifest_path())
+        self.assertEqual(
+            sim_builder.get_manifest_path(),
+            sim_builder._pipeline.manifest.file_path)
+
+    def test_configure_restart(self):
+
+        mdrun = Gromacs_mdrun(command_options={'-s': 'test_topol.tpr'})
+        self.sim_builder.n_steps = 1000
+
+        self.sim_builder.configure_restart(mdrun)
+        self.assertFalse(mdrun.restart)
+        self.assertNotIn('-cpo', mdrun.command_options)
+        self.assertEqual(0, mdrun.expected_steps)
+
+        self.sim_builder.restart = True
+        self.sim_builder.configure_restart(mdrun)
+        self.assertTrue(mdrun.restart)
+        self.assertEqual(1000, mdrun.expected_steps)
+        self.assertEqual(
+            os.path.join(
+                os.path.curdir, 'test_experiment',
+                'test_experiment_state.cpt'),
+            mdrun.checkpoint_file)
+
+        mdrun.command_options = {
+            '-s': 'test_topol.tpr', '-cpo': 'test_state.cpt'}
+        self.sim_builder.configure_restart(mdrun, n_steps=500)
+        self.assertEqual(500, mdrun.expected_steps)
+        self.assertEqual('test_state.cpt', mdrun.checkpoint_file)
+
+    def test_configure_convergence(self):
+
+        mdrun = Gromacs_mdrun()
+        self.sim_builder.configure_convergence(mdrun)
+        self.assertIsNone(mdrun.convergence_monitor)
+
+        self.sim_builder.target_error = 2.0
+        self.sim_builder.convergence_observable = 'Pressure (bar)'
+        self.sim_builder.configure_convergence(mdrun, interval=10.0)
+        monitor = mdrun.convergence_monitor
+        self.assertEqual('Pressure (bar)', monitor.observable)
+        self.assertEqual(2.0, monitor.target_error)
+        self.assertEqual(10.0, monitor.interval)
+
+        self.sim_builder.target_error = 0
+        self.sim_builder.configure_convergence(mdrun)
+        self.assertIsNone(mdrun.convergence_monitor)
+
+    def test_configuration_library(self):
+
+        self.sim_builder.topology_data.fragment_ledger = {'W': 1}
+
+        with TemporaryDirectory() as directory:
+            coord_file = os.path.join(directory, 'coord.gro')
+            start_file = os.path.join(directory, 'start.gro')
+            with open(coord_file, 'w') as outfile:
+                outfile.write(
+                    "Test configuration\n"
+                    "    1\n"
+                    "    1W        W    1   0.100   0.100   0.100\n"
+                    "   3.00000   3.00000   3.00000\n")
+
+            # No library, so nothing is stored or prepared
+            self.sim_builder.store_configuration(coord_file)
+            self.assertIsNone(
+                self.sim_builder.prepare_configuration(start_file))
+
+            self.sim_builder.configuration_library = ConfigurationLibrary(
+                library_directory=os.path.join(directory, 'library'))
+            self.assertIsNone(
+                self.sim_builder.prepare_configuration(start_file))
+
+            self.sim_builder.store_configuration(coord_file)
+            self.sim_builder.topology_data.fragment_ledger = {'W': 2}
+            self.assertDictEqual(
+                {'W': 1}, self.sim_builder.prepare_configuration(start_file))
+            self.assertTrue(os.path.exists(start_file))
 
     def test_not_implemented_methods(self):
 
@@ -1,6 +1,8 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
 from force_gromacs.simulation_builders.gromacs_topology_data import (
@@ -9,6 +11,7 @@ from force_gromacs.simulation_builders.gromacs_topology_data import (
 from force_gromacs.io.tests.test_gromacs_molecule_reader import (
     FILE_READER_OPEN_PATH, top_file
 )
+from force_gromacs.tests.fixtures import gromacs_molecule_file
 
 
 class TestGromacsTopologyData(TestCase):
@@ -96,3 +99,19 @@ class TestGromacsTopologyData(TestCase):
         with mock.patch(FILE_READER_OPEN_PATH, mock_open,
                         create=True):
             self.assertTrue(self.topology_data.verify())
+
+    def test_verify_include(self):
+
+        with TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'topol.itp')
+            with open(file_path, 'w') as outfile:
+                outfile.write('#include "{}"\n'.format(
+                    os.path.basename(gromacs_molecule_file)))
+
+            self.topology_data.fragment_ledger = {'I': 10}
+            self.topology_data.molecule_files = [file_path]
+            self.assertFalse(self.topology_data.verify())
+
+            self.topology_data.include_dirs = [
+                os.path.dirname(gromacs_molecule_file)]
+            self.assertTrue(self.topology_data.verify())
@@ -12,5 +12,7 @@ gromacs_topology_file = os.path.join(
     path, 'example_gromacs_topology_file.top')
 gromacs_molecule_file = os.path.join(
     path, 'example_gromacs_molecule_file.itp')
+gromacs_index_file = os.path.join(
+    path, 'example_gromacs_index_file.ndx')
 lammps_data_file = os.path.join(
     path, 'example_lammps_data_file.data')
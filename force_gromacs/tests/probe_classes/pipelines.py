@@ -1,7 +1,9 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
-from traits.api import HasStrictTraits, Bool, provides
+import shutil
+
+from traits.api import HasStrictTraits, Bool, Dict, Int, Str, provides
 
 from force_gromacs.commands.gromacs_commands import (
     Gromacs_solvate, Gromacs_genion
@@ -27,9 +29,14 @@ class ProbeProcess(HasStrictTraits):
 
     dry_run = Bool()
 
+    resource_usage = Dict()
+
     def recall_stderr(self):
         return ''
 
+    def recall_resource_usage(self):
+        return dict(self.resource_usage)
+
     def recall_stdout(self):
         return ''
 
@@ -40,6 +47,32 @@ class ProbeProcess(HasStrictTraits):
         return 0
 
 
+@provides(IProcess)
+class ProbeFileProcess(ProbeProcess):
+    """Copies `input_file` to `output_file` and counts each run"""
+
+    input_file = Str()
+
+    output_file = Str()
+
+    n_runs = Int(0)
+
+    def input_files(self):
+        return [self.input_file]
+
+    def output_files(self):
+        return [self.output_file]
+
+    def bash_script(self):
+        return f'cp {self.input_file} {self.output_file}'
+
+    def run(self):
+        self.n_runs += 1
+        if not self.dry_run:
+            shutil.copy(self.input_file, self.output_file)
+        return 0
+
+
 class ProbePipeline(BasePipeline):
     def __init__(self):
         steps = [
@@ -1,11 +1,17 @@
 #  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
 #  All rights reserved.
 
+import os
+
+from traits.api import Str
+
+from force_gromacs.io.file_tree_builder import FileTreeBuilder
+from force_gromacs.pipelines.base_pipeline import BasePipeline
 from force_gromacs.simulation_builders.base_gromacs_simulation_builder import (
     BaseGromacsSimulationBuilder
 )
 
-from .pipelines import ProbeGromacsPipeline
+from .pipelines import ProbeGromacsPipeline, ProbeFileProcess
 
 
 class ProbeSimulationBuilder(BaseGromacsSimulationBuilder):
@@ -15,3 +21,24 @@ class ProbeSimulationBuilder(BaseGromacsSimulationBuilder):
 
     def get_results_path(self):
         return '/path/to/trajectory.gro'
+
+
+class ProbeFileSimulationBuilder(BaseGromacsSimulationBuilder):
+    """Builds a pipeline that creates the simulation folder and
+    copies `input_file` to the results path"""
+
+    input_file = Str()
+
+    def build_pipeline(self):
+        return BasePipeline(
+            steps=[
+                ('file_tree', FileTreeBuilder(directory=self.folder)),
+                ('copy', ProbeFileProcess(
+                    input_file=self.input_file,
+                    output_file=self.get_results_path()))
+            ],
+            dry_run=self.dry_run
+        )
+
+    def get_results_path(self):
+        return os.path.join(self.folder, f'{self.name}_traj.gro')
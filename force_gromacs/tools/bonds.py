@@ -0,0 +1,155 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+
+def bond_array(bonds):
+    """Convert a list of bonds between particles referenced by
+    1-based Gromacs indices into an array of 0-based indices
+
+    Parameters
+    ----------
+    bonds: list of tuple of int
+        Pairs of bonded particle indices, starting from 1
+
+    Returns
+    -------
+    bond_array: array_like of int
+        Array with shape (n_bonds, 2) containing pairs of bonded
+        particle indices, starting from 0
+    """
+    return np.asarray(bonds, dtype=np.int64).reshape(-1, 2) - 1
+
+
+def csr_adjacency(bonds, n_particles=None):
+    """Build the adjacency of an undirected bond graph in compressed
+    sparse row (CSR) format, so that the neighbours of particle `i`
+    are given by ``indices[indptr[i]:indptr[i + 1]]``
+
+    Parameters
+    ----------
+    bonds: list of tuple of int
+        Pairs of bonded particle indices, starting from 1
+    n_particles: int, optional
+        Number of particles in graph. If not provided, the largest
+        index referenced in `bonds` is used
+
+    Returns
+    -------
+    indptr: array_like of int
+        Array with shape (n_particles + 1,) containing the location
+        of the neighbours of each particle in `indices`
+    indices: array_like of int
+        Array with shape (2 * n_bonds,) containing the 0-based index
+        of neighbouring particles, sorted for each particle
+    """
+
+    pairs = bond_array(bonds)
+
+    if n_particles is None:
+        n_particles = int(pairs.max()) + 1 if pairs.size else 0
+
+    assert not pairs.size or pairs.max() < n_particles, (
+        f"Bonds reference particles outside of range "
+        f"(n_particles={n_particles})"
+    )
+
+    # Include both directions of each bond, sorted by source particle
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    order = np.lexsort((cols, rows))
+
+    indptr = np.zeros(n_particles + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(rows, minlength=n_particles), out=indptr[1:])
+
+    return indptr, cols[order]
+
+
+def connected_components(indptr, indices):
+    """Label the connected components of a graph in CSR format
+    by iteratively propagating the minimum label of each particle
+    to its neighbours
+
+    Parameters
+    ----------
+    indptr: array_like of int
+        CSR row pointer array, as returned by `csr_adjacency`
+    indices: array_like of int
+        CSR neighbour array, as returned by `csr_adjacency`
+
+    Returns
+    -------
+    labels: array_like of int
+        Array with shape (n_particles,) containing the component
+        label of each particle. Components are labelled from 0 in
+        order of their lowest particle index
+    """
+
+    n_particles = indptr.shape[0] - 1
+    rows = np.repeat(np.arange(n_particles), np.diff(indptr))
+    labels = np.arange(n_particles)
+
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, rows, labels[indices])
+        # Pointer jumping accelerates convergence on long chains
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    _, labels = np.unique(labels, return_inverse=True)
+
+    return labels
+
+
+def bond_vectors(coord, bonds, cell_dim=None):
+    """Calculate the vector from the first to second particle in
+    each bond, for one or more coordinate frames. Enforces minimum
+    image periodic boundary conditions given by cell_dim if supplied
+    as an argument
+
+    Parameters
+    ----------
+    coord: array_like of floats
+        Positions of particles in 3 dimensions, with shape
+        (n_particles, 3) or (n_frames, n_particles, 3)
+    bonds: list of tuple of int
+        Pairs of bonded particle indices, starting from 1
+    cell_dim: array_like of floats, optional
+        Simulation cell dimensions in 3 dimensions, with shape (3,)
+        or (n_frames, 3)
+
+    Returns
+    -------
+    vectors: array_like of floats
+        Bond vectors, with shape (n_bonds, 3) or (n_frames, n_bonds, 3)
+    """
+
+    coord = np.asarray(coord, dtype=float)
+    pairs = bond_array(bonds)
+
+    vectors = coord[..., pairs[:, 1], :] - coord[..., pairs[:, 0], :]
+
+    if cell_dim is not None:
+        # Broadcast cell dimensions of each frame over all bonds
+        cell_dim = np.expand_dims(np.asarray(cell_dim), -2)
+        vectors -= cell_dim * np.rint(vectors / cell_dim)
+
+    return vectors
+
+
+def bond_lengths(coord, bonds, cell_dim=None):
+    """Calculate the length of each bond for one or more coordinate
+    frames, using minimum image periodic boundary conditions if
+    cell_dim is supplied. See `bond_vectors` for details.
+
+    Returns
+    -------
+    lengths: array_like of floats
+        Bond lengths, with shape (n_bonds,) or (n_frames, n_bonds)
+    """
+    return np.linalg.norm(
+        bond_vectors(coord, bonds, cell_dim=cell_dim), axis=-1)
@@ -0,0 +1,124 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+import numpy as np
+
+
+def autocorrelation(values):
+    """Returns normalised autocorrelation function of a time series,
+    calculated using a fast Fourier transform
+
+    Parameters
+    ----------
+    values: array_like of float
+        Time series of n samples
+
+    Returns
+    -------
+    acf: array_like of float
+        Autocorrelation at each lag time from 0 to n - 1. All values
+        are zero if the series has no variance
+    """
+
+    values = np.asarray(values, dtype=float)
+    n_samples = values.size
+    fluctuations = values - values.mean()
+
+    # Zero pad to avoid circular correlation
+    transform = np.fft.rfft(fluctuations, 2 * n_samples)
+    acf = np.fft.irfft(transform * np.conj(transform))[:n_samples]
+    acf /= n_samples - np.arange(n_samples)
+
+    if acf[0] <= 0:
+        return np.zeros(n_samples)
+    return acf / acf[0]
+
+
+def statistical_inefficiency(values, min_lag=3):
+    """Estimates the statistical inefficiency of a time series, so that
+    the number of uncorrelated samples is approximately n / g. The
+    integrated autocorrelation time is truncated once the autocorrelation
+    first drops to zero after `min_lag` samples.
+
+    Parameters
+    ----------
+    values: array_like of float
+        Time series of n samples
+    min_lag: int, optional
+        Minimum lag time included in the sum
+
+    Returns
+    -------
+    g: float
+        Statistical inefficiency, equal to 1 for uncorrelated samples
+    """
+
+    n_samples = np.size(values)
+    if n_samples < 2:
+        return 1.0
+
+    lags = np.arange(1, n_samples - 1)
+    acf = autocorrelation(values)[lags]
+
+    cutoff = np.flatnonzero((acf <= 0) & (lags > min_lag))
+    if cutoff.size:
+        lags, acf = lags[:cutoff[0]], acf[:cutoff[0]]
+
+    g = 1 + 2 * np.sum(acf * (1 - lags / n_samples))
+    return max(float(g), 1.0)
+
+
+def standard_error(values, min_lag=3):
+    """Returns mean of a correlated time series and its standard error,
+    corrected by the statistical inefficiency
+
+    Returns
+    -------
+    mean: float
+        Mean of time series
+    error: float
+        Standard error of the mean
+    g: float
+        Statistical inefficiency of time series
+    """
+
+    values = np.asarray(values, dtype=float)
+    g = statistical_inefficiency(values, min_lag=min_lag)
+    error = np.sqrt(values.var() * g / values.size)
+    return float(values.mean()), float(error), g
+
+
+def block_average(values, n_blocks=10):
+    """Returns mean of a correlated time series and its standard error,
+    estimated from the spread of means of `n_blocks` consecutive
+    blocks. Any samples left over are discarded from the start of
+    the time series.
+
+    Parameters
+    ----------
+    values: array_like of float
+        Time series of at least `n_blocks` samples
+    n_blocks: int, optional
+        Number of blocks
+
+    Returns
+    -------
+    mean: float
+        Mean of time series
+    error: float
+        Standard error of the mean
+    """
+
+    values = np.asarray(values, dtype=float)
+    if n_blocks < 2 or values.size < n_blocks:
+        raise ValueError(
+            f'Block averaging requires at least 2 blocks and a sample '
+            f'per block: {values.size} samples in {n_blocks} blocks')
+
+    block_size = values.size // n_blocks
+    blocks = values[values.size - block_size * n_blocks:].reshape(
+        n_blocks, block_size)
+    block_means = blocks.mean(axis=1)
+
+    error = block_means.std(ddof=1) / np.sqrt(n_blocks)
+    return float(values.mean()), float(error)
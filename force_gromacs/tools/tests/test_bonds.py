@@ -0,0 +1,96 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from force_gromacs.tools.bonds import (
+    bond_array, csr_adjacency, connected_components,
+    bond_vectors, bond_lengths
+)
+
+
+class BondsTestCase(TestCase):
+
+    def setUp(self):
+
+        # Two chain molecules (1-2-3 and 4-5) and an isolated
+        # particle (6)
+        self.bonds = [(1, 2), (3, 2), (4, 5)]
+
+        self.coord = np.array([[0.5, 0.5, 0.5],
+                               [1.5, 0.5, 0.5],
+                               [1.5, 1.5, 0.5],
+                               [0.2, 3.5, 3.5],
+                               [3.8, 3.5, 3.5],
+                               [2.0, 2.0, 2.0]])
+        self.cell_dim = np.array([4.0, 4.0, 4.0])
+
+    def test_bond_array(self):
+
+        assert_array_equal(
+            [[0, 1], [2, 1], [3, 4]], bond_array(self.bonds))
+        self.assertEqual((0, 2), bond_array([]).shape)
+
+    def test_csr_adjacency(self):
+
+        indptr, indices = csr_adjacency(self.bonds, 6)
+
+        assert_array_equal([0, 1, 3, 4, 5, 6, 6], indptr)
+        assert_array_equal([1, 0, 2, 1, 4, 3], indices)
+
+        # Neighbours of the central particle in the first chain
+        assert_array_equal([0, 2], indices[indptr[1]:indptr[2]])
+
+        indptr, indices = csr_adjacency(self.bonds)
+        self.assertEqual(6, indptr.shape[0])
+
+        indptr, indices = csr_adjacency([], 2)
+        assert_array_equal([0, 0, 0], indptr)
+        self.assertEqual(0, indices.shape[0])
+
+        with self.assertRaises(AssertionError):
+            csr_adjacency(self.bonds, 4)
+
+    def test_connected_components(self):
+
+        labels = connected_components(*csr_adjacency(self.bonds, 6))
+        assert_array_equal([0, 0, 0, 1, 1, 2], labels)
+
+        # Long chain numbered out of order
+        n_chain = 50
+        order = np.random.RandomState(0).permutation(n_chain) + 1
+        bonds = list(zip(order[:-1], order[1:]))
+        labels = connected_components(*csr_adjacency(bonds))
+        assert_array_equal(np.zeros(n_chain), labels)
+
+    def test_bond_vectors(self):
+
+        vectors = bond_vectors(self.coord, self.bonds)
+        assert_array_almost_equal(
+            [[1.0, 0, 0], [0, -1.0, 0], [3.6, 0, 0]], vectors)
+
+        vectors = bond_vectors(self.coord, self.bonds, self.cell_dim)
+        assert_array_almost_equal(
+            [[1.0, 0, 0], [0, -1.0, 0], [-0.4, 0, 0]], vectors)
+
+    def test_bond_vectors_frames(self):
+
+        coord = np.stack([self.coord, 2 * self.coord])
+        cell_dim = np.stack([self.cell_dim, 2 * self.cell_dim])
+
+        vectors = bond_vectors(coord, self.bonds, cell_dim)
+        self.assertEqual((2, 3, 3), vectors.shape)
+        assert_array_almost_equal(
+            [[-0.4, 0, 0], [-0.8, 0, 0]], vectors[:, 2])
+
+    def test_bond_lengths(self):
+
+        lengths = bond_lengths(self.coord, self.bonds, self.cell_dim)
+        assert_array_almost_equal([1.0, 1.0, 0.4], lengths)
+
+        coord = np.stack([self.coord, self.coord])
+        lengths = bond_lengths(coord, self.bonds, self.cell_dim)
+        self.assertEqual((2, 3), lengths.shape)
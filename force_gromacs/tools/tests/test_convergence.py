@@ -0,0 +1,74 @@
+#  (C) Copyright 2010-2020 Enthought, Inc., Austin, TX
+#  All rights reserved.
+
+from unittest import TestCase
+
+import numpy as np
+
+from force_gromacs.tools.convergence import (
+    autocorrelation, statistical_inefficiency, standard_error,
+    block_average
+)
+
+
+class ConvergenceTestCase(TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(42)
+        self.noise = random.normal(size=20000)
+
+        # AR(1) process with known statistical inefficiency
+        # g = (1 + phi) / (1 - phi) = 9
+        self.phi = 0.8
+        self.correlated = np.zeros_like(self.noise)
+        for index in range(1, self.noise.size):
+            self.correlated[index] = (
+                self.phi * self.correlated[index - 1] + self.noise[index])
+
+    def test_autocorrelation(self):
+        acf = autocorrelation(self.correlated)
+        self.assertEqual(self.correlated.shape, acf.shape)
+        self.assertEqual(1, acf[0])
+        self.assertAlmostEqual(self.phi, acf[1], places=1)
+        self.assertAlmostEqual(self.phi ** 2, acf[2], places=1)
+
+        self.assertTrue(np.all(autocorrelation(np.ones(10)) == 0))
+
+    def test_statistical_inefficiency(self):
+        self.assertAlmostEqual(
+            1, statistical_inefficiency(self.noise), delta=0.2)
+        self.assertAlmostEqual(
+            9, statistical_inefficiency(self.correlated), delta=1.5)
+
+        self.assertEqual(1, statistical_inefficiency([1.0]))
+        self.assertEqual(1, statistical_inefficiency(np.ones(10)))
+
+    def test_standard_error(self):
+        mean, error, g = standard_error(self.correlated)
+        self.assertAlmostEqual(self.correlated.mean(), mean)
+        self.assertAlmostEqual(
+            np.sqrt(self.correlated.var() * g / self.correlated.size),
+            error)
+
+        # Correlated samples have larger errors than uncorrelated
+        naive_error = self.correlated.std() / np.sqrt(self.correlated.size)
+        self.assertGreater(error, 2 * naive_error)
+
+    def test_block_average(self):
+        mean, error = block_average(np.arange(10), n_blocks=2)
+        self.assertEqual(4.5, mean)
+        self.assertAlmostEqual(2.5, error)
+
+        # Samples are discarded from the start of the series
+        mean, error = block_average(np.arange(11), n_blocks=2)
+        self.assertEqual(5, mean)
+        self.assertAlmostEqual(2.5, error)
+
+        _, error = block_average(self.correlated, n_blocks=20)
+        _, expected, _ = standard_error(self.correlated)
+        self.assertAlmostEqual(expected, error, delta=0.5 * expected)
+
+        with self.assertRaises(ValueError):
+            block_average(np.arange(5), n_blocks=10)
+        with self.assertRaises(ValueError):
+            block_average(np.arange(5), n_blocks=1)